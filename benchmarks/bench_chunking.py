@@ -0,0 +1,79 @@
+"""
+Benchmark planning /parts/match requests for large MPN lists: the greedy
+`utils.chunk_queries` planner against the previous recursive splitter.
+
+Most generated MPNs are short, and every `--long-every`th one is long enough
+that a chunk of 20 would exceed `utils.URL_MAX_LENGTH`, which is what made
+the recursive splitter halve chunks into many small requests.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_chunking.py [--sizes N [N ...]]
+        [--long-every N] [--long-length CHARS]
+"""
+
+import argparse
+import json
+import random
+import time
+from urllib.parse import urlencode
+
+from octopart import utils
+
+
+def recursive_chunk_queries(queries):
+    """The previous planner: chunks of 20, halved until their URL fits"""
+    chunks = []
+    for chunk in utils.chunked(queries):
+        chunks.extend(recursive_split_chunk(chunk))
+    return chunks
+
+
+def recursive_split_chunk(chunk):
+    encoded = urlencode({'queries': json.dumps(chunk)})
+    if len(encoded) <= utils.URL_MAX_LENGTH or len(chunk) == 1:
+        return [chunk]
+    middle = len(chunk) // 2
+    return (recursive_split_chunk(chunk[:middle])
+            + recursive_split_chunk(chunk[middle:]))
+
+
+def make_queries(count, long_every, long_length, seed=0):
+    rng = random.Random(seed)
+    queries = []
+    for i in range(count):
+        length = long_length if i % long_every == 0 else rng.randint(5, 40)
+        mpn = ''.join(rng.choice('ABCDEFGHJKLMNPRSTUVWXYZ0123456789-/# ')
+                      for _ in range(length))
+        queries.append({'mpn_or_sku': mpn, 'reference': str(i)})
+    return queries
+
+
+def run(planner, queries):
+    """Plan `queries`, return (seconds, number of requests)"""
+    start = time.perf_counter()
+    chunks = planner(queries)
+    return time.perf_counter() - start, len(chunks)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '--sizes', type=int, nargs='+', default=[10000, 50000, 100000])
+    parser.add_argument('--long-every', type=int, default=10)
+    parser.add_argument('--long-length', type=int, default=3000)
+    args = parser.parse_args()
+
+    planners = [
+        ('recursive', recursive_chunk_queries),
+        ('greedy', utils.chunk_queries),
+    ]
+    for size in args.sizes:
+        queries = make_queries(size, args.long_every, args.long_length)
+        for name, planner in planners:
+            elapsed, requests = run(planner, queries)
+            print(f'{size:>7} queries {name:>10}: {elapsed * 1000:9.1f} ms '
+                  f'{requests:7} requests')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""
+Benchmark decoding Octopart responses with each installed JSON codec,
+against the previous `response.json()` path, which first decodes the body
+bytes into a str and then parses it with the standard library.
+
+Bodies are the match and search fixtures of `tests/fixtures.py`, and a
+multi-MB match response built by repeating the results of the largest one,
+as returned for big chunks with specs and datasheets included.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_codec.py [--repeat N] [--mb MB]
+"""
+
+import argparse
+import json
+import time
+
+from octopart import codec
+from tests import fixtures
+
+
+def response_json(body):
+    """What `requests.Response.json()` does for a UTF-8 body"""
+    return json.loads(body.decode('utf-8'))
+
+
+def make_bodies(megabytes):
+    bodies = {
+        name: json.dumps(getattr(fixtures, name)).encode()
+        for name in [
+            'parts_match_response',
+            'parts_match_extra_fields_response',
+            'parts_match_multiple_sellers_response',
+            'parts_search_response',
+        ]
+    }
+    base = fixtures.parts_match_extra_fields_response
+    result_size = len(json.dumps(base['results'][0]))
+    copies = max(int(megabytes * 2 ** 20 / result_size), 1)
+    large = dict(base, results=base['results'] * copies)
+    bodies['large_match_response'] = json.dumps(large).encode()
+    return bodies
+
+
+def run(decode, body, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        decode(body)
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--mb', type=float, default=5)
+    args = parser.parse_args()
+
+    decoders = [('response.json()', response_json)]
+    for name in codec.CODECS:
+        try:
+            decoders.append((name, codec.get_codec(name).loads))
+        except ImportError:
+            print(f'{name}: not installed')
+
+    for body_name, body in make_bodies(args.mb).items():
+        print(f'{body_name} ({len(body) / 1024:.0f} KiB)')
+        baseline = None
+        for name, decode in decoders:
+            elapsed = run(decode, body, args.repeat)
+            baseline = baseline or elapsed
+            print(f'  {name:>16}: {elapsed * 1000:8.2f} ms '
+                  f'({baseline / elapsed:.1f}x)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""
+Benchmark `api.match` throughput after a process restart, with and without a
+warm `SQLiteCache`, against a local `FakeOctopartServer` with simulated
+latency.
+
+Each run builds a new client and cache object, as a freshly started worker
+process would; only the database file carries over between runs.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_disk_cache.py [--mpns N]
+        [--latency SECONDS]
+"""
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+
+from octopart import api
+from octopart.cache import SQLiteCache
+from octopart.context import OctopartContext
+from octopart.fakeserver import FakeOctopartServer
+
+# /parts/match responses are not cached by default.
+TTLS = {'parts.match': 60 * 60}
+
+
+def run(base_url, mpns, cache_path=None):
+    """Match `mpns` with a fresh client, return MPNs matched per second"""
+    cache = SQLiteCache(cache_path, ttls=TTLS) if cache_path else None
+    context = OctopartContext(api_key='BENCH', base_url=base_url, cache=cache)
+    with context:
+        start = time.perf_counter()
+        api.match(mpns, context=context)
+        elapsed = time.perf_counter() - start
+    if cache:
+        cache.close()
+    return len(mpns) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--mpns', type=int, default=2000)
+    parser.add_argument('--latency', type=float, default=0.05)
+    args = parser.parse_args()
+
+    logging.getLogger('octopart').setLevel(logging.WARNING)
+    mpns = ['MPN-%06d' % i for i in range(args.mpns)]
+
+    with tempfile.TemporaryDirectory() as tmpdir, \
+            FakeOctopartServer(port=0, latency=args.latency) as server:
+        base_url = server.base_url
+        cache_path = os.path.join(tmpdir, 'octopart-cache.sqlite')
+        runs = [
+            ('no cache', None),
+            ('cold cache', cache_path),
+            ('warm restart', cache_path),
+        ]
+        for name, path in runs:
+            rate = run(base_url, mpns, path)
+            print(f'{name:>14}: {rate:10.1f} MPNs/s')
+        size = os.path.getsize(cache_path)
+        print(f'{"cache file":>14}: {size / 1024:10.1f} KiB')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""
+Benchmark `api.match` with and without request hedging, against a local
+`FakeOctopartServer` whose latency has a long tail: most requests take
+`--latency` seconds (give or take 20%), and one in `--tail-every` takes
+`--tail-factor` times as long.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_hedging.py [--mpns N] [--runs N]
+        [--latency SECONDS] [--tail-every N] [--tail-factor N]
+"""
+
+import argparse
+import logging
+import random
+import statistics
+import time
+
+from octopart import api
+from octopart.context import OctopartContext
+from octopart.fakeserver import FakeOctopartServer
+from octopart.hedging import Hedger
+
+
+def run(base_url, mpns, runs, hedger=None):
+    """Match `mpns` `runs` times, return the seconds each run took"""
+    context = OctopartContext(
+        api_key='BENCH', base_url=base_url, hedger=hedger)
+    timings = []
+    with context:
+        for _ in range(runs):
+            start = time.perf_counter()
+            api.match(mpns, context=context)
+            timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--mpns', type=int, default=400)
+    parser.add_argument('--runs', type=int, default=50)
+    parser.add_argument('--latency', type=float, default=0.02)
+    parser.add_argument('--tail-every', type=int, default=50)
+    parser.add_argument('--tail-factor', type=float, default=10)
+    args = parser.parse_args()
+
+    logging.getLogger('octopart').setLevel(logging.WARNING)
+    mpns = ['MPN-%06d' % i for i in range(args.mpns)]
+    rng = random.Random(0)
+
+    def latency():
+        base = args.latency * rng.uniform(0.8, 1.2)
+        if rng.randrange(args.tail_every) == 0:
+            return base * args.tail_factor
+        return base
+
+    with FakeOctopartServer(port=0, latency=latency) as server:
+        base_url = server.base_url
+        hedger = Hedger()
+        for name, hedger_ in [('no hedging', None), ('hedging', hedger)]:
+            timings = run(base_url, mpns, args.runs, hedger_)
+            timings.sort()
+            p90 = timings[int(len(timings) * 0.9)]
+            print(f'{name:>12}: mean {statistics.mean(timings):.3f}s '
+                  f'p90 {p90:.3f}s max {timings[-1]:.3f}s '
+                  f'per {args.mpns} MPNs')
+        print(f'{"extra load":>12}: {hedger.hedged / hedger.requests:.1%} '
+              f'({hedger.hedge_wins} of {hedger.hedged} hedges won)')
+        hedger.close()
+
+
+if __name__ == '__main__':
+    main()
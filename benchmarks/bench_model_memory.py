@@ -0,0 +1,98 @@
+"""
+Benchmark the memory held by response model wrappers for a large synthetic
+catalog snapshot: `__slots__` models against the same classes with a
+per-instance `__dict__`, as they were before.
+
+Every part of the synthetic result has a few offers and specs, and its
+`offers`, `specs` and `prices` views are read once so that all wrappers
+exist, as when a snapshot is kept in memory for costing. Memory is measured
+with `tracemalloc`, on top of the raw JSON dicts.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_model_memory.py [--parts N]
+"""
+
+import argparse
+import gc
+import tracemalloc
+from unittest import mock
+
+from octopart import models
+
+SLOTTED = ['Part', 'PartOffer', 'Spec', 'PartsMatchResult']
+
+
+def with_dict(cls):
+    """Copy of `cls` without `__slots__`, so instances get a `__dict__`"""
+    namespace = {
+        key: value for key, value in vars(cls).items()
+        if key not in cls.__slots__ and key != '__slots__'
+    }
+    return type(cls.__name__, cls.__bases__, namespace)
+
+
+def make_result(parts, offers_per_part=3, specs_per_part=4):
+    return {
+        'reference': 'snapshot',
+        'hits': parts,
+        'items': [
+            {
+                'uid': '%016x' % i,
+                'mpn': 'MPN-%s' % i,
+                'offers': [
+                    {
+                        'sku': 'SKU-%s-%s' % (i, j),
+                        'prices': {'USD': [[1, '0.10'], [100, '0.08']]},
+                        'seller': {'name': 'Seller %s' % j},
+                    }
+                    for j in range(offers_per_part)
+                ],
+                'specs': {
+                    'spec_%s' % k: {'value': [str(k)]}
+                    for k in range(specs_per_part)
+                },
+            }
+            for i in range(parts)
+        ],
+    }
+
+
+def measure(result_data):
+    """Bytes allocated by wrapping `result_data` and reading its views"""
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    result = models.PartsMatchResult(result_data)
+    for part in result.parts:
+        part.specs
+        for offer in part.offers:
+            offer.prices
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return after - before, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--parts', type=int, default=100000)
+    args = parser.parse_args()
+
+    result_data = make_result(args.parts)
+    dict_classes = {
+        name: with_dict(getattr(models, name)) for name in SLOTTED}
+
+    with mock.patch.multiple(models, **dict_classes):
+        with_dicts, result = measure(result_data)
+    del result
+    slotted, result = measure(result_data)
+    del result
+
+    for name, size in [('__dict__', with_dicts), ('__slots__', slotted)]:
+        print(f'{name:>9}: {size / 2 ** 20:8.1f} MiB for {args.parts} parts '
+              f'({size / args.parts:.0f} bytes per part)')
+    print(f'saved: {(with_dicts - slotted) / 2 ** 20:.1f} MiB '
+          f'({1 - slotted / with_dicts:.0%})')
+
+
+if __name__ == '__main__':
+    main()
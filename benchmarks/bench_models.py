@@ -0,0 +1,101 @@
+"""
+Benchmark reading derived views of response models, as costing loops do:
+`Part.offers` and `PartOffer.prices` accessed over and over, with memoized
+properties against the previous plain properties.
+
+The plain-property models are rebuilt here by subclassing the models and
+overriding the memoized properties with `property` objects that recompute
+the value on every access.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_models.py [--passes N]
+"""
+
+import argparse
+import time
+
+from octopart import models
+from tests import fixtures
+
+
+def uncached(cls, names):
+    """Subclass of `cls` whose properties `names` are recomputed each time"""
+    return type('Uncached' + cls.__name__, (cls,), {
+        name: property(getattr(cls, name).func) for name in names
+    })
+
+
+UncachedPartOffer = uncached(models.PartOffer, ['prices'])
+
+
+class UncachedPart(uncached(models.Part, ['specs'])):
+    @property
+    def offers(self):
+        return [UncachedPartOffer(offer) for offer in self._part['offers']]
+
+
+class UncachedPartsMatchResult(models.PartsMatchResult):
+    @property
+    def parts(self):
+        return [UncachedPart(part) for part in self._result['items']]
+
+
+class UncachedPartsMatchResponse(models.PartsMatchResponse):
+    @property
+    def results(self):
+        return [
+            UncachedPartsMatchResult(result)
+            for result in self._response['results']
+        ]
+
+
+RESPONSES = [
+    fixtures.parts_match_response,
+    fixtures.parts_match_extra_fields_response,
+    fixtures.parts_match_multiple_sellers_response,
+]
+
+
+def cheapest_unit_price(response_cls, passes):
+    """
+    Price every offer of every part at a few quantities, reading the views
+    through the models each time like a costing loop does.
+    """
+    total = 0.0
+    for _ in range(passes):
+        for data in RESPONSES:
+            response = response_cls(data)
+            for i in range(len(response.results)):
+                for j in range(len(response.results[i].parts)):
+                    part = response.results[i].parts[j]
+                    for quantity in (1, 10, 100, 1000):
+                        for k in range(len(part.offers)):
+                            breaks = part.offers[k].prices.get('USD', {})
+                            eligible = [
+                                price for qty, price in breaks.items()
+                                if qty <= quantity]
+                            if eligible:
+                                total += min(eligible)
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--passes', type=int, default=50)
+    args = parser.parse_args()
+
+    timings = {}
+    for name, response_cls in [
+            ('plain properties', UncachedPartsMatchResponse),
+            ('memoized', models.PartsMatchResponse)]:
+        start = time.perf_counter()
+        total = cheapest_unit_price(response_cls, args.passes)
+        timings[name] = time.perf_counter() - start
+        print(f'{name:>16}: {timings[name] * 1000:9.1f} ms '
+              f'(checksum {total:.2f})')
+    print(f'speedup: '
+          f'{timings["plain properties"] / timings["memoized"]:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
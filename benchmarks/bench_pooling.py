@@ -0,0 +1,57 @@
+"""
+Benchmark requests/second of `OctopartClient` with and without connection
+pooling, against a local `FakeOctopartServer`.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_pooling.py [--requests N]
+        [--threads N]
+"""
+
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import logging
+import time
+
+from octopart.client import OctopartClient
+from octopart.fakeserver import FakeOctopartServer
+
+
+def run(client, n_requests, n_threads):
+    """Issue `n_requests` match calls from `n_threads` threads, return req/s"""
+    queries = [{'mpn': 'RUM001L02T2CL', 'reference': 'RUM001L02T2CL'}]
+
+    def _request(_):
+        return client.match(queries)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=n_threads) as pool:
+        list(pool.map(_request, range(n_requests)))
+    return n_requests / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--threads', type=int, default=10)
+    args = parser.parse_args()
+
+    # The package logs every requested URI at DEBUG level.
+    logging.getLogger('octopart').setLevel(logging.WARNING)
+
+    with FakeOctopartServer(port=0) as server:
+        base_url = server.base_url
+        # keepalive_timeout=0 drops pooled connections before every request,
+        # which reproduces the previous connection-per-request behaviour.
+        unpooled = OctopartClient(
+            api_key='BENCH', base_url=base_url, keepalive_timeout=0)
+        pooled = OctopartClient(
+            api_key='BENCH', base_url=base_url, pool_maxsize=args.threads)
+
+        for name, client in [('unpooled', unpooled), ('pooled', pooled)]:
+            with client:
+                rate = run(client, args.requests, args.threads)
+            print(f'{name:>10}: {rate:8.1f} requests/s')
+
+
+if __name__ == '__main__':
+    main()
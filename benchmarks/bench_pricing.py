@@ -0,0 +1,90 @@
+"""
+Benchmark pricing every offer of a synthetic BOM at several quantities: the
+batched `pricing.PriceEngine` against scanning `PartOffer.prices` for the
+largest break at or below each quantity.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_pricing.py [--parts N]
+"""
+
+import argparse
+import random
+import time
+
+from octopart import models
+from octopart.pricing import PriceEngine
+
+QUANTITIES = [1, 10, 25, 100, 250, 1000, 5000]
+
+
+def make_parts(count, offers_per_part=8, seed=0):
+    rng = random.Random(seed)
+    parts = []
+    for i in range(count):
+        offers = []
+        for j in range(offers_per_part):
+            price = rng.uniform(0.01, 5)
+            breaks = sorted(rng.sample([1, 10, 25, 100, 500, 1000, 2500], 4))
+            offers.append({
+                'seller': {'name': 'Seller %s' % j},
+                'sku': 'SKU-%s-%s' % (i, j),
+                'in_stock_quantity': rng.choice([0, 100, 10000]),
+                'moq': rng.choice([1, 1, 10]),
+                'prices': {'USD': [
+                    [quantity, '%.5f' % (price / (1 + k))]
+                    for k, quantity in enumerate(breaks)]},
+            })
+        parts.append({'uid': '%016x' % i, 'offers': offers})
+    return parts
+
+
+def scan(parts):
+    """Per-offer, per-quantity Python loop over the models"""
+    prices = []
+    for part in parts:
+        for offer in models.Part(part).offers:
+            if (offer.in_stock_quantity or 0) <= 0:
+                continue
+            breaks = offer.prices.get('USD', {})
+            row = []
+            for quantity in QUANTITIES:
+                eligible = [
+                    break_quantity for break_quantity in breaks
+                    if break_quantity <= quantity]
+                if eligible and quantity >= (offer.moq or 0):
+                    row.append(breaks[max(eligible)])
+                else:
+                    row.append(None)
+            prices.append(row)
+    return len(prices)
+
+
+def batched(parts):
+    return len(PriceEngine.from_parts(parts).quote(QUANTITIES))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--parts', type=int, default=20000)
+    args = parser.parse_args()
+
+    parts = make_parts(args.parts)
+    timings = {}
+    for name, price in [('python scan', scan), ('engine', batched)]:
+        start = time.perf_counter()
+        offers = price(parts)
+        timings[name] = time.perf_counter() - start
+        print(f'{name:>11}: {timings[name] * 1000:9.1f} ms for {offers} '
+              f'offers x {len(QUANTITIES)} quantities')
+
+    engine = PriceEngine.from_parts(parts)
+    start = time.perf_counter()
+    engine.quote(QUANTITIES)
+    print(f'{"quote only":>11}: '
+          f'{(time.perf_counter() - start) * 1000:9.1f} ms '
+          '(engine already built)')
+    print(f'speedup: {timings["python scan"] / timings["engine"]:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark `octopart.match` offline, against recorded traffic.
+
+Match requests for `--mpns` MPNs are first recorded from a local
+`FakeOctopartServer` with a `RecordingAdapter`, or read from an existing
+`--archive`. They are then replayed by a `ReplayAdapter` with injected
+latency and server errors, through contexts with 1 and `--threads` worker
+threads. The same seed gives the same faults on every run.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_replay.py [--mpns N]
+        [--threads N] [--latency SECONDS] [--error-rate RATE]
+        [--archive PATH]
+"""
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+
+from octopart import api
+from octopart.client import DEFAULT_BASE_URL, OctopartClient
+from octopart.context import OctopartContext
+from octopart.fakeserver import FakeOctopartServer
+from octopart.transport import RecordingAdapter, ReplayAdapter, TrafficArchive
+
+
+def record(archive, mpns):
+    with FakeOctopartServer(port=0) as server, archive:
+        client = OctopartClient(
+            api_key='BENCH', base_url=server.base_url,
+            transport=RecordingAdapter(archive))
+        with OctopartContext(client=client) as context:
+            api.match(mpns, context=context)
+
+
+def replay(archive, mpns, threads, base_url, args):
+    adapter = ReplayAdapter(
+        archive, latency=args.latency, error_rate=args.error_rate, seed=1)
+    client = OctopartClient(
+        api_key='BENCH', base_url=base_url, transport=adapter)
+    with OctopartContext(client=client, max_workers=threads) as context:
+        start = time.perf_counter()
+        results = api.match(mpns, context=context)
+        elapsed = time.perf_counter() - start
+    assert len(results) == len(mpns)
+    return elapsed, adapter
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--mpns', type=int, default=400)
+    parser.add_argument('--threads', type=int, default=10)
+    parser.add_argument('--latency', type=float, default=0.05)
+    parser.add_argument('--error-rate', type=float, default=0.05)
+    parser.add_argument('--archive')
+    args = parser.parse_args()
+
+    # The package logs every requested URI at DEBUG level.
+    logging.getLogger('octopart').setLevel(logging.WARNING)
+
+    mpns = ['MPN-%s' % i for i in range(args.mpns)]
+    with tempfile.TemporaryDirectory() as tmpdir:
+        archive = TrafficArchive(
+            args.archive or os.path.join(tmpdir, 'traffic.jsonl.gz'))
+        # requests are matched by path: the fake server serves the API at
+        # its root, no host is contacted while replaying
+        base_url = 'http://replay'
+        if not os.path.exists(archive.path):
+            record(archive, mpns)
+        elif args.archive:
+            base_url = DEFAULT_BASE_URL
+        print(f'{archive.path}: {os.path.getsize(archive.path)} bytes')
+
+        for threads in (1, args.threads):
+            elapsed, adapter = replay(archive, mpns, threads, base_url, args)
+            print(f'{threads:>3} threads: {elapsed:6.2f} s, '
+                  f'{adapter.replayed} responses replayed, '
+                  f'{adapter.errors} injected errors retried')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+"""
+Benchmark peak memory and time of processing a large match response:
+decoded in one go, as `OctopartClient.match` does, against streamed result
+by result with `streaming.iter_array_items`, as `match_stream` does.
+
+The synthetic response has `--results` match results, each with a part
+that has many offers and specs, as with include[]=specs. Its body is
+produced in chunks, as if read from a socket, so that only the whole-body
+decode holds all of it. Each result is wrapped in a `PartsMatchResult` and
+its offers counted, then dropped. Peak memory is measured with
+`tracemalloc`, in a run of its own.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_streaming.py [--results N]
+"""
+
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+
+from octopart import models
+from octopart.codec import default_codec
+from octopart.streaming import STREAM_CHUNK_SIZE, iter_array_items
+
+
+def make_result(i, offers=50, specs=100):
+    return {
+        '__class__': 'PartsMatchResult',
+        'reference': 'MPN-%s' % i,
+        'hits': 1,
+        'items': [{
+            'uid': '%016x' % i,
+            'mpn': 'MPN-%s' % i,
+            'offers': [
+                {
+                    'sku': 'SKU-%s-%s' % (i, j),
+                    'in_stock_quantity': 1000,
+                    'prices': {'USD': [[1, '0.10'], [100, '0.08']]},
+                    'seller': {'name': 'Seller %s' % j},
+                }
+                for j in range(offers)
+            ],
+            'specs': {
+                'spec_%s' % k: {'value': [str(k)], 'display_value': str(k)}
+                for k in range(specs)
+            },
+        }],
+    }
+
+
+def iter_body(results):
+    """Body of a match response with `results` results, in chunks"""
+    pending = b'{"__class__": "PartsMatchResponse", "msec": 1, "results": ['
+    for i in range(results):
+        pending += (b', ' if i else b'') + json.dumps(make_result(i)).encode()
+        while len(pending) >= STREAM_CHUNK_SIZE:
+            yield pending[:STREAM_CHUNK_SIZE]
+            pending = pending[STREAM_CHUNK_SIZE:]
+    yield pending + b']}'
+
+
+def process(result_data):
+    return sum(len(part.offers)
+               for part in models.PartsMatchResult(result_data).parts)
+
+
+def decode_whole(results, codec):
+    body = b''.join(iter_body(results))
+    return sum(process(result) for result in codec.loads(body)['results'])
+
+
+def decode_streamed(results, codec):
+    return sum(
+        process(result)
+        for result in iter_array_items(iter_body(results), loads=codec.loads))
+
+
+def measure(func, results, codec):
+    """Offers counted, seconds taken, and peak bytes allocated by `func`"""
+    gc.collect()
+    start = time.perf_counter()
+    offers = func(results, codec)
+    elapsed = time.perf_counter() - start
+    # tracemalloc slows down allocations, so time a separate run
+    gc.collect()
+    tracemalloc.start()
+    func(results, codec)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return offers, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--results', type=int, default=500)
+    args = parser.parse_args()
+
+    codec = default_codec()
+    size = sum(len(chunk) for chunk in iter_body(args.results))
+    print(f'{args.results} results, {size / 2 ** 20:.1f} MiB body, '
+          f'{codec.name} codec')
+    peaks = {}
+    for name, func in [('whole', decode_whole), ('stream', decode_streamed)]:
+        offers, elapsed, peak = measure(func, args.results, codec)
+        peaks[name] = peak
+        print(f'{name:>6}: peak {peak / 2 ** 20:7.1f} MiB, '
+              f'{elapsed:6.2f} s, {offers} offers')
+    print(f'peak memory: {peaks["whole"] / peaks["stream"]:.0f}x lower')
+
+
+if __name__ == '__main__':
+    main()
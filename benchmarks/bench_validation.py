@@ -0,0 +1,60 @@
+"""
+Benchmark validating /parts/match queries: the compiled
+`validation.match_query_validator` against the schematics path that
+`OctopartClient.match` used before (`PartsMatchQuery.is_valid_list`, then
+`errors_list` for invalid chunks).
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_validation.py [--queries N]
+        [--invalid-every N]
+"""
+
+import argparse
+import time
+
+from octopart import models, utils
+from octopart.validation import match_query_validator
+
+
+def make_queries(count, invalid_every):
+    queries = []
+    for i in range(count):
+        query = {'mpn_or_sku': 'MPN-%s' % i, 'reference': str(i), 'limit': 3}
+        if invalid_every and i % invalid_every == 0:
+            query['limit'] = 'three'
+        queries.append(query)
+    return queries
+
+
+def schematics_errors(chunk):
+    if models.PartsMatchQuery.is_valid_list(chunk):
+        return None
+    return models.PartsMatchQuery.errors_list(chunk)
+
+
+def run(validate, chunks):
+    """Validate every chunk, return (seconds, number of invalid chunks)"""
+    start = time.perf_counter()
+    invalid = sum(1 for chunk in chunks if validate(chunk))
+    return time.perf_counter() - start, invalid
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--queries', type=int, default=20000)
+    parser.add_argument('--invalid-every', type=int, default=0)
+    args = parser.parse_args()
+
+    chunks = utils.chunked(make_queries(args.queries, args.invalid_every))
+    timings = {}
+    for name, validate in [
+            ('schematics', schematics_errors),
+            ('compiled', match_query_validator.errors_list)]:
+        timings[name], invalid = run(validate, chunks)
+        print(f'{name:>10}: {timings[name] * 1000:9.1f} ms for '
+              f'{args.queries} queries ({invalid} invalid chunks)')
+    print(f'speedup: {timings["schematics"] / timings["compiled"]:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -16,5 +16,11 @@ setupLogger(logger)
 
 
 from .api import (  # noqa
-    match, search, part, get_seller, search_seller,
-    get_category, search_category, get_brand, search_brand)
+    match, iter_match, stream_match, search, iter_search, stream_search,
+    part,
+    get_seller, search_seller, iter_search_seller,
+    get_category, search_category, iter_search_category,
+    get_brand, search_brand, iter_search_brand,
+    get_parts, get_brands, get_categories, get_sellers,
+    match_async, search_async, get_default_context, set_default_context)
+from .context import OctopartContext  # noqa
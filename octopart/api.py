@@ -6,17 +6,49 @@ Also wraps the response JSON in types that provide easier access
 to various fields.
 """
 
-from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import collections
+from concurrent.futures import FIRST_COMPLETED, Future, wait
 import itertools
+import threading
 import typing as t
 
 from octopart import models
 from octopart import utils
-from octopart.client import OctopartClient
+from octopart.async_client import AsyncOctopartClient
+from octopart.context import OctopartContext
 from octopart.directives import include_directives_from_kwargs
 
+# Number of worker threads of the default context. Install a context with a
+# `concurrency.AdaptiveLimiter` to adjust concurrency at runtime instead.
 MAX_REQUEST_THREADS = 10
 
+_default_context: t.Optional[OctopartContext] = None
+_default_context_lock = threading.Lock()
+
+
+def get_default_context() -> OctopartContext:
+    """
+    Return the context used by the functions in this module when no `context`
+    argument is given, creating it on first use.
+    """
+    global _default_context
+    with _default_context_lock:
+        if _default_context is None:
+            _default_context = OctopartContext(
+                max_workers=MAX_REQUEST_THREADS)
+        return _default_context
+
+
+def set_default_context(context: t.Optional[OctopartContext]) -> None:
+    """
+    Replace the default context. The previous one is not closed. Passing None
+    makes the next call create a fresh default context.
+    """
+    global _default_context
+    with _default_context_lock:
+        _default_context = context
+
 
 class MatchType(object):
     """
@@ -29,35 +61,13 @@ class MatchType(object):
     MPN_OR_SKU = 'mpn_or_sku'
 
 
-def match(mpns: t.List[str],
-          match_types: t.Optional[t.Tuple[str]] = None,
-          partial_match: t.Optional[bool] = False,
-          limit: t.Optional[int] = 3,
-          sellers: t.Optional[t.Tuple[str]] = None,
-          show: t.Optional[t.List[str]] = None,
-          hide: t.Optional[t.List[str]] = None,
-          **kwargs
-          ) -> t.List[models.PartsMatchResult]:
-    """
-    Match a list of MPNs against Octopart.
-
-    Args:
-        mpns: list of str MPNs
-
-    Kwargs:
-        partial_match: whether to surround 'mpns' in wildcards to perform a
-            partial part number match.
-        limit: maximum number of results to return for each MPN
-        sellers: list of str part sellers
-        include_*, e.g. include_cad_models (bool): by setting to True, the
-            corresponding field is set in the include directive of the
-            Octopart API call, resulting in optional information being
-            returned (see enum `IncludeDirectives` in directives.py for list of
-            possible argument names)
-
-    Returns:
-        list of `models.PartsMatchResult` objects.
-    """
+def _match_queries(mpns: t.List[str],
+                   match_types: t.Optional[t.Tuple[str]],
+                   partial_match: t.Optional[bool],
+                   limit: t.Optional[int],
+                   sellers: t.Optional[t.Tuple[str]],
+                   ) -> t.List[t.Dict[str, t.Any]]:
+    """Build the /parts/match queries for `match` and `match_async`"""
     unique_mpns = utils.unique(mpns)
     match_types = match_types or (MatchType.MPN_OR_SKU,)
     sellers = sellers or ()
@@ -89,14 +99,105 @@ def match(mpns: t.List[str],
                 match_types, unique_mpns, sellers)
         ]
 
+    return queries
+
+
+def match(mpns: t.List[str],
+          match_types: t.Optional[t.Tuple[str]] = None,
+          partial_match: t.Optional[bool] = False,
+          limit: t.Optional[int] = 3,
+          sellers: t.Optional[t.Tuple[str]] = None,
+          show: t.Optional[t.List[str]] = None,
+          hide: t.Optional[t.List[str]] = None,
+          context: t.Optional[OctopartContext] = None,
+          **kwargs
+          ) -> t.List[models.PartsMatchResult]:
+    """
+    Match a list of MPNs against Octopart.
+
+    Args:
+        mpns: list of str MPNs
+
+    Kwargs:
+        partial_match: whether to surround 'mpns' in wildcards to perform a
+            partial part number match.
+        limit: maximum number of results to return for each MPN
+        sellers: list of str part sellers
+        context: `OctopartContext` whose client and thread pool are used.
+            Defaults to `get_default_context()`.
+        include_*, e.g. include_cad_models (bool): by setting to True, the
+            corresponding field is set in the include directive of the
+            Octopart API call, resulting in optional information being
+            returned (see enum `IncludeDirectives` in directives.py for list of
+            possible argument names)
+
+    Returns:
+        list of `models.PartsMatchResult` objects. Use `iter_match` to
+        process results while later chunks are still being requested.
+    """
+    return [
+        result
+        for _, result in iter_match(
+            mpns,
+            match_types=match_types,
+            partial_match=partial_match,
+            limit=limit,
+            sellers=sellers,
+            show=show,
+            hide=hide,
+            ordered=True,
+            context=context,
+            **kwargs)
+    ]
+
+
+def iter_match(mpns: t.List[str],
+               match_types: t.Optional[t.Tuple[str]] = None,
+               partial_match: t.Optional[bool] = False,
+               limit: t.Optional[int] = 3,
+               sellers: t.Optional[t.Tuple[str]] = None,
+               show: t.Optional[t.List[str]] = None,
+               hide: t.Optional[t.List[str]] = None,
+               ordered: bool = False,
+               max_in_flight: t.Optional[int] = None,
+               context: t.Optional[OctopartContext] = None,
+               **kwargs
+               ) -> t.Iterator[t.Tuple[str, models.PartsMatchResult]]:
+    """
+    Generator version of `match`, which yields results as soon as the request
+    for their chunk of queries has completed.
+
+    At most `max_in_flight` chunks are requested at a time; the next chunk is
+    only sent once a previous one has been consumed, so memory use does not
+    grow with the number of MPNs. Requests that are still in flight when the
+    generator is closed are cancelled, or their responses discarded.
+
+    Kwargs:
+        ordered (bool): yield results in the order of `mpns`. By default,
+            each chunk's results are yielded as soon as it completes, which
+            may be out of order.
+        max_in_flight (int): number of chunks requested concurrently.
+            Defaults to the context's `max_workers`.
+        All other arguments are the same as for `match`.
+
+    Yields:
+        (mpn, `models.PartsMatchResult`) tuples, where mpn is the MPN from
+        `mpns` that the result belongs to.
+    """
+    context = context or get_default_context()
+    max_in_flight = max_in_flight or context.max_workers
+    queries = _match_queries(
+        mpns, match_types, partial_match, limit, sellers)
+    # references of partial match queries carry the wildcard
+    mpns_by_reference = {
+        f'{mpn}*' if partial_match else mpn: mpn for mpn in mpns}
+
     # assemble include[] directives as per
     # https://octopart.com/api/docs/v3/rest-api#include-directives
     includes = include_directives_from_kwargs(**kwargs)
 
-    client = OctopartClient()
-
     def _request_chunk(chunk):
-        return client.match(
+        return context.client.match(
             queries=chunk,
             includes=includes,
             show=show or [],
@@ -105,14 +206,74 @@ def match(mpns: t.List[str],
 
     # Execute API calls concurrently to significantly speed up
     # issuing multiple HTTP requests.
-    with ThreadPoolExecutor(max_workers=MAX_REQUEST_THREADS) as pool:
-        responses = pool.map(_request_chunk, utils.chunk_queries(queries))
+    chunks = utils.iter_chunks(queries)
+    in_flight: t.Deque[Future] = collections.deque()
+    try:
+        while True:
+            for chunk in itertools.islice(
+                    chunks, max_in_flight - len(in_flight)):
+                in_flight.append(
+                    context.executor.submit(_request_chunk, chunk))
+            if not in_flight:
+                return
+
+            if ordered:
+                future = in_flight.popleft()
+            else:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                future = next(f for f in in_flight if f in done)
+                in_flight.remove(future)
+
+            for result in future.result()['results']:
+                reference = result['reference']
+                yield (mpns_by_reference.get(reference, reference),
+                       models.PartsMatchResult(result))
+    finally:
+        for future in in_flight:
+            future.cancel()
+
+
+def stream_match(mpns: t.List[str],
+                 match_types: t.Optional[t.Tuple[str]] = None,
+                 partial_match: t.Optional[bool] = False,
+                 limit: t.Optional[int] = 3,
+                 sellers: t.Optional[t.Tuple[str]] = None,
+                 show: t.Optional[t.List[str]] = None,
+                 hide: t.Optional[t.List[str]] = None,
+                 context: t.Optional[OctopartContext] = None,
+                 **kwargs
+                 ) -> t.Iterator[t.Tuple[str, models.PartsMatchResult]]:
+    """
+    Low-memory version of `iter_match`, for responses too large to decode at
+    once, e.g. with specs or datasheets included.
 
-    return [
-        models.PartsMatchResult(result)
-        for response in responses
-        for result in response['results']
-    ]
+    Chunks of queries are requested one after the other, and each result is
+    parsed and yielded as soon as it has been received (see
+    `OctopartClient.match_stream`), so only the result being received and
+    those the caller holds on to are kept in memory. Results are yielded in
+    the order of `mpns`.
+
+    Arguments are the same as for `match`.
+
+    Yields:
+        (mpn, `models.PartsMatchResult`) tuples, as for `iter_match`.
+    """
+    context = context or get_default_context()
+    queries = _match_queries(
+        mpns, match_types, partial_match, limit, sellers)
+    mpns_by_reference = {
+        f'{mpn}*' if partial_match else mpn: mpn for mpn in mpns}
+    includes = include_directives_from_kwargs(**kwargs)
+
+    for chunk in utils.iter_chunks(queries):
+        for result in context.client.match_stream(
+                queries=chunk,
+                includes=includes,
+                show=show or [],
+                hide=hide or []):
+            reference = result['reference']
+            yield (mpns_by_reference.get(reference, reference),
+                   models.PartsMatchResult(result))
 
 
 def search(query: str,
@@ -123,6 +284,7 @@ def search(query: str,
            filter_queries: t.Dict[str, str]=None,
            show: t.List[str]=None,
            hide: t.List[str]=None,
+           context: t.Optional[OctopartContext] = None,
            **kwargs
            ) -> models.PartsSearchResult:
     """
@@ -137,6 +299,8 @@ def search(query: str,
         sortby: [(fieldname, order)] list of tuples
         filter_fields: {fieldname: value} dict
         filter_queries: {fieldname: value} dict
+        context: `OctopartContext` whose client is used. Defaults to
+            `get_default_context()`.
         include_*, e.g. include_cad_models (bool): by setting to True, the
             corresponding field is set in the include directive of the
             Octopart API call, resulting in optional information being
@@ -150,8 +314,8 @@ def search(query: str,
     # https://octopart.com/api/docs/v3/rest-api#include-directives
     includes = include_directives_from_kwargs(**kwargs)
 
-    client = OctopartClient()
-    response = client.search(
+    context = context or get_default_context()
+    response = context.client.search(
         query,
         start=start,
         limit=limit,
@@ -165,19 +329,271 @@ def search(query: str,
     return models.PartsSearchResult(response)
 
 
+def _check_paging(page_size: int, prefetch: int) -> None:
+    if not 0 < page_size <= utils.MAX_SEARCH_LIMIT:
+        raise ValueError(
+            'Expected 0 < page_size <= %s. Saw: %s'
+            % (utils.MAX_SEARCH_LIMIT, page_size))
+    if prefetch < 0:
+        raise ValueError('Expected prefetch >= 0. Saw: %s' % prefetch)
+
+
+def _iter_search_results(request_page: t.Callable[[int, int], dict],
+                         page_size: int,
+                         prefetch: int,
+                         max_results: t.Optional[int],
+                         context: OctopartContext,
+                         ) -> t.Iterator[dict]:
+    """
+    Yield the 'item' of every search result, page by page.
+
+    `request_page(start, limit)` returns the response for one page. The first
+    page is requested right away to learn the number of hits; the next
+    `prefetch` pages are then requested concurrently on the context's thread
+    pool, and topped up as pages are consumed. With a `prefetch` of 0, each
+    page is requested in the calling thread once the previous one has been
+    consumed.
+    """
+    _check_paging(page_size, prefetch)
+    max_results = min(
+        utils.MAX_SEARCH_HITS if max_results is None else max_results,
+        utils.MAX_SEARCH_HITS)
+    if max_results <= 0:
+        return
+
+    first_limit = min(page_size, max_results)
+    first_page = request_page(0, first_limit)
+    total = min(first_page.get('hits', 0), max_results)
+    pages = utils.iter_pages(first_limit, total, page_size)
+    in_flight: t.Deque[Future] = collections.deque()
+
+    def _next_page() -> t.Optional[dict]:
+        if in_flight:
+            return in_flight.popleft().result()
+        # without prefetching, request the next page only now
+        page = next(pages, None)
+        return None if page is None else request_page(*page)
+
+    try:
+        response: t.Optional[dict] = first_page
+        while response is not None:
+            for start, limit in itertools.islice(
+                    pages, prefetch - len(in_flight)):
+                in_flight.append(
+                    context.executor.submit(request_page, start, limit))
+            results = response.get('results', [])
+            for result in results:
+                yield result.get('item', {})
+            if not results:
+                return
+            response = _next_page()
+    finally:
+        for future in in_flight:
+            future.cancel()
+
+
+def iter_search(query: str,
+                page_size: int = utils.MAX_SEARCH_LIMIT,
+                prefetch: int = 2,
+                max_results: t.Optional[int] = None,
+                sortby: t.Optional[t.List[t.Tuple[str, str]]] = None,
+                filter_fields: t.Optional[t.Dict[str, str]] = None,
+                filter_queries: t.Optional[t.Dict[str, str]] = None,
+                show: t.Optional[t.List[str]] = None,
+                hide: t.Optional[t.List[str]] = None,
+                context: t.Optional[OctopartContext] = None,
+                **kwargs
+                ) -> t.Iterator[models.Part]:
+    """
+    Generator version of `search`, which pages through all hits.
+
+    Pages of `page_size` results are requested as needed, with the next
+    `prefetch` pages in flight while the current one is consumed, so only a
+    few pages are held in memory at a time. Requests still in flight when the
+    generator is closed are cancelled, or their responses discarded.
+
+    Kwargs:
+        page_size (int): results per request, at most
+            `utils.MAX_SEARCH_LIMIT`
+        prefetch (int): pages requested ahead of the one being consumed.
+            0 requests each page only once the previous one is consumed.
+        max_results (int): stop after this many parts. Octopart only serves
+            the first `utils.MAX_SEARCH_HITS` hits of a search in any case.
+        All other arguments are the same as for `search`.
+
+    Yields:
+        `models.Part` objects, in the order of the search results.
+    """
+    context = context or get_default_context()
+    includes = include_directives_from_kwargs(**kwargs)
+
+    def _request_page(start, limit):
+        return context.client.search(
+            query,
+            start=start,
+            limit=limit,
+            sortby=sortby,
+            filter_fields=filter_fields,
+            filter_queries=filter_queries,
+            includes=includes,
+            show=show,
+            hide=hide,
+        )
+
+    for item in _iter_search_results(
+            _request_page, page_size, prefetch, max_results, context):
+        yield models.Part(item)
+
+
+def stream_search(query: str,
+                  start: int = 0,
+                  limit: int = 10,
+                  sortby: t.Optional[t.List[t.Tuple[str, str]]] = None,
+                  filter_fields: t.Optional[t.Dict[str, str]] = None,
+                  filter_queries: t.Optional[t.Dict[str, str]] = None,
+                  show: t.Optional[t.List[str]] = None,
+                  hide: t.Optional[t.List[str]] = None,
+                  context: t.Optional[OctopartContext] = None,
+                  **kwargs
+                  ) -> t.Iterator[models.Part]:
+    """
+    Low-memory version of `search`: yield each part of the page as soon as
+    it has been received (see `OctopartClient.search_stream`), instead of
+    decoding the whole response first.
+
+    Arguments are the same as for `search`.
+
+    Yields:
+        `models.Part` objects, in the order of the search results.
+    """
+    context = context or get_default_context()
+    includes = include_directives_from_kwargs(**kwargs)
+    for result in context.client.search_stream(
+            query,
+            start=start,
+            limit=limit,
+            sortby=sortby,
+            filter_fields=filter_fields,
+            filter_queries=filter_queries,
+            includes=includes,
+            show=show,
+            hide=hide):
+        yield models.Part(result.get('item', {}))
+
+
+async def match_async(mpns: t.List[str],
+                      match_types: t.Optional[t.Tuple[str]] = None,
+                      partial_match: t.Optional[bool] = False,
+                      limit: t.Optional[int] = 3,
+                      sellers: t.Optional[t.Tuple[str]] = None,
+                      show: t.Optional[t.List[str]] = None,
+                      hide: t.Optional[t.List[str]] = None,
+                      client: t.Optional[AsyncOctopartClient] = None,
+                      **kwargs
+                      ) -> t.List[models.PartsMatchResult]:
+    """
+    asyncio version of `match`.
+
+    Chunks are requested concurrently with `asyncio.gather`, bounded by the
+    client's `max_concurrency`.
+
+    Kwargs:
+        client: `AsyncOctopartClient` to send requests with. If omitted, a
+            client is created for this call and closed afterwards.
+        All other arguments are the same as for `match`.
+
+    Returns:
+        list of `models.PartsMatchResult` objects.
+    """
+    queries = _match_queries(
+        mpns, match_types, partial_match, limit, sellers)
+    includes = include_directives_from_kwargs(**kwargs)
+
+    owns_client = client is None
+    client = client or AsyncOctopartClient()
+    try:
+        # endpoint methods are annotated for the synchronous client
+        responses = await asyncio.gather(*[  # type: ignore
+            client.match(
+                queries=chunk,
+                includes=includes,
+                show=show or [],
+                hide=hide or [],
+            )
+            for chunk in utils.chunk_queries(queries)
+        ])
+    finally:
+        if owns_client:
+            await client.close()
+
+    return [
+        models.PartsMatchResult(result)
+        for response in responses
+        for result in response['results']
+    ]
+
+
+async def search_async(query: str,
+                       start: int=0,
+                       limit: int=10,
+                       sortby: t.List[t.Tuple[str, str]]=None,
+                       filter_fields: t.Dict[str, str]=None,
+                       filter_queries: t.Dict[str, str]=None,
+                       show: t.List[str]=None,
+                       hide: t.List[str]=None,
+                       client: t.Optional[AsyncOctopartClient] = None,
+                       **kwargs
+                       ) -> models.PartsSearchResult:
+    """
+    asyncio version of `search`.
+
+    Kwargs:
+        client: `AsyncOctopartClient` to send requests with. If omitted, a
+            client is created for this call and closed afterwards.
+        All other arguments are the same as for `search`.
+
+    Returns:
+        `models.PartsSearchResult` object.
+    """
+    includes = include_directives_from_kwargs(**kwargs)
+
+    owns_client = client is None
+    client = client or AsyncOctopartClient()
+    try:
+        response = await client.search(  # type: ignore
+            query,
+            start=start,
+            limit=limit,
+            sortby=sortby,
+            filter_fields=filter_fields,
+            filter_queries=filter_queries,
+            includes=includes,
+            show=show,
+            hide=hide,
+        )
+    finally:
+        if owns_client:
+            await client.close()
+    return models.PartsSearchResult(response)
+
+
 def part(uid: str,
          includes: t.Optional[t.List[str]] = None,
          hide: t.Optional[t.List[str]] = None,
          show: t.Optional[t.List[str]] = None,
+         context: t.Optional[OctopartContext] = None,
          ) -> models.Part:
-    client = OctopartClient()
-    part_res = client.part(uid, includes=includes, hide=hide, show=show)
+    context = context or get_default_context()
+    part_res = context.client.part(
+        uid, includes=includes, hide=hide, show=show)
     return models.Part(part_res)
 
 
-def get_brand(uid: str) -> models.Brand:
-    client = OctopartClient()
-    brand_dict = client.get_brand(uid)
+def get_brand(uid: str,
+              context: t.Optional[OctopartContext] = None,
+              ) -> models.Brand:
+    context = context or get_default_context()
+    brand_dict = context.client.get_brand(uid)
     return models.Brand(brand_dict)
 
 
@@ -185,16 +601,38 @@ def search_brand(query: str,
                  start: t.Optional[int] = None,
                  limit: t.Optional[int] = None,
                  sortby: t.Optional[t.List[t.Tuple[str, str]]] = None,
+                 context: t.Optional[OctopartContext] = None,
                  ) -> t.List[models.Brand]:
-    client = OctopartClient()
-    res = client.search_brand(
+    context = context or get_default_context()
+    res = context.client.search_brand(
         query=query, start=start, limit=limit, sortby=sortby)
     return [models.Brand(bd.get('item', {})) for bd in res.get('results', [])]
 
 
-def get_category(uid: str) -> models.Category:
-    client = OctopartClient()
-    cat_dict = client.get_category(uid)
+def iter_search_brand(query: str,
+                      page_size: int = utils.MAX_SEARCH_LIMIT,
+                      prefetch: int = 2,
+                      max_results: t.Optional[int] = None,
+                      sortby: t.Optional[t.List[t.Tuple[str, str]]] = None,
+                      context: t.Optional[OctopartContext] = None,
+                      ) -> t.Iterator[models.Brand]:
+    """Same as `iter_search`, for brands"""
+    context = context or get_default_context()
+
+    def _request_page(start, limit):
+        return context.client.search_brand(
+            query=query, start=start, limit=limit, sortby=sortby)
+
+    for item in _iter_search_results(
+            _request_page, page_size, prefetch, max_results, context):
+        yield models.Brand(item)
+
+
+def get_category(uid: str,
+                 context: t.Optional[OctopartContext] = None,
+                 ) -> models.Category:
+    context = context or get_default_context()
+    cat_dict = context.client.get_category(uid)
     return models.Category(cat_dict, strict=False)
 
 
@@ -202,9 +640,10 @@ def search_category(query: str,
                     start: t.Optional[int] = None,
                     limit: t.Optional[int] = None,
                     sortby: t.Optional[t.List[t.Tuple[str, str]]] = None,
+                    context: t.Optional[OctopartContext] = None,
                     ) -> t.List[models.Category]:
-    client = OctopartClient()
-    res = client.search_category(
+    context = context or get_default_context()
+    res = context.client.search_category(
         query=query, start=start, limit=limit, sortby=sortby)
     return [
         models.Category(bd.get('item', {}), strict=False)
@@ -212,9 +651,30 @@ def search_category(query: str,
     ]
 
 
-def get_seller(uid: str) -> models.Seller:
-    client = OctopartClient()
-    slr_dict = client.get_seller(uid)
+def iter_search_category(query: str,
+                         page_size: int = utils.MAX_SEARCH_LIMIT,
+                         prefetch: int = 2,
+                         max_results: t.Optional[int] = None,
+                         sortby: t.Optional[t.List[t.Tuple[str, str]]] = None,
+                         context: t.Optional[OctopartContext] = None,
+                         ) -> t.Iterator[models.Category]:
+    """Same as `iter_search`, for categories"""
+    context = context or get_default_context()
+
+    def _request_page(start, limit):
+        return context.client.search_category(
+            query=query, start=start, limit=limit, sortby=sortby)
+
+    for item in _iter_search_results(
+            _request_page, page_size, prefetch, max_results, context):
+        yield models.Category(item, strict=False)
+
+
+def get_seller(uid: str,
+               context: t.Optional[OctopartContext] = None,
+               ) -> models.Seller:
+    context = context or get_default_context()
+    slr_dict = context.client.get_seller(uid)
     return models.Seller(slr_dict, strict=False)
 
 
@@ -222,11 +682,102 @@ def search_seller(query: str,
                   start: t.Optional[int] = None,
                   limit: t.Optional[int] = None,
                   sortby: t.Optional[t.List[t.Tuple[str, str]]] = None,
+                  context: t.Optional[OctopartContext] = None,
                   ) -> t.List[models.Seller]:
-    client = OctopartClient()
-    res = client.search_seller(
+    context = context or get_default_context()
+    res = context.client.search_seller(
         query=query, start=start, limit=limit, sortby=sortby)
     return [
         models.Seller(res.get('item', {}), strict=False)
         for res in res.get('results', [])
     ]
+
+
+def iter_search_seller(query: str,
+                       page_size: int = utils.MAX_SEARCH_LIMIT,
+                       prefetch: int = 2,
+                       max_results: t.Optional[int] = None,
+                       sortby: t.Optional[t.List[t.Tuple[str, str]]] = None,
+                       context: t.Optional[OctopartContext] = None,
+                       ) -> t.Iterator[models.Seller]:
+    """Same as `iter_search`, for sellers"""
+    context = context or get_default_context()
+
+    def _request_page(start, limit):
+        return context.client.search_seller(
+            query=query, start=start, limit=limit, sortby=sortby)
+
+    for item in _iter_search_results(
+            _request_page, page_size, prefetch, max_results, context):
+        yield models.Seller(item, strict=False)
+
+
+def _get_multi(client_method: t.Callable[..., t.Dict[str, dict]],
+               uids: t.Iterable[str],
+               context: OctopartContext,
+               **kwargs
+               ) -> t.Dict[str, dict]:
+    """
+    Call a client 'get_multi' method once per chunk of unique `uids`,
+    concurrently on the context's thread pool, and merge the results.
+    """
+    chunks = utils.iter_uid_chunks(utils.unique(list(uids)))
+    results: t.Dict[str, dict] = {}
+    for response in context.executor.map(
+            lambda chunk: client_method(chunk, **kwargs), chunks):
+        results.update(response)
+    return results
+
+
+def get_parts(uids: t.Iterable[str],
+              includes: t.Optional[t.List[str]] = None,
+              hide: t.Optional[t.List[str]] = None,
+              show: t.Optional[t.List[str]] = None,
+              context: t.Optional[OctopartContext] = None,
+              ) -> t.Dict[str, models.Part]:
+    """
+    Retrieve any number of parts by UID. Duplicate UIDs are requested once,
+    and UIDs are sent in as few requests as fit into URLs, concurrently.
+
+    Returns:
+        {uid: `models.Part`} dict. UIDs that Octopart does not know are
+        missing.
+    """
+    context = context or get_default_context()
+    parts = _get_multi(
+        context.client.get_parts, uids, context,
+        includes=includes, hide=hide, show=show)
+    return {uid: models.Part(part) for uid, part in parts.items()}
+
+
+def get_brands(uids: t.Iterable[str],
+               context: t.Optional[OctopartContext] = None,
+               ) -> t.Dict[str, models.Brand]:
+    """Same as `get_parts`, for brands"""
+    context = context or get_default_context()
+    brands = _get_multi(context.client.get_brands, uids, context)
+    return {uid: models.Brand(brand) for uid, brand in brands.items()}
+
+
+def get_categories(uids: t.Iterable[str],
+                   context: t.Optional[OctopartContext] = None,
+                   ) -> t.Dict[str, models.Category]:
+    """Same as `get_parts`, for categories"""
+    context = context or get_default_context()
+    categories = _get_multi(context.client.get_categories, uids, context)
+    return {
+        uid: models.Category(category, strict=False)
+        for uid, category in categories.items()
+    }
+
+
+def get_sellers(uids: t.Iterable[str],
+                context: t.Optional[OctopartContext] = None,
+                ) -> t.Dict[str, models.Seller]:
+    """Same as `get_parts`, for sellers"""
+    context = context or get_default_context()
+    sellers = _get_multi(context.client.get_sellers, uids, context)
+    return {
+        uid: models.Seller(seller, strict=False)
+        for uid, seller in sellers.items()
+    }
@@ -0,0 +1,158 @@
+import asyncio
+import logging
+import typing as t
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover
+    aiohttp = None  # type: ignore
+
+from octopart.client import (
+    BaseOctopartClient, DEFAULT_BASE_URL, DEFAULT_POOL_MAXSIZE)
+from octopart.codec import JSONCodec
+from octopart.decorators import retry_with_policy
+from octopart.retries import RetryBudget, RetryPolicy
+from octopart.utils import iter_uid_chunks
+
+logger = logging.getLogger(__name__)
+
+
+# Maximum number of requests a client has in flight at the same time.
+DEFAULT_MAX_CONCURRENCY = 10
+
+# Seconds an idle connection is kept open for reuse (aiohttp's default).
+DEFAULT_KEEPALIVE_TIMEOUT = 15.0
+
+if aiohttp is not None:
+    RETRY_ON: t.Tuple[t.Type[Exception], ...] = (
+        aiohttp.ClientError, asyncio.TimeoutError)
+else:  # pragma: no cover
+    RETRY_ON = (asyncio.TimeoutError,)
+
+
+def query_from_params(params: t.Dict[str, t.Any]
+                      ) -> t.List[t.Tuple[str, str]]:
+    """
+    Flatten request parameters into (key, value) pairs the way `requests`
+    does: list values are repeated, None values are dropped.
+
+    >>> query_from_params({'include[]': ['specs', 'imagesets'], 'start': 0,
+    ...                    'sortby': None})
+    [('include[]', 'specs'), ('include[]', 'imagesets'), ('start', '0')]
+    """
+    query: t.List[t.Tuple[str, str]] = []
+    for key, value in params.items():
+        values = value if isinstance(value, (list, tuple)) else [value]
+        query.extend((key, str(val)) for val in values if val is not None)
+    return query
+
+
+class AsyncOctopartClient(BaseOctopartClient):
+    """asyncio client object for Octopart API v3
+
+    Offers the same endpoint methods as `OctopartClient`, but each of them
+    returns an awaitable. Requires the optional `aiohttp` dependency
+    (`pip install octopart[async]`).
+
+    All requests share one `aiohttp` connection pool, and at most
+    `max_concurrency` of them are in flight at a time. The client must be
+    closed when done, preferably by using it as an async context manager:
+
+        async with AsyncOctopartClient() as client:
+            response = await client.match([{'mpn': 'RUM001L02T2CL'}])
+    """
+
+    def __init__(self,
+                 api_key: t.Optional[str] = None,
+                 base_url: t.Optional[str] = DEFAULT_BASE_URL,
+                 pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+                 max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                 keepalive_timeout: float = DEFAULT_KEEPALIVE_TIMEOUT,
+                 retry_policy: t.Optional[RetryPolicy] = None,
+                 codec: t.Optional[JSONCodec] = None,
+                 ) -> None:
+        """
+        Kwargs:
+            api_key (str): Octopart API key
+            base_url (str): root URL of the Octopart API
+            pool_maxsize (int): maximum number of open connections
+            max_concurrency (int): maximum number of requests in flight
+            keepalive_timeout (float): seconds an idle connection is kept
+                open for reuse
+            retry_policy (RetryPolicy): see `OctopartClient`
+            codec (JSONCodec): see `OctopartClient`
+        """
+        if aiohttp is None:
+            raise ImportError(
+                "AsyncOctopartClient requires aiohttp. "
+                "Install it with 'pip install octopart[async]'.")
+        super().__init__(api_key=api_key, base_url=base_url, codec=codec)
+        self.pool_maxsize = pool_maxsize
+        self.max_concurrency = max_concurrency
+        self.keepalive_timeout = keepalive_timeout
+        self.retry_policy = retry_policy or RetryPolicy(budget=RetryBudget())
+
+        # Both are bound to the running event loop, so they are created on
+        # first use rather than here.
+        self._session: t.Optional['aiohttp.ClientSession'] = None
+        self._semaphore: t.Optional[asyncio.Semaphore] = None
+
+    @property
+    def session(self) -> 'aiohttp.ClientSession':
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.pool_maxsize,
+                keepalive_timeout=self.keepalive_timeout)
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def close(self) -> None:
+        """Close all pooled connections held by this client."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+        # bound to the loop that created it, like the session
+        self._semaphore = None
+
+    async def __aenter__(self) -> 'AsyncOctopartClient':
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def _get_multi(self,
+                         path: str,
+                         uids: t.List[str],
+                         params: t.Optional[t.Dict[str, t.Any]] = None,
+                         ) -> t.Dict[str, t.Any]:
+        # chunks are requested concurrently, bounded by `max_concurrency`
+        responses = await asyncio.gather(*[
+            self._request(path, params=dict(params or {}, **{'uid[]': chunk}))
+            for chunk in iter_uid_chunks(uids)
+        ])
+        results: t.Dict[str, t.Any] = {}
+        for response in responses:
+            results.update(response)
+        return results
+
+    @retry_with_policy(RETRY_ON)
+    async def _request(self,
+                       path: str,
+                       params: t.Dict[str, t.Any]=None
+                       ) -> t.Any:
+        params = dict(params or {})
+        params.update(self.api_key_param)
+
+        async with self.semaphore:
+            async with self.session.get(
+                    '%s%s' % (self.base_url, path),
+                    params=query_from_params(params)) as response:
+                logger.debug('Requested Octopart URI: %s', response.url)
+                response.raise_for_status()
+                return self.codec.loads(await response.read())
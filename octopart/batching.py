@@ -0,0 +1,228 @@
+"""
+Batching of single /parts/match queries from independent callers.
+"""
+
+from concurrent.futures import Future, ThreadPoolExecutor
+import itertools
+import logging
+import queue
+import threading
+import time
+import typing as t
+
+from octopart import utils
+from octopart.client import OctopartClient
+from octopart.exceptions import OctopartError
+from octopart.validation import match_query_validator
+
+logger = logging.getLogger(__name__)
+
+# Octopart accepts at most 20 queries per /parts/match request.
+MAX_BATCH_SIZE = 20
+
+# Seconds to wait for more queries after the first one of a batch arrived.
+DEFAULT_LINGER = 0.005
+
+_STOP = object()
+
+
+class MatchBatcher(object):
+    """Collects match queries from concurrent callers into shared requests
+
+    Every query passed to `submit` or `match` is queued. A background thread
+    takes the first queued query, waits up to `linger` seconds for more, and
+    sends them all in one /parts/match request once the batch is full (by
+    `max_batch_size` queries, or by the URL length limit) or the linger time
+    is up. Each caller gets back the result of its own query.
+
+    Include, show and hide directives are shared by all queries of a
+    batcher; use separate batchers for queries that need different ones.
+
+    Counters:
+        batches: number of /parts/match requests sent
+        queries: number of queries sent
+    """
+
+    def __init__(self,
+                 client: OctopartClient,
+                 linger: float = DEFAULT_LINGER,
+                 max_batch_size: int = MAX_BATCH_SIZE,
+                 max_concurrent_batches: int = 4,
+                 exact_only: t.Optional[bool] = False,
+                 includes: t.Optional[t.List[str]] = None,
+                 hide: t.Optional[t.List[str]] = None,
+                 show: t.Optional[t.List[str]] = None,
+                 ) -> None:
+        """
+        Args:
+            client: client to send the batched requests with
+
+        Kwargs:
+            linger (float): seconds to wait for a batch to fill up
+            max_batch_size (int): maximum number of queries per request, at
+                most 20
+            max_concurrent_batches (int): number of requests in flight at once
+            exact_only, includes, hide, show: Same as
+                `OctopartClient.match()`.
+        """
+        if not 0 < max_batch_size <= MAX_BATCH_SIZE:
+            raise ValueError(
+                'Expected `max_batch_size` to be between 1 and %s. Saw: %s'
+                % (MAX_BATCH_SIZE, max_batch_size))
+        self.client = client
+        self.linger = linger
+        self.max_batch_size = max_batch_size
+        self.max_concurrent_batches = max_concurrent_batches
+        self.match_kwargs: t.Dict[str, t.Any] = {
+            'exact_only': exact_only,
+            'includes': includes,
+            'hide': hide,
+            'show': show,
+        }
+
+        self.batches = 0
+        self.queries = 0
+
+        self._queue: queue.Queue = queue.Queue()
+        self._tokens = itertools.count()
+        self._lock = threading.Lock()
+        self._worker: t.Optional[threading.Thread] = None
+        self._executor: t.Optional[ThreadPoolExecutor] = None
+
+    def submit(self, query: t.Dict[str, t.Any]) -> Future:
+        """
+        Queue a single match query.
+
+        Args:
+            query (dict): see `models.PartsMatchQuery` for its fields
+
+        Returns:
+            `concurrent.futures.Future` of the query's result dict
+            (see `models.PartsMatchResult`).
+        """
+        # validate here, so that one malformed query cannot fail a batch
+        errors = match_query_validator.errors_list([query])
+        if errors:
+            raise OctopartError('Query is malformed: %s' % errors)
+
+        future: Future = Future()
+        # Replace the caller's reference with one that is unique within the
+        # batch, so that each result can be routed back to its caller.
+        token = 'batch-%s' % next(self._tokens)
+        sent_query = dict(query, reference=token)
+        self._ensure_started()
+        self._queue.put((token, sent_query, query.get('reference'), future))
+        return future
+
+    def match(self,
+              query: t.Dict[str, t.Any],
+              timeout: t.Optional[float] = None,
+              ) -> t.Dict[str, t.Any]:
+        """Queue a single match query and wait for its result dict"""
+        return self.submit(query).result(timeout)
+
+    @property
+    def average_batch_size(self) -> float:
+        return self.queries / self.batches if self.batches else 0.0
+
+    def close(self) -> None:
+        """Send all queued queries, then stop the background thread."""
+        with self._lock:
+            worker, self._worker = self._worker, None
+            executor, self._executor = self._executor, None
+        if worker is not None:
+            self._queue.put(_STOP)
+            worker.join()
+        if executor is not None:
+            executor.shutdown()
+
+    def __enter__(self) -> 'MatchBatcher':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _ensure_started(self) -> None:
+        with self._lock:
+            if self._worker is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_concurrent_batches)
+                self._worker = threading.Thread(
+                    target=self._collect,
+                    args=(self._executor,),
+                    name='octopart-match-batcher',
+                    daemon=True)
+                self._worker.start()
+
+    def _collect(self, executor: ThreadPoolExecutor) -> None:
+        """Background loop: group queued queries into batches and send them"""
+        carry = None
+        stopping = False
+        while not stopping:
+            item = carry if carry is not None else self._queue.get()
+            carry = None
+            if item is _STOP:
+                break
+
+            batch = [item]
+            length = (utils.QUERIES_PARAM_OVERHEAD
+                      + utils.encoded_query_length(item[1]))
+            deadline = time.monotonic() + self.linger
+
+            while len(batch) < self.max_batch_size:
+                try:
+                    item = self._queue.get(
+                        timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                item_length = (utils.QUERY_SEPARATOR_LENGTH
+                               + utils.encoded_query_length(item[1]))
+                if length + item_length > utils.URL_MAX_LENGTH:
+                    # starts the next batch instead
+                    carry = item
+                    break
+                batch.append(item)
+                length += item_length
+
+            executor.submit(self._send, batch)
+
+    def _send(self, batch) -> None:
+        # Leave out queries whose caller cancelled them while queued. The
+        # others can no longer be cancelled, so each gets its result.
+        batch = [
+            item for item in batch if item[3].set_running_or_notify_cancel()]
+        if not batch:
+            return
+
+        with self._lock:
+            self.batches += 1
+            self.queries += len(batch)
+
+        try:
+            response = self.client.match(
+                [sent_query for _, sent_query, _, _ in batch],
+                **self.match_kwargs)
+        except Exception as exc:
+            for _, _, _, future in batch:
+                future.set_exception(exc)
+            return
+
+        pending = {
+            token: (reference, future)
+            for token, _, reference, future in batch
+        }
+        for result in response.get('results', []):
+            entry = pending.pop(result.get('reference'), None)
+            if entry is None:
+                logger.warning(
+                    'Unexpected match result reference: %s',
+                    result.get('reference'))
+                continue
+            reference, future = entry
+            future.set_result(dict(result, reference=reference))
+
+        for _, future in pending.values():
+            future.set_exception(OctopartError('Query has no match result'))
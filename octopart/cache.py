@@ -0,0 +1,363 @@
+"""
+Response caches for `OctopartClient`.
+
+A cache stores decoded API responses under a key derived from the request
+path and its parameters. Whether, and for how long, a response is cached
+depends on its endpoint (see `utils.endpoint_from_path`): brands, sellers and
+categories rarely change, while part offers go stale quickly.
+"""
+
+import collections
+import json
+import logging
+import sqlite3
+import threading
+import time
+import typing as t
+import zlib
+
+logger = logging.getLogger(__name__)
+
+# Seconds a response stays fresh, by endpoint. Endpoints that are missing
+# here are not cached.
+DEFAULT_TTLS: t.Dict[str, t.Optional[float]] = {
+    'brands.get': 24 * 60 * 60,
+    'sellers.get': 24 * 60 * 60,
+    'categories.get': 24 * 60 * 60,
+    # parts carry offers, whose prices and stock change often
+    'parts.get': 5 * 60,
+}
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Seconds between two background sweeps of expired `SQLiteCache` entries.
+DEFAULT_VACUUM_INTERVAL = 10 * 60
+
+# (expires_at, size, value) tuple stored by `MemoryCache`
+_Entry = t.Tuple[float, int, t.Any]
+
+
+def cache_key(path: str, params: t.Optional[t.Dict[str, t.Any]]) -> str:
+    """
+    Build a cache key from a request path and its parameters. Parameter order,
+    and the order of values in list parameters such as `include[]`, do not
+    matter.
+
+    >>> cache_key('/parts/abc', {'show[]': ['b', 'a'], 'include[]': ['x']})
+    '/parts/abc?include[]=["x"]&show[]=["a", "b"]'
+    >>> cache_key('/brands/abc', None)
+    '/brands/abc'
+    """
+    normalized = []
+    for name, value in sorted((params or {}).items()):
+        if isinstance(value, (list, tuple)):
+            value = sorted(value)
+        normalized.append('%s=%s' % (name, json.dumps(value)))
+    if not normalized:
+        return path
+    return '%s?%s' % (path, '&'.join(normalized))
+
+
+class CacheStats(object):
+    """Hit, miss and eviction counters of a cache, per endpoint"""
+
+    FIELDS = ('hits', 'misses', 'evictions')
+
+    def __init__(self) -> None:
+        self._counts: t.Dict[str, t.Counter[str]] = (
+            collections.defaultdict(collections.Counter))
+        self._lock = threading.Lock()
+
+    def incr(self, endpoint: str, field: str, count: int = 1) -> None:
+        with self._lock:
+            self._counts[endpoint][field] += count
+
+    def for_endpoint(self, endpoint: str) -> t.Dict[str, int]:
+        with self._lock:
+            counts = self._counts.get(endpoint, collections.Counter())
+            return {field: counts[field] for field in self.FIELDS}
+
+    def total(self, field: str) -> int:
+        with self._lock:
+            return sum(counts[field] for counts in self._counts.values())
+
+    @property
+    def hits(self) -> int:
+        return self.total('hits')
+
+    @property
+    def misses(self) -> int:
+        return self.total('misses')
+
+    @property
+    def evictions(self) -> int:
+        return self.total('evictions')
+
+    @property
+    def hit_rate(self) -> float:
+        hits, misses = self.hits, self.misses
+        return hits / (hits + misses) if hits + misses else 0.0
+
+    def __repr__(self):
+        return '<CacheStats hits=%s misses=%s evictions=%s>' % (
+            self.hits, self.misses, self.evictions)
+
+
+class BaseCache(object):
+    """Interface of the response caches accepted by `OctopartClient`
+
+    Cached responses are shared between callers and must be treated as
+    read-only.
+    """
+
+    def __init__(self,
+                 ttls: t.Optional[t.Dict[str, t.Optional[float]]] = None,
+                 ) -> None:
+        """
+        Kwargs:
+            ttls: {endpoint: seconds} dict, merged into `DEFAULT_TTLS`. Map an
+                endpoint to None to stop caching it.
+        """
+        self.ttls = dict(DEFAULT_TTLS)
+        self.ttls.update(ttls or {})
+        self.stats = CacheStats()
+
+    def ttl_for(self, endpoint: str) -> t.Optional[float]:
+        """Seconds to cache responses of `endpoint` for, None to not cache"""
+        return self.ttls.get(endpoint)
+
+    def get(self, endpoint: str, key: str) -> t.Optional[t.Any]:
+        """Return the fresh cached response stored under `key`, or None"""
+        raise NotImplementedError
+
+    def set(self, endpoint: str, key: str, value: t.Any) -> None:
+        """Store `value` under `key` for the endpoint's TTL"""
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+
+class MemoryCache(BaseCache):
+    """Thread-safe in-process cache with TTL expiry and LRU eviction
+
+    The total size of all entries, measured as the length of their JSON
+    encoding, is kept below `max_bytes` by evicting the least recently used
+    entries first.
+    """
+
+    def __init__(self,
+                 ttls: t.Optional[t.Dict[str, t.Optional[float]]] = None,
+                 max_bytes: int = DEFAULT_MAX_BYTES,
+                 ) -> None:
+        """
+        Kwargs:
+            ttls: see `BaseCache`
+            max_bytes (int): upper bound of the total size of cached entries
+        """
+        super().__init__(ttls)
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        # key -> (expires_at, size, value), least recently used first
+        self._entries: 'collections.OrderedDict[str, _Entry]' = (
+            collections.OrderedDict())
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, endpoint: str, key: str) -> t.Optional[t.Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.monotonic():
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self.stats.incr(endpoint, 'misses')
+                return None
+            self._entries.move_to_end(key)
+        self.stats.incr(endpoint, 'hits')
+        return entry[2]
+
+    def set(self, endpoint: str, key: str, value: t.Any) -> None:
+        ttl = self.ttl_for(endpoint)
+        if not ttl:
+            return
+        size = len(json.dumps(value))
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + ttl, size, value)
+            self.current_bytes += size
+
+            evicted = 0
+            while self.current_bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                evicted += 1
+        if evicted:
+            self.stats.incr(endpoint, 'evictions', evicted)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def _remove(self, key: str) -> None:
+        _, size, _ = self._entries.pop(key)
+        self.current_bytes -= size
+
+
+class SQLiteCache(BaseCache):
+    """Persistent cache in a single SQLite file, shared across processes
+
+    Responses are stored as zlib-compressed JSON. The database runs in WAL
+    mode, so any number of processes can read while one of them writes.
+    Nothing is loaded at startup: each thread opens its own connection on
+    first use, and entries are read one at a time as they are requested.
+
+    Expired entries are never returned, and are deleted by a background
+    thread every `vacuum_interval` seconds, which also hands the freed pages
+    back to the file system. Expiry uses wall-clock time, since monotonic
+    clocks are not comparable across processes.
+    """
+
+    SCHEMA = [
+        'PRAGMA auto_vacuum = INCREMENTAL',
+        'PRAGMA journal_mode = WAL',
+        'CREATE TABLE IF NOT EXISTS responses ('
+        '    key TEXT PRIMARY KEY,'
+        '    expires_at REAL NOT NULL,'
+        '    value BLOB NOT NULL)',
+        'CREATE INDEX IF NOT EXISTS responses_expires_at '
+        '    ON responses (expires_at)',
+    ]
+
+    def __init__(self,
+                 path: str,
+                 ttls: t.Optional[t.Dict[str, t.Optional[float]]] = None,
+                 vacuum_interval: t.Optional[float] = DEFAULT_VACUUM_INTERVAL,
+                 timeout: float = 30.0,
+                 compress_level: int = 6,
+                 ) -> None:
+        """
+        Args:
+            path (str): database file, created if it does not exist
+
+        Kwargs:
+            ttls: see `BaseCache`
+            vacuum_interval (float): seconds between background sweeps of
+                expired entries. None disables the background thread; call
+                `vacuum()` yourself instead.
+            timeout (float): seconds to wait for another process's write lock
+            compress_level (int): zlib compression level, 0-9
+        """
+        super().__init__(ttls)
+        self.path = path
+        self.vacuum_interval = vacuum_interval
+        self.timeout = timeout
+        self.compress_level = compress_level
+
+        self._local = threading.local()
+        self._connections: t.List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        self._schema_created = False
+        self._vacuum_thread: t.Optional[threading.Thread] = None
+        # set to stop the current background thread
+        self._vacuum_stop = threading.Event()
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """This thread's connection, opened on first use"""
+        conn = getattr(self._local, 'connection', None)
+        if conn is None:
+            # autocommit mode: every statement is its own transaction
+            conn = sqlite3.connect(
+                self.path, timeout=self.timeout, isolation_level=None,
+                check_same_thread=False)
+            with self._lock:
+                # once per cache: switching to WAL mode does not wait for
+                # the busy timeout, so threads racing to do it could fail
+                # with 'database is locked'. The mode sticks to the file.
+                if not self._schema_created:
+                    for statement in self.SCHEMA:
+                        conn.execute(statement)
+                    self._schema_created = True
+                self._connections.append(conn)
+                self._start_vacuum_thread()
+            self._local.connection = conn
+        return conn
+
+    def get(self, endpoint: str, key: str) -> t.Optional[t.Any]:
+        row = self.connection.execute(
+            'SELECT value FROM responses WHERE key = ? AND expires_at > ?',
+            (key, time.time())).fetchone()
+        if row is None:
+            self.stats.incr(endpoint, 'misses')
+            return None
+        self.stats.incr(endpoint, 'hits')
+        return json.loads(zlib.decompress(row[0]).decode())
+
+    def set(self, endpoint: str, key: str, value: t.Any) -> None:
+        ttl = self.ttl_for(endpoint)
+        if not ttl:
+            return
+        blob = zlib.compress(json.dumps(value).encode(), self.compress_level)
+        self.connection.execute(
+            'INSERT OR REPLACE INTO responses (key, expires_at, value) '
+            'VALUES (?, ?, ?)',
+            (key, time.time() + ttl, sqlite3.Binary(blob)))
+
+    def clear(self) -> None:
+        self.connection.execute('DELETE FROM responses')
+
+    def vacuum(self) -> int:
+        """
+        Delete expired entries and release their space.
+
+        Returns:
+            number of deleted entries.
+        """
+        conn = self.connection
+        deleted = conn.execute(
+            'DELETE FROM responses WHERE expires_at <= ?',
+            (time.time(),)).rowcount
+        conn.execute('PRAGMA incremental_vacuum')
+        return deleted
+
+    def close(self) -> None:
+        """
+        Stop the background sweep and close all connections. Using the cache
+        again reopens them, and restarts the sweep.
+        """
+        with self._lock:
+            self._vacuum_stop.set()
+            self._vacuum_thread = None
+            for conn in self._connections:
+                conn.close()
+            self._connections = []
+        self._local = threading.local()
+
+    def _start_vacuum_thread(self) -> None:
+        if self.vacuum_interval is None or self._vacuum_thread is not None:
+            return
+        # a fresh event, since a thread stopped by `close` may still be
+        # waiting on the previous one
+        self._vacuum_stop = threading.Event()
+        self._vacuum_thread = threading.Thread(
+            target=self._vacuum_periodically,
+            args=(self._vacuum_stop, self.vacuum_interval),
+            name='octopart-cache-vacuum',
+            daemon=True)
+        self._vacuum_thread.start()
+
+    def _vacuum_periodically(self, stop: threading.Event,
+                             interval: float) -> None:
+        while not stop.wait(interval):
+            try:
+                self.vacuum()
+            except sqlite3.Error as exc:
+                logger.warning('Could not vacuum %s: %s', self.path, exc)
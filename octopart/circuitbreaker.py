@@ -0,0 +1,222 @@
+"""
+Circuit breaker for requests to the Octopart API.
+
+While the API is down, every request would otherwise spend its whole retry
+schedule failing. A `CircuitBreaker` watches the outcome and latency of
+recent requests, and once too many of them fail or are slow, it "opens" and
+rejects requests right away with `CircuitOpenError`, until a trial request
+shows that the API has recovered.
+"""
+
+import collections
+import logging
+import threading
+import time
+import typing as t
+
+from octopart.decorators import status_code_from_exception
+from octopart.exceptions import CircuitOpenError
+
+logger = logging.getLogger(__name__)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+def is_failure(exc: BaseException) -> bool:
+    """
+    Whether an error counts against the API's health: server errors, rate
+    limiting and errors without a response (connection errors, timeouts), but
+    not client errors such as 404.
+    """
+    status = status_code_from_exception(exc)
+    return status is None or status == 429 or status >= 500
+
+
+class CircuitBreaker(object):
+    """Thread-safe circuit breaker with closed, open and half-open states
+
+    closed: requests go through. The outcome of each is recorded over a
+        sliding window of `window` seconds. Once the window holds at least
+        `min_calls` calls, and either the share of failed calls reaches
+        `failure_rate_threshold` or the share of calls slower than
+        `slow_call_duration` reaches `slow_call_rate_threshold`, the circuit
+        opens.
+    open: requests are rejected without being sent, for `open_timeout`
+        seconds, after which the circuit is half-open.
+    half-open: up to `half_open_calls` trial requests go through, the rest
+        are rejected. The circuit closes once all trials succeeded, and opens
+        again as soon as one of them fails.
+
+    Counters:
+        rejected: number of requests rejected while open or half-open
+        opened: number of times the circuit opened
+    """
+
+    def __init__(self,
+                 window: float = 30.0,
+                 min_calls: int = 20,
+                 failure_rate_threshold: float = 0.5,
+                 slow_call_duration: t.Optional[float] = 10.0,
+                 slow_call_rate_threshold: float = 0.8,
+                 open_timeout: float = 30.0,
+                 half_open_calls: int = 1,
+                 ) -> None:
+        """
+        Kwargs:
+            window (float): seconds of history to compute rates over
+            min_calls (int): calls the window must hold before the circuit
+                may open
+            failure_rate_threshold (float): share of failed calls, 0-1
+            slow_call_duration (float): seconds after which a call counts as
+                slow. None to ignore latency.
+            slow_call_rate_threshold (float): share of slow calls, 0-1
+            open_timeout (float): seconds to stay open before trying again
+            half_open_calls (int): trial calls to let through when half-open
+        """
+        self.window = window
+        self.min_calls = min_calls
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_duration = slow_call_duration
+        self.slow_call_rate_threshold = slow_call_rate_threshold
+        self.open_timeout = open_timeout
+        self.half_open_calls = half_open_calls
+
+        self.rejected = 0
+        self.opened = 0
+
+        self._state = CLOSED
+        self._opened_at = 0.0
+        # (finished_at, failed, slow) of the calls in the window
+        self._calls: t.Deque[t.Tuple[float, bool, bool]] = (
+            collections.deque())
+        self._failures = 0
+        self._slow = 0
+        self._trials_started = 0
+        self._trials_succeeded = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """One of `CLOSED`, `OPEN` and `HALF_OPEN`"""
+        with self._lock:
+            self._update_state(time.monotonic())
+            return self._state
+
+    def before_call(self) -> None:
+        """
+        Raise `CircuitOpenError` if a request may not be sent now. Every call
+        that is let through must be followed by `record()`.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._update_state(now)
+            if self._state == CLOSED:
+                return
+            if (self._state == HALF_OPEN
+                    and self._trials_started < self.half_open_calls):
+                self._trials_started += 1
+                return
+            self.rejected += 1
+            retry_in = max(self._opened_at + self.open_timeout - now, 0)
+        raise CircuitOpenError(
+            'Circuit open, not sending request (next trial in %.1fs)'
+            % retry_in)
+
+    def record(self,
+               duration: float,
+               exc: t.Optional[BaseException] = None,
+               ) -> None:
+        """Record a call that took `duration` seconds and raised `exc`"""
+        failed = exc is not None and is_failure(exc)
+        slow = (self.slow_call_duration is not None
+                and duration >= self.slow_call_duration)
+        with self._lock:
+            now = time.monotonic()
+            self._update_state(now)
+            if self._state == HALF_OPEN:
+                if failed or slow:
+                    self._open(now)
+                else:
+                    self._trials_succeeded += 1
+                    if self._trials_succeeded >= self.half_open_calls:
+                        self._close()
+                return
+            if self._state == OPEN:
+                # started before the circuit opened
+                return
+
+            self._calls.append((now, failed, slow))
+            self._failures += failed
+            self._slow += slow
+            self._prune(now)
+            calls = len(self._calls)
+            if calls >= self.min_calls and (
+                    self._failures / calls >= self.failure_rate_threshold
+                    or self._slow / calls >= self.slow_call_rate_threshold):
+                self._open(now)
+
+    def call(self, func: t.Callable[[], t.Any]) -> t.Any:
+        """Call `func` through the breaker"""
+        self.before_call()
+        start = time.monotonic()
+        try:
+            result = func()
+        except Exception as exc:
+            self.record(time.monotonic() - start, exc)
+            raise
+        self.record(time.monotonic() - start)
+        return result
+
+    def snapshot(self) -> t.Dict[str, t.Any]:
+        """State and rates over the current window, e.g. for metrics"""
+        with self._lock:
+            now = time.monotonic()
+            self._update_state(now)
+            self._prune(now)
+            calls = len(self._calls)
+            return {
+                'state': self._state,
+                'calls': calls,
+                'failure_rate': self._failures / calls if calls else 0.0,
+                'slow_call_rate': self._slow / calls if calls else 0.0,
+                'rejected': self.rejected,
+                'opened': self.opened,
+            }
+
+    def __repr__(self):
+        return '<CircuitBreaker state=%s rejected=%s opened=%s>' % (
+            self.state, self.rejected, self.opened)
+
+    def _update_state(self, now: float) -> None:
+        if (self._state == OPEN
+                and now - self._opened_at >= self.open_timeout):
+            self._state = HALF_OPEN
+            self._trials_started = 0
+            self._trials_succeeded = 0
+            logger.info('Circuit half-open, sending trial requests')
+
+    def _open(self, now: float) -> None:
+        self._state = OPEN
+        self._opened_at = now
+        self.opened += 1
+        self._reset_window()
+        logger.warning(
+            'Circuit opened, rejecting requests for %.1fs', self.open_timeout)
+
+    def _close(self) -> None:
+        self._state = CLOSED
+        self._reset_window()
+        logger.info('Circuit closed')
+
+    def _reset_window(self) -> None:
+        self._calls.clear()
+        self._failures = 0
+        self._slow = 0
+
+    def _prune(self, now: float) -> None:
+        while self._calls and self._calls[0][0] <= now - self.window:
+            _, failed, slow = self._calls.popleft()
+            self._failures -= failed
+            self._slow -= slow
@@ -1,38 +1,64 @@
 import copy
-import json
+import functools
 import logging
 import os
 import typing as t
 import re
+import threading
+import time
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from octopart import models
+from octopart.cache import BaseCache, cache_key
+from octopart.circuitbreaker import CircuitBreaker
+from octopart.codec import JSONCodec, default_codec
+from octopart.concurrency import AdaptiveLimiter
 from octopart.exceptions import OctopartError
-from octopart.decorators import retry
-from octopart.utils import sortby_param_str_from_list
+from octopart.hedging import Hedger
+from octopart.decorators import retry_with_policy
+from octopart.ratelimit import RateLimiter
+from octopart.retries import RetryBudget, RetryPolicy
+from octopart.singleflight import SingleFlight
+from octopart.streaming import STREAM_CHUNK_SIZE, iter_array_items
+from octopart.transfer import ACCEPT_ENCODING, TransferStats, wire_bytes_read
+from octopart.utils import (
+    endpoint_from_path, iter_uid_chunks, sortby_param_str_from_list, unique)
+from octopart.validation import match_query_validator, search_query_validator
 
 logger = logging.getLogger(__name__)
 
 
 DEFAULT_BASE_URL = 'https://octopart.com/api/v3'
 
+# Number of host connection pools, and number of connections kept alive
+# within each pool. The latter matches `api.MAX_REQUEST_THREADS` so that every
+# worker thread of `api.match` can hold on to its own connection.
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 10
 
-class OctopartClient(object):
-    """Client object for Octopart API v3
 
-    Visit https://octopart.com/api/register to get an API key, then set it as
-    an environment variable named 'OCTOPART_API_KEY', or pass the key directly
-    to this constructor.
+class BaseOctopartClient(object):
+    """Endpoint methods shared by the Octopart API v3 clients
+
+    Subclasses implement `_request`, which performs the HTTP call. Every
+    endpoint method returns whatever `_request` returns: the decoded response
+    for `OctopartClient`, an awaitable of it for `AsyncOctopartClient`.
     """
 
     def __init__(self,
                  api_key: t.Optional[str] = None,
-                 base_url: t.Optional[str] = DEFAULT_BASE_URL
+                 base_url: t.Optional[str] = DEFAULT_BASE_URL,
+                 codec: t.Optional[JSONCodec] = None,
                  ) -> None:
         """
         Kwargs:
             api_key (str): Octopart API key
+            base_url (str): root URL of the Octopart API
+            codec (JSONCodec): encodes queries and decodes responses.
+                Defaults to the fastest installed JSON library, see
+                `codec.default_codec`.
         """
         api_key = api_key or os.getenv('OCTOPART_API_KEY')
         if not api_key:
@@ -43,24 +69,28 @@ class OctopartClient(object):
             )
         self.api_key = api_key
         self.base_url = base_url
+        self.codec = codec or default_codec()
 
     @property
     def api_key_param(self) -> t.Dict[str, str]:
         return {'apikey': self.api_key}
 
-    @retry
     def _request(self,
                  path: str,
                  params: t.Dict[str, t.Any]=None
                  ) -> t.Any:
-        params = copy.copy(params or {})
-        params.update(self.api_key_param)
-
-        response = requests.get('%s%s' % (self.base_url, path), params=params)
-        logger.debug('Requested Octopart URI: %s', response.url)
+        raise NotImplementedError
 
-        response.raise_for_status()
-        return response.json()
+    def _get_multi(self,
+                   path: str,
+                   uids: t.List[str],
+                   params: t.Optional[t.Dict[str, t.Any]] = None,
+                   ) -> t.Any:
+        """
+        Request `uids` from a 'get_multi' endpoint, one request per chunk of
+        UIDs that fits into a URL, and merge the responses.
+        """
+        raise NotImplementedError
 
     def match(self,
               queries: t.Collection[models.PartsMatchQuery],
@@ -97,18 +127,30 @@ class OctopartClient(object):
         Returns:
             dict. See `models.PartsMatchResponse` for exact fields.
         """
+        return self._request('/parts/match', params=self._match_params(
+            queries, exact_only, includes, hide, show))
+
+    def _match_params(self,
+                      queries: t.Collection[models.PartsMatchQuery],
+                      exact_only: t.Optional[bool],
+                      includes: t.Optional[t.List[str]],
+                      hide: t.Optional[t.List[str]],
+                      show: t.Optional[t.List[str]],
+                      ) -> t.Dict[str, t.Any]:
+        """Validate the arguments of `match`, return its request parameters"""
         if len(queries) > 20:
             raise ValueError(
                 'Expected `queries` to be < 20 elements. Saw: %s' % queries)
 
         # validate `queries` format
-        if not models.PartsMatchQuery.is_valid_list(queries):
-            errors = models.PartsMatchQuery.errors_list(queries)
+        errors = match_query_validator.errors_list(queries)
+        if errors:
             raise OctopartError('Queries are malformed: %s' % errors)
 
         # required params for /part/match API call, as per
         # https://octopart.com/api/docs/v3/rest-api#endpoints-parts-match
-        params: t.Dict[str, t.Any] = {'queries': json.dumps(queries)}
+        params: t.Dict[str, t.Any] = {
+            'queries': self.codec.dumps(queries)}
 
         # since there is a maximum URL length, only set options parameters in
         # the URL when using the non-default value
@@ -120,8 +162,7 @@ class OctopartClient(object):
             params['show[]'] = show
         if hide:
             params['hide[]'] = hide
-
-        return self._request('/parts/match', params=params)
+        return params
 
     def search(self,
                query: str,  # maps to "q" parameter in Octopart API
@@ -157,6 +198,22 @@ class OctopartClient(object):
         Returns:
             dict. See `models.PartsSearchResponse` for exact fields.
         """
+        return self._request('/parts/search', params=self._search_params(
+            query, start, limit, sortby, filter_fields, filter_queries,
+            includes, hide, show))
+
+    def _search_params(self,
+                       query: str,
+                       start: int,
+                       limit: int,
+                       sortby: t.Optional[t.List[t.Tuple[str, str]]],
+                       filter_fields: t.Optional[dict],
+                       filter_queries: t.Optional[dict],
+                       includes: t.Optional[t.List[str]],
+                       hide: t.Optional[t.List[str]],
+                       show: t.Optional[t.List[str]],
+                       ) -> t.Dict[str, t.Any]:
+        """Validate the arguments of `search`, return its request parameters"""
         filter_fields = filter_fields or {}
         filter_queries = filter_queries or {}
 
@@ -179,8 +236,8 @@ class OctopartClient(object):
             'filter_queries': filter_queries_param
         }
 
-        if not models.PartsSearchQuery.is_valid(data):
-            errors = models.PartsSearchQuery.errors(data)
+        errors = search_query_validator.errors(data)
+        if errors:
             raise OctopartError('Query is malformed: %s' % errors)
 
         # Convert `query` to format that Octopart accepts.
@@ -196,8 +253,7 @@ class OctopartClient(object):
             params['show[]'] = show
         if hide:
             params['hide[]'] = hide
-
-        return self._request('/parts/search', params=params)
+        return params
 
     def part(self,
              uid: str,  # maps to "uid" parameter in Octopart API
@@ -354,3 +410,409 @@ class OctopartClient(object):
         params = {k: v for k, v in params.items() if v is not None}
 
         return self._request('/sellers/search', params=params)
+
+    def get_parts(self,
+                  uids: t.Iterable[str],
+                  includes: t.Optional[t.List[str]] = None,
+                  hide: t.Optional[t.List[str]] = None,
+                  show: t.Optional[t.List[str]] = None,
+                  ) -> t.Dict[str, dict]:
+        """Retrieve any number of parts by UID
+
+        This calls the /parts/get_multi endpoint of the Octopart API, once per
+        batch of UIDs that fits into a URL:
+        https://octopart.com/api/docs/v3/rest-api#endpoints-parts-get_multi
+
+        Args:
+            uids: unique 64-bit Octopart IDs. Duplicates are requested once.
+
+        Kwargs:
+            includes, hide, show: Same as `match()`.
+
+        Returns:
+            {uid: dict} dict. See `models.Part` for exact fields. UIDs that
+            Octopart does not know are missing.
+        """
+        uids = unique(list(uids))
+        for uid in uids:
+            if not re.match('^[a-f0-9]{16}$', uid):
+                raise OctopartError(
+                    'Wrong UID given, please enter a 64-bit unique Octopart '
+                    'ID: %s' % uid)
+
+        params = {}
+        if includes:
+            params['include[]'] = includes
+        if show:
+            params['show[]'] = show
+        if hide:
+            params['hide[]'] = hide
+
+        return self._get_multi('/parts/get_multi', uids, params=params)
+
+    def get_brands(self, uids: t.Iterable[str]) -> t.Dict[str, dict]:
+        """Retrieve any number of brands by UID
+
+        This calls the /brands/get_multi endpoint of the Octopart API, once
+        per batch of UIDs that fits into a URL.
+
+        Returns:
+            {uid: dict} dict. See `models.Brand` for exact fields.
+        """
+        return self._get_multi('/brands/get_multi', unique(list(uids)))
+
+    def get_categories(self, uids: t.Iterable[str]) -> t.Dict[str, dict]:
+        """Retrieve any number of categories by UID
+
+        This calls the /categories/get_multi endpoint of the Octopart API,
+        once per batch of UIDs that fits into a URL.
+
+        Returns:
+            {uid: dict} dict. See `models.Category` for exact fields.
+        """
+        return self._get_multi('/categories/get_multi', unique(list(uids)))
+
+    def get_sellers(self, uids: t.Iterable[str]) -> t.Dict[str, dict]:
+        """Retrieve any number of sellers by UID
+
+        This calls the /sellers/get_multi endpoint of the Octopart API, once
+        per batch of UIDs that fits into a URL.
+
+        Returns:
+            {uid: dict} dict. See `models.Seller` for exact fields.
+        """
+        return self._get_multi('/sellers/get_multi', unique(list(uids)))
+
+
+class OctopartClient(BaseOctopartClient):
+    """Client object for Octopart API v3
+
+    Visit https://octopart.com/api/register to get an API key, then set it as
+    an environment variable named 'OCTOPART_API_KEY', or pass the key directly
+    to this constructor.
+
+    The client owns a `requests.Session`, so all endpoint methods reuse
+    pooled keep-alive connections instead of opening a new TCP/TLS connection
+    per request. A single client may be shared by several threads.
+    """
+
+    def __init__(self,
+                 api_key: t.Optional[str] = None,
+                 base_url: t.Optional[str] = DEFAULT_BASE_URL,
+                 pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+                 pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+                 pool_block: bool = False,
+                 keepalive_timeout: t.Optional[float] = None,
+                 cache: t.Optional[BaseCache] = None,
+                 coalesce: bool = False,
+                 rate_limiter: t.Optional[RateLimiter] = None,
+                 retry_policy: t.Optional[RetryPolicy] = None,
+                 circuit_breaker: t.Optional[CircuitBreaker] = None,
+                 hedger: t.Optional[Hedger] = None,
+                 concurrency_limiter: t.Optional[AdaptiveLimiter] = None,
+                 codec: t.Optional[JSONCodec] = None,
+                 transfer_stats: t.Optional[TransferStats] = None,
+                 transport: t.Optional[HTTPAdapter] = None,
+                 ) -> None:
+        """
+        Kwargs:
+            api_key (str): Octopart API key
+            base_url (str): root URL of the Octopart API
+            pool_connections (int): number of host connection pools to cache
+            pool_maxsize (int): maximum number of connections kept alive per
+                host. Should be at least the number of threads sharing this
+                client.
+            pool_block (bool): whether to wait for a free connection when all
+                `pool_maxsize` connections are in use, instead of opening a
+                throwaway one.
+            keepalive_timeout (float): seconds a connection may sit idle before
+                it is dropped instead of reused. `None` keeps connections
+                around for as long as the server allows.
+            cache (BaseCache): response cache, e.g. `cache.MemoryCache()`.
+                Only endpoints with a TTL configured in the cache are cached.
+            coalesce (bool): whether identical requests (same path and
+                parameters) made while one of them is already in flight wait
+                for and share its result, instead of each sending their own.
+                See `singleflight` for counters of saved requests.
+            rate_limiter (RateLimiter): paces requests, e.g.
+                `ratelimit.TokenBucket(rate=3)`. Every request, including
+                each retry, waits for a token before it is sent. Share one
+                limiter between all clients that use the same API key.
+            retry_policy (RetryPolicy): decides which failed requests are
+                retried, and when. Defaults to a `RetryPolicy` with its own
+                `RetryBudget`; share one policy between clients to give them
+                a common retry budget.
+            circuit_breaker (CircuitBreaker): rejects requests with
+                `CircuitOpenError`, without sending them or retrying, while
+                the API keeps failing. Cached responses are still served.
+            hedger (Hedger): sends a second copy of requests that take longer
+                than usual, and uses the first response. Each copy passes the
+                circuit breaker and rate limiter on its own; a request is
+                retried only once all its copies failed.
+            concurrency_limiter (AdaptiveLimiter): adapts the number of
+                requests in flight, across all threads using this client, to
+                the API's latency and error rates.
+            codec (JSONCodec): see `BaseOctopartClient`
+            transfer_stats (TransferStats): counts compressed and decoded
+                response bytes per endpoint. Defaults to a new
+                `TransferStats`; share one between clients for totals.
+            transport (HTTPAdapter): `requests` transport adapter that sends
+                all requests, e.g. a `transport.RecordingAdapter` or
+                `transport.ReplayAdapter`. Defaults to an `HTTPAdapter` with
+                the pool settings above, which are ignored otherwise.
+        """
+        super().__init__(api_key=api_key, base_url=base_url, codec=codec)
+        self.keepalive_timeout = keepalive_timeout
+        self.cache = cache
+        self.singleflight = SingleFlight() if coalesce else None
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy or RetryPolicy(budget=RetryBudget())
+        self.circuit_breaker = circuit_breaker
+        self.hedger = hedger
+        self.concurrency_limiter = concurrency_limiter
+        self.transfer_stats = transfer_stats or TransferStats()
+
+        self.session = requests.Session()
+        # ask for every encoding that can be decoded, including brotli when
+        # installed, see `transfer`
+        self.session.headers['Accept-Encoding'] = ACCEPT_ENCODING
+        adapter = transport or HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        self._last_used = time.monotonic()
+        self._idle_lock = threading.Lock()
+
+    def close(self) -> None:
+        """Close all pooled connections held by this client."""
+        self.session.close()
+
+    def __enter__(self) -> 'OctopartClient':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _drop_idle_connections(self) -> None:
+        """
+        Discard pooled connections if the client has been idle for longer than
+        `keepalive_timeout`, since the server has likely closed them already.
+        """
+        if self.keepalive_timeout is None:
+            return
+        with self._idle_lock:
+            now = time.monotonic()
+            if now - self._last_used >= self.keepalive_timeout:
+                for adapter in self.session.adapters.values():
+                    adapter.close()
+            self._last_used = now
+
+    def _request(self,
+                 path: str,
+                 params: t.Dict[str, t.Any]=None
+                 ) -> t.Any:
+        endpoint = endpoint_from_path(path)
+        cache = self.cache
+        if cache is not None and not cache.ttl_for(endpoint):
+            cache = None
+        if cache is None and self.singleflight is None:
+            return self._send(path, params)
+
+        key = cache_key(path, params)
+        if cache is not None:
+            cached = cache.get(endpoint, key)
+            if cached is not None:
+                return cached
+
+        def _fetch():
+            data = self._send(path, params)
+            if cache is not None:
+                cache.set(endpoint, key, data)
+            return data
+
+        if self.singleflight is not None:
+            return self.singleflight.do(key, _fetch)
+        return _fetch()
+
+    def _get_multi(self,
+                   path: str,
+                   uids: t.List[str],
+                   params: t.Optional[t.Dict[str, t.Any]] = None,
+                   ) -> t.Dict[str, t.Any]:
+        results: t.Dict[str, t.Any] = {}
+        for chunk in iter_uid_chunks(uids):
+            results.update(self._request(
+                path, params=dict(params or {}, **{'uid[]': chunk})))
+        return results
+
+    @retry_with_policy(requests.RequestException)
+    def _send(self,
+              path: str,
+              params: t.Dict[str, t.Any]=None
+              ) -> t.Any:
+        params = copy.copy(params or {})
+        params.update(self.api_key_param)
+
+        if self.hedger is not None and self.hedger.hedges(
+                endpoint_from_path(path)):
+            return self.hedger.call(
+                functools.partial(self._get, path, params),
+                prepare=self._prepare_attempt)
+        self._prepare_attempt()
+        return self._get(path, params)
+
+    def match_stream(self,
+                     queries: t.Collection[models.PartsMatchQuery],
+                     exact_only: t.Optional[bool] = False,
+                     includes: t.Optional[t.List[str]] = None,
+                     hide: t.Optional[t.List[str]] = None,
+                     show: t.Optional[t.List[str]] = None,
+                     ) -> t.Iterator[dict]:
+        """
+        Streaming version of `match`: yield the entries of the response's
+        'results' list one by one, each as soon as it has been received,
+        instead of decoding the whole response at once. Only the entry being
+        received is held in memory. See `_stream` for what is bypassed.
+
+        Arguments are the same as for `match`.
+
+        Yields:
+            dict. See `models.PartsMatchResult` for exact fields.
+        """
+        return self._stream('/parts/match', self._match_params(
+            queries, exact_only, includes, hide, show))
+
+    def search_stream(self,
+                      query: str,
+                      start: int = 0,
+                      limit: int = 10,
+                      sortby: t.Optional[t.List[t.Tuple[str, str]]] = None,
+                      filter_fields: t.Optional[dict] = None,
+                      filter_queries: t.Optional[dict] = None,
+                      includes: t.Optional[t.List[str]] = None,
+                      hide: t.Optional[t.List[str]] = None,
+                      show: t.Optional[t.List[str]] = None,
+                      ) -> t.Iterator[dict]:
+        """
+        Streaming version of `search`, see `match_stream`.
+
+        Arguments are the same as for `search`.
+
+        Yields:
+            dict with the matching part as 'item'
+        """
+        return self._stream('/parts/search', self._search_params(
+            query, start, limit, sortby, filter_fields, filter_queries,
+            includes, hide, show))
+
+    def _stream(self,
+                path: str,
+                params: t.Dict[str, t.Any],
+                ) -> t.Iterator[t.Any]:
+        """
+        Request `path`, and yield the entries of the 'results' list of the
+        response as the body arrives (see `streaming`).
+
+        The request is validated right away, but only sent once the first
+        result is asked for, so that an iterator dropped before then holds
+        no connection; close iterators that were started but not
+        exhausted to release theirs at once. The response cache,
+        coalescing and hedging need the whole response and are bypassed. The
+        request is retried until its headers have arrived, as any other;
+        errors while reading the body are raised as `OctopartError` without
+        retrying, since results may have been yielded already.
+        """
+        return self._iter_stream(path, params)
+
+    def _iter_stream(self,
+                     path: str,
+                     params: t.Dict[str, t.Any],
+                     ) -> t.Iterator[t.Any]:
+        response = self._open_stream(path, params)
+        endpoint = endpoint_from_path(path)
+        body_bytes = 0
+
+        def _chunks():
+            nonlocal body_bytes
+            for chunk in response.iter_content(STREAM_CHUNK_SIZE):
+                body_bytes += len(chunk)
+                yield chunk
+
+        try:
+            yield from iter_array_items(
+                _chunks(), key='results', loads=self.codec.loads)
+        except (requests.RequestException, ValueError) as exc:
+            raise OctopartError(
+                'Failed to read streamed response: %s'
+                % type(exc).__name__) from exc
+        finally:
+            self.transfer_stats.record(
+                endpoint, wire_bytes_read(response, body_bytes), body_bytes)
+            response.close()
+
+    @retry_with_policy(requests.RequestException)
+    def _open_stream(self,
+                     path: str,
+                     params: t.Dict[str, t.Any],
+                     ) -> requests.Response:
+        params = copy.copy(params)
+        params.update(self.api_key_param)
+        self._prepare_attempt()
+        return self._get(path, params, stream=True)
+
+    def _prepare_attempt(self) -> None:
+        """Wait until a request may be sent; called before each attempt"""
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.before_call()
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        self._drop_idle_connections()
+        if self.concurrency_limiter is not None:
+            self.concurrency_limiter.acquire()
+
+    def _get(self,
+             path: str,
+             params: t.Dict[str, t.Any],
+             stream: bool = False,
+             ) -> t.Any:
+        """
+        Send a request prepared by `_prepare_attempt`. With `stream`, return
+        the response as soon as its headers have arrived, with its body yet to
+        be read; the request then counts as completed for the circuit breaker
+        and concurrency limiter.
+        """
+        breaker = self.circuit_breaker
+        limiter = self.concurrency_limiter
+        start = time.monotonic()
+        try:
+            response = self.session.get(
+                '%s%s' % (self.base_url, path), params=params, stream=stream)
+            logger.debug('Requested Octopart URI: %s', response.url)
+
+            if stream:
+                if not response.ok:
+                    response.close()
+                response.raise_for_status()
+                data = response
+            else:
+                body_bytes = len(response.content)
+                self.transfer_stats.record(
+                    endpoint_from_path(path),
+                    wire_bytes_read(response, body_bytes), body_bytes)
+                response.raise_for_status()
+                # decode the raw bytes, without building a str copy first
+                data = self.codec.loads(response.content)
+        except Exception as exc:
+            if breaker is not None:
+                breaker.record(time.monotonic() - start, exc)
+            if limiter is not None:
+                limiter.release(start, exc)
+            raise
+        if breaker is not None:
+            breaker.record(time.monotonic() - start)
+        if limiter is not None:
+            limiter.release(start)
+        return data
@@ -0,0 +1,108 @@
+"""
+JSON encoding of request parameters and decoding of responses.
+
+Match responses that include specs or datasheets run to several MB, and
+decoding them with the standard library takes most of the CPU time of a
+request. A `JSONCodec` does both jobs, and `default_codec()` picks the
+fastest JSON library that is installed: `orjson`, then `ujson`, then the
+standard library (`pip install octopart[fast]` installs orjson). Responses
+are decoded straight from their raw bytes.
+
+Request parameters are small, and are always encoded exactly like
+`json.dumps` does: `utils.encoded_query_length` sizes the 'queries'
+parameter of /parts/match requests that way, and cache keys and URLs stay
+the same whichever library is installed.
+"""
+
+import json
+import typing as t
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
+
+try:
+    import ujson
+except ImportError:  # pragma: no cover
+    ujson = None  # type: ignore
+
+
+class JSONCodec(object):
+    """Standard library codec, and the interface of all codecs"""
+    name = 'json'
+
+    def dumps(self, obj: t.Any) -> str:
+        return json.dumps(obj)
+
+    def loads(self, data: t.Union[bytes, str]) -> t.Any:
+        return json.loads(data)
+
+    def __repr__(self):
+        return '<%s>' % type(self).__name__
+
+
+class OrjsonCodec(JSONCodec):
+    """Codec based on `orjson`"""
+    name = 'orjson'
+
+    def __init__(self) -> None:
+        if orjson is None:
+            raise ImportError(
+                "OrjsonCodec requires orjson. "
+                "Install it with 'pip install octopart[fast]'.")
+
+    def loads(self, data: t.Union[bytes, str]) -> t.Any:
+        return orjson.loads(data)
+
+
+class UjsonCodec(JSONCodec):
+    """Codec based on `ujson`"""
+    name = 'ujson'
+
+    def __init__(self) -> None:
+        if ujson is None:
+            raise ImportError('UjsonCodec requires ujson.')
+
+    def loads(self, data: t.Union[bytes, str]) -> t.Any:
+        return ujson.loads(data)
+
+
+# Codecs by name, fastest first
+CODECS: t.Dict[str, t.Type[JSONCodec]] = {
+    OrjsonCodec.name: OrjsonCodec,
+    UjsonCodec.name: UjsonCodec,
+    JSONCodec.name: JSONCodec,
+}
+
+
+def get_codec(name: t.Optional[str] = None) -> JSONCodec:
+    """
+    Return the codec called `name` (see `CODECS`), or the fastest one whose
+    library is installed.
+
+    >>> get_codec('json')
+    <JSONCodec>
+    """
+    if name is not None:
+        if name not in CODECS:
+            raise ValueError(
+                'Expected one of %s. Saw: %s' % (sorted(CODECS), name))
+        return CODECS[name]()
+    for codec_class in CODECS.values():
+        try:
+            return codec_class()
+        except ImportError:
+            continue
+    return JSONCodec()  # pragma: no cover
+
+
+_default_codec: t.Optional[JSONCodec] = None
+
+
+def default_codec() -> JSONCodec:
+    """The fastest installed codec, shared by all clients by default"""
+    global _default_codec
+    if _default_codec is None:
+        _default_codec = get_codec()
+    return _default_codec
@@ -0,0 +1,165 @@
+"""
+Adaptive limit on the number of requests in flight.
+
+A fixed number of concurrent requests is too low while the API is fast, and
+far too high while it is throttling us. An `AdaptiveLimiter` finds the limit
+at runtime with AIMD (additive increase, multiplicative decrease), the way
+TCP congestion control does.
+"""
+
+import collections
+import logging
+import threading
+import time
+import typing as t
+
+from octopart.decorators import status_code_from_exception
+
+logger = logging.getLogger(__name__)
+
+
+def is_overload(exc: BaseException) -> bool:
+    """
+    Whether an error is a sign of sending too much: rate limiting, server
+    errors, and errors without a response, such as timeouts.
+    """
+    status = status_code_from_exception(exc)
+    return status is None or status == 429 or status >= 500
+
+
+class AdaptiveLimiter(object):
+    """Thread-safe AIMD limit on concurrent requests
+
+    Callers `acquire()` a slot before sending a request, and `release()` it
+    with the request's outcome once it completed:
+
+    - A success grows the limit by `1 / limit`, i.e. by about one request
+      per round trip of all requests in flight, as long as the limit is
+      actually in use.
+    - A 429, 5xx, connection error or timeout, or a latency above
+      `latency_tolerance` times the lowest recent latency, multiplies the
+      limit by `backoff_ratio`. Only requests sent after the previous
+      decrease can cause another one, so a burst of failures of requests
+      that were in flight together counts once.
+
+    The limit stays between `min_limit` and `max_limit`.
+
+    Counters:
+        increases: number of times the limit grew
+        decreases: number of times the limit shrank
+    """
+
+    def __init__(self,
+                 initial_limit: int = 10,
+                 min_limit: int = 1,
+                 max_limit: int = 50,
+                 backoff_ratio: float = 0.75,
+                 latency_tolerance: t.Optional[float] = 2.0,
+                 window: int = 100,
+                 ) -> None:
+        """
+        Kwargs:
+            initial_limit (int): requests in flight allowed at first
+            min_limit, max_limit (int): bounds of the limit
+            backoff_ratio (float): factor applied to the limit on overload
+            latency_tolerance (float): latency, as a multiple of the lowest
+                of the last `window` latencies, above which requests count as
+                queued up and shrink the limit. None to ignore latency.
+            window (int): number of recent latencies to track
+        """
+        if not min_limit <= initial_limit <= max_limit:
+            raise ValueError(
+                'Expected min_limit <= initial_limit <= max_limit. Saw: '
+                '%s, %s, %s' % (min_limit, initial_limit, max_limit))
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff_ratio = backoff_ratio
+        self.latency_tolerance = latency_tolerance
+
+        self.increases = 0
+        self.decreases = 0
+
+        self._limit = float(initial_limit)
+        self._in_flight = 0
+        self._last_decrease = float('-inf')
+        self._latencies: t.Deque[float] = collections.deque(maxlen=window)
+        self._condition = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        """Number of requests currently allowed in flight"""
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def acquire(self) -> None:
+        """Block until a request may be sent"""
+        with self._condition:
+            while self._in_flight >= int(self._limit):
+                self._condition.wait()
+            self._in_flight += 1
+
+    def release(self,
+                sent_at: float,
+                exc: t.Optional[BaseException] = None,
+                ) -> None:
+        """
+        Free the slot of a request.
+
+        Args:
+            sent_at (float): `time.monotonic()` when the request was sent
+
+        Kwargs:
+            exc: the error the request failed with, if any
+        """
+        now = time.monotonic()
+        latency = now - sent_at
+        with self._condition:
+            in_flight = self._in_flight
+            self._in_flight -= 1
+            # errors such as 404 say nothing about the API's load
+            overloaded = (is_overload(exc) if exc is not None
+                          else self._queued_up(latency))
+            if overloaded:
+                if sent_at > self._last_decrease:
+                    self._decrease(now)
+            elif exc is None and in_flight * 2 >= self._limit:
+                self._increase()
+            if exc is None:
+                self._latencies.append(latency)
+            self._condition.notify_all()
+
+    def snapshot(self) -> t.Dict[str, t.Any]:
+        """Current limit and load, e.g. for metrics"""
+        with self._condition:
+            return {
+                'limit': int(self._limit),
+                'in_flight': self._in_flight,
+                'min_latency': min(self._latencies, default=None),
+                'increases': self.increases,
+                'decreases': self.decreases,
+            }
+
+    def __repr__(self):
+        return '<AdaptiveLimiter limit=%s in_flight=%s>' % (
+            self.limit, self.in_flight)
+
+    def _queued_up(self, latency: float) -> bool:
+        if self.latency_tolerance is None or not self._latencies:
+            return False
+        return latency > self.latency_tolerance * min(self._latencies)
+
+    def _increase(self) -> None:
+        limit = min(self._limit + 1 / self._limit, self.max_limit)
+        if int(limit) > int(self._limit):
+            self.increases += 1
+            logger.debug('Concurrency limit raised to %s', int(limit))
+        self._limit = limit
+
+    def _decrease(self, now: float) -> None:
+        self._limit = max(self._limit * self.backoff_ratio, self.min_limit)
+        self._last_decrease = now
+        self.decreases += 1
+        logger.info('Concurrency limit lowered to %s', int(self._limit))
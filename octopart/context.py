@@ -0,0 +1,121 @@
+"""
+Long-lived state shared by the top-level API functions in `api.py`.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import os
+import threading
+import typing as t
+
+from octopart.client import OctopartClient
+
+DEFAULT_MAX_WORKERS = 10
+
+# Taken only in forked children, while a context drops its parent's state
+_fork_lock = threading.Lock()
+
+
+class OctopartContext(object):
+    """One client and one thread pool, reused across top-level API calls
+
+    Both are created on first use, so constructing a context is cheap and does
+    not read the environment. Pass a context to any function in `api.py` via
+    its `context` argument, or install it as the default for all calls with
+    `api.set_default_context()`.
+
+    A context is safe to share between threads. Functions in `api.py` must not
+    be called from within the context's own worker threads, since they wait on
+    that same pool.
+
+    A context also survives `os.fork()`: a forked child has none of its
+    parent's worker threads, and shares its pooled connections, so the child
+    gets a new thread pool, and a new client or, if the client was passed
+    in, fresh connections, on first use.
+    """
+
+    def __init__(self,
+                 client: t.Optional[OctopartClient] = None,
+                 max_workers: t.Optional[int] = None,
+                 pool_maxsize: t.Optional[int] = None,
+                 **client_kwargs
+                 ) -> None:
+        """
+        Kwargs:
+            client: client to send requests with. If omitted, one is created
+                from `pool_maxsize` and `client_kwargs` on first use.
+            max_workers (int): number of threads used to send requests
+                concurrently, e.g. the chunks of `api.match`. Defaults to
+                `DEFAULT_MAX_WORKERS`, or with a `concurrency_limiter`, to
+                its `max_limit`, so that it can raise concurrency that far.
+            pool_maxsize (int): connections kept alive by the created client.
+                Defaults to `max_workers`, so that every worker keeps its own
+                connection.
+            client_kwargs: passed on to `OctopartClient`, e.g. `api_key`.
+        """
+        if max_workers is None:
+            limiter = client_kwargs.get('concurrency_limiter') or getattr(
+                client, 'concurrency_limiter', None)
+            max_workers = (limiter.max_limit if limiter is not None
+                           else DEFAULT_MAX_WORKERS)
+        self.max_workers = max_workers
+        self.pool_maxsize = pool_maxsize or max_workers
+        self.client_kwargs = client_kwargs
+
+        self._client = client
+        self._owns_client = client is None
+        self._executor: t.Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        # process that created the pool and connections
+        self._pid = os.getpid()
+
+    def _check_fork(self) -> None:
+        """Drop state inherited from the parent, once in a forked child"""
+        if self._pid == os.getpid():
+            return
+        with _fork_lock:
+            if self._pid == os.getpid():
+                return
+            # another thread of the parent may have held the lock at fork
+            # time
+            self._lock = threading.Lock()
+            # the pool's threads were not forked; its queue would never drain
+            self._executor = None
+            if self._owns_client:
+                self._client = None
+            elif self._client is not None:
+                # leave the parent's connections to the parent
+                self._client.close()
+            self._pid = os.getpid()
+
+    @property
+    def client(self) -> OctopartClient:
+        self._check_fork()
+        with self._lock:
+            if self._client is None:
+                self._client = OctopartClient(
+                    pool_maxsize=self.pool_maxsize, **self.client_kwargs)
+            return self._client
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        self._check_fork()
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers)
+            return self._executor
+
+    def close(self) -> None:
+        """Shut down the thread pool and close the client's connections."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+            if self._client is not None:
+                self._client.close()
+
+    def __enter__(self) -> 'OctopartContext':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -1,3 +1,4 @@
+import asyncio
 import functools
 import logging
 
@@ -13,29 +14,62 @@ def wrap_exception_in(exc_type, catch=Exception):
     """
     Wraps raised exception in another exception type, and only includes
     the original exception type name in the new exception message.
+    Exceptions that already are of `exc_type` are raised unchanged.
 
     Args:
         exc_type: Exception type
         catch: optional, Exception type to catch
     """
     def wrapper(func):
+        if asyncio.iscoroutinefunction(func):
+            return _wrap_coroutine_function_exception_in(
+                func, exc_type, catch)
+
         @functools.wraps(func)
         def inner(*args, **kwargs):
             try:
                 return func(*args, **kwargs)
+            except exc_type:
+                raise
             except catch as exc:
-                logger.error('Wrapped error: %s', str(exc))
-                message = type(exc).__name__
-                # Add HTTP status code, if one is attached to 'exc'.
-                try:
-                    message += f' {exc.response.status_code}'
-                except AttributeError:
-                    pass
-                raise exc_type(message) from exc
+                raise _wrapped(exc_type, exc) from exc
         return inner
     return wrapper
 
 
+def _wrap_coroutine_function_exception_in(func, exc_type, catch):
+    @functools.wraps(func)
+    async def inner(*args, **kwargs):
+        try:
+            return await func(*args, **kwargs)
+        except exc_type:
+            raise
+        except catch as exc:
+            raise _wrapped(exc_type, exc) from exc
+    return inner
+
+
+def _wrapped(exc_type, exc):
+    logger.error('Wrapped error: %s', str(exc))
+    message = type(exc).__name__
+    # Add HTTP status code, if one is attached to 'exc'.
+    status_code = status_code_from_exception(exc)
+    if status_code is not None:
+        message += f' {status_code}'
+    return exc_type(message)
+
+
+def status_code_from_exception(exc):
+    """
+    Return the HTTP status code attached to a `requests` or `aiohttp`
+    exception, or None if there is none.
+    """
+    try:
+        return exc.response.status_code
+    except AttributeError:
+        return getattr(exc, 'status', None)
+
+
 # Retry when RequestException is raised.
 # wait 2^x * 100 milliseconds between each retry,
 # wait up to 10 seconds between each retry,
@@ -58,3 +92,28 @@ def retry(func):
     def inner(*args, **kwargs):
         return func(*args, **kwargs)
     return inner
+
+
+def retry_with_policy(retry_on):
+    """
+    Decorator for client methods that make HTTP requests: retries
+    `retry_on` exceptions as decided by the instance's `retry_policy` (see
+    `retries.RetryPolicy`), then wraps any error in `OctopartError`. Works
+    with both plain and coroutine methods.
+    """
+    def wrapper(func):
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            @wrap_exception_in(OctopartError)
+            async def async_inner(self, *args, **kwargs):
+                return await self.retry_policy.call_async(
+                    functools.partial(func, self, *args, **kwargs), retry_on)
+            return async_inner
+
+        @functools.wraps(func)
+        @wrap_exception_in(OctopartError)
+        def inner(self, *args, **kwargs):
+            return self.retry_policy.call(
+                functools.partial(func, self, *args, **kwargs), retry_on)
+        return inner
+    return wrapper
@@ -4,3 +4,7 @@ class OctopartError(Exception):
 
 class OctopartTypeError(OctopartError, TypeError):
     pass
+
+
+class CircuitOpenError(OctopartError):
+    pass
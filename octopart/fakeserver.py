@@ -0,0 +1,727 @@
+"""
+Local stand-in for the Octopart API, for load tests without network access.
+
+Run it as a module, then point a client at it:
+
+    python -m octopart.fakeserver --port 8000 --latency 0.2 \\
+        --latency-distribution lognormal --rate 3
+
+    client = OctopartClient(api_key='any', base_url='http://127.0.0.1:8000')
+
+It serves /parts/match, /parts/search, /parts/<uid> and /parts/get_multi,
+and the search, get and get_multi endpoints of brands, sellers and
+categories, with or without the /api/v3 prefix. Data is synthetic, shaped
+like real responses (see `tests/fixtures.py`), and deterministic: the same
+request gets the same response from any server started with the same
+`seed`. Include directives add specs, datasheets, descriptions, imagesets
+and category UIDs to parts.
+
+Like the real API, it can be slow, with latencies drawn from a distribution,
+answers requests beyond a rate with 429 and a `Retry-After` header, and
+requests with too long a URI with 414.
+"""
+
+import argparse
+import collections
+import gzip
+import hashlib
+from http.server import BaseHTTPRequestHandler, HTTPServer
+import json
+import logging
+import random
+import re
+from socketserver import ThreadingMixIn
+import threading
+import time
+import typing as t
+from urllib.parse import parse_qs, urlsplit
+
+from octopart.ratelimit import Throttle
+from octopart.utils import MAX_SEARCH_HITS, MAX_SEARCH_LIMIT
+
+logger = logging.getLogger(__name__)
+
+# Longest request target answered, beyond which requests get a 414. Match
+# requests chunked by `utils.iter_chunks` stay below it.
+DEFAULT_MAX_URI_LENGTH = 8192
+
+# Prefix of the API's paths, optional when talking to the fake server
+API_PREFIX = '/api/v3'
+
+BRAND_NAMES = (
+    'Analog Devices', 'Bourns', 'Diodes Incorporated', 'Infineon', 'KEMET',
+    'Littelfuse', 'Microchip', 'Murata', 'Nexperia', 'NXP', 'onsemi',
+    'Panasonic', 'Rohm', 'STMicroelectronics', 'TDK', 'TE Connectivity',
+    'Texas Instruments', 'Vishay', 'Wurth Elektronik', 'Yageo',
+)
+
+SELLER_NAMES = (
+    'Allied', 'Arrow', 'Avnet', 'Digi-Key', 'Farnell', 'Future', 'Mouser',
+    'Newark', 'RS Components', 'TME',
+)
+
+# {category name: names of its children}, from the root down
+CATEGORY_TREE = {
+    'Electronic Parts': ('Passive Components', 'Semiconductors',
+                         'Connectors'),
+    'Passive Components': ('Capacitors', 'Resistors', 'Inductors'),
+    'Semiconductors': ('Diodes', 'Transistors', 'Integrated Circuits'),
+    'Connectors': ('Headers', 'Terminal Blocks'),
+}
+
+# (name, unit) of the specs of parts, with include[]=specs
+SPECS = (
+    ('capacitance', 'F'), ('resistance', 'Ω'), ('voltage_rating_dc', 'V'),
+    ('current_rating', 'A'), ('power_rating', 'W'), ('tolerance', '%'),
+    ('operating_temperature_max', '°C'), ('case_package', None),
+)
+
+PACKAGINGS = ('Cut Tape', 'Tape & Reel', 'Tray', 'Bulk', 'Tube')
+
+PRICE_BREAKS = (1, 10, 25, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+_UID = re.compile(r'^[a-f0-9]{16}$')
+
+
+def _digest(*key: t.Any) -> str:
+    return hashlib.sha1(
+        ':'.join(str(part) for part in key).encode('utf-8')).hexdigest()
+
+
+class Catalog(object):
+    """Deterministic synthetic brands, sellers, categories and parts
+
+    Parts exist for any MPN: each is generated from the MPN and the seed, so
+    the same MPN always gives the same part.
+
+    >>> Catalog(seed=1).part('LM358')['uid'] == Catalog(seed=1).part(
+    ...     'LM358')['uid']
+    True
+    """
+
+    # parts remembered by uid, for /parts/<uid> requests
+    MAX_REMEMBERED_PARTS = 100000
+
+    def __init__(self, seed: int = 0) -> None:
+        self.seed = seed
+        self.brands = [self._brand(name) for name in BRAND_NAMES]
+        self.sellers = [
+            self._seller(i, name) for i, name in enumerate(SELLER_NAMES)]
+        self.categories = self._categories()
+        self._by_uid = {
+            'brands': {brand['uid']: brand for brand in self.brands},
+            'sellers': {seller['uid']: seller for seller in self.sellers},
+            'categories': {
+                category['uid']: category for category in self.categories},
+        }
+        self._mpns: t.Dict[str, str] = {}
+
+    def uid(self, kind: str, key: str) -> str:
+        return _digest(self.seed, kind, key)[:16]
+
+    def rng(self, kind: str, key: str) -> random.Random:
+        return random.Random(int(_digest(self.seed, kind, key), 16))
+
+    def _brand(self, name: str) -> dict:
+        slug = re.sub(r'[^a-z0-9]', '', name.lower())
+        return {
+            '__class__': 'Brand',
+            'uid': self.uid('brand', name),
+            'name': name,
+            'homepage_url': 'http://www.%s.com' % slug,
+        }
+
+    def _seller(self, index: int, name: str) -> dict:
+        slug = re.sub(r'[^a-z0-9]', '', name.lower())
+        return {
+            '__class__': 'Seller',
+            'uid': self.uid('seller', name),
+            'id': str(index + 1),
+            'name': name,
+            'homepage_url': 'http://www.%s.com' % slug,
+            'display_flag': 'US',
+            'has_ecommerce': True,
+        }
+
+    def _categories(self) -> t.List[dict]:
+        categories = []
+        rng = self.rng('categories', '')
+
+        def _add(name, parent):
+            category = {
+                '__class__': 'Category',
+                'uid': self.uid('category', name),
+                'name': name,
+                'parent_uid': parent['uid'] if parent else None,
+                'ancestor_uids': (
+                    parent['ancestor_uids'] + [parent['uid']]
+                    if parent else []),
+                'ancestor_names': (
+                    parent['ancestor_names'] + [parent['name']]
+                    if parent else []),
+                'children_uids': [
+                    self.uid('category', child)
+                    for child in CATEGORY_TREE.get(name, ())],
+                'num_parts': rng.randint(1000, 2000000),
+            }
+            categories.append(category)
+            for child in CATEGORY_TREE.get(name, ()):
+                _add(child, category)
+
+        _add('Electronic Parts', None)
+        return categories
+
+    def part(self,
+             mpn: str,
+             includes: t.Collection[str] = (),
+             uid: t.Optional[str] = None,
+             ) -> dict:
+        """The part with MPN `mpn`, with the fields of `includes`"""
+        rng = self.rng('part', mpn)
+        uid = uid or self.uid('part', mpn)
+        brand = rng.choice(self.brands)
+        sellers = rng.sample(self.sellers, rng.randint(1, 6))
+        part: t.Dict[str, t.Any] = {
+            '__class__': 'Part',
+            'uid': uid,
+            'mpn': mpn,
+            'brand': brand,
+            'manufacturer': dict(
+                brand, __class__='Manufacturer',
+                uid=self.uid('manufacturer', brand['name'])),
+            'octopart_url': 'https://octopart.com/%s-%s' % (
+                re.sub(r'[^a-z0-9]+', '', mpn.lower()), uid[:8]),
+            'redirected_uids': [],
+            'offers': [self._offer(rng, mpn, seller) for seller in sellers],
+        }
+        for include in includes:
+            add_include = getattr(self, '_include_%s' % include, None)
+            if add_include is not None:
+                part[include] = add_include(self.rng(include, mpn), part)
+
+        if len(self._mpns) >= self.MAX_REMEMBERED_PARTS:
+            self._mpns.clear()
+        self._mpns[uid] = mpn
+        return part
+
+    def part_by_uid(self, uid: str, includes: t.Collection[str] = ()) -> dict:
+        """
+        The part with `uid`: the one returned before under that uid, or a
+        new part for UIDs never seen
+        """
+        mpn = self._mpns.get(uid) or 'PART-%s' % uid[:8].upper()
+        return self.part(mpn, includes, uid=uid)
+
+    def _offer(self, rng: random.Random, mpn: str, seller: dict) -> dict:
+        moq = rng.choice((1, 1, 1, 10, 100, 1000))
+        quantities = sorted({moq} | {
+            quantity for quantity in rng.sample(PRICE_BREAKS, 4)
+            if quantity > moq})
+        price = rng.uniform(0.01, 20.0)
+        return {
+            '__class__': 'PartOffer',
+            'sku': '%s-%s' % (mpn, seller['name'][:3].upper()),
+            'seller': seller,
+            'eligible_region': '',
+            'product_url': 'https://octopart.com/click/track?sid=%s&sku=%s'
+                           % (seller['id'], mpn),
+            'octopart_rfq_url': None,
+            'prices': {'USD': [
+                [quantity, '%.5f' % (price * 0.9 ** i)]
+                for i, quantity in enumerate(quantities)]},
+            'in_stock_quantity': rng.choice((0, rng.randint(1, 100000))),
+            'on_order_quantity': None,
+            'on_order_eta': None,
+            'factory_lead_days': rng.choice((None, rng.randint(1, 120))),
+            'factory_order_multiple': None,
+            'order_multiple': None,
+            'moq': moq,
+            'packaging': rng.choice(PACKAGINGS),
+            'is_authorized': rng.random() < 0.8,
+            'is_realtime': False,
+            'last_updated': '2017-03-12T12:36:54Z',
+        }
+
+    def _include_specs(self, rng: random.Random, part: dict) -> dict:
+        specs: t.Dict[str, dict] = {}
+        for name, unit in rng.sample(SPECS, 4):
+            value = str(rng.choice((1, 2.2, 4.7, 10, 22, 47, 100)))
+            specs[name] = {
+                '__class__': 'SpecValue',
+                'value': [value],
+                'display_value': '%s %s' % (value, unit) if unit else value,
+                'min_value': None,
+                'max_value': None,
+                'metadata': {
+                    '__class__': 'SpecMetadata',
+                    'key': name,
+                    'name': name.replace('_', ' ').title(),
+                    'datatype': 'decimal' if unit else 'string',
+                    'unit': {'symbol': unit} if unit else None,
+                },
+                'attribution': {'sources': [], 'first_acquired': None},
+            }
+        return specs
+
+    def _include_datasheets(self, rng: random.Random, part: dict) -> list:
+        return [
+            {
+                '__class__': 'Datasheet',
+                'url': 'https://datasheets.octopart.com/%s-%s.pdf' % (
+                    part['mpn'], i),
+                'mimetype': 'application/pdf',
+                'metadata': {'num_pages': rng.randint(1, 60)},
+            }
+            for i in range(rng.randint(1, 3))]
+
+    def _include_descriptions(self, rng: random.Random, part: dict) -> list:
+        return [{
+            '__class__': 'Description',
+            'value': '%s %s, %s' % (
+                part['brand']['name'], part['mpn'],
+                rng.choice(PACKAGINGS).lower()),
+            'attribution': {'sources': []},
+        }]
+
+    def _include_imagesets(self, rng: random.Random, part: dict) -> list:
+        return [{
+            '__class__': 'ImageSet',
+            'swatch_image': None,
+            'small_image': {
+                'url': 'https://sigma.octopart.com/%s/small.jpg' % (
+                    part['uid'])},
+            'medium_image': {
+                'url': 'https://sigma.octopart.com/%s/medium.jpg' % (
+                    part['uid'])},
+            'large_image': None,
+        }]
+
+    def _include_category_uids(self, rng: random.Random, part: dict) -> list:
+        leaves = [
+            category['uid'] for category in self.categories
+            if not category['children_uids']]
+        return [rng.choice(leaves)]
+
+    def match_result(self, query: dict, includes: t.Collection[str]) -> dict:
+        """The `PartsMatchResult` of a match query"""
+        value = next((
+            query[field] for field in ('mpn', 'sku', 'mpn_or_sku', 'q')
+            if query.get(field)), '')
+        result: t.Dict[str, t.Any] = {
+            '__class__': 'PartsMatchResult',
+            'reference': query.get('reference'),
+            'hits': 0,
+            'items': [],
+            'error': None,
+        }
+        if not value:
+            return result
+
+        # wildcards match a family of parts, exact MPNs at most a few
+        mpn = str(value).rstrip('*')
+        rng = self.rng('match', str(value).lower())
+        hits = (rng.randint(5, 50) if str(value).endswith('*')
+                else rng.choice((0, 1, 1, 1, 1, 2, 3)))
+        start = int(query.get('start') or 0)
+        limit = int(query.get('limit') or 3)
+        items = [
+            self.part(mpn if i == 0 else '%s-%s' % (mpn, i), includes)
+            for i in range(start, min(start + limit, hits))]
+
+        seller = query.get('seller')
+        if seller:
+            for item in items:
+                item['offers'] = [
+                    offer for offer in item['offers']
+                    if offer['seller']['name'].lower() == seller.lower()]
+        result.update(hits=hits, items=items)
+        return result
+
+    def search_parts(self,
+                     query: str,
+                     start: int,
+                     limit: int,
+                     includes: t.Collection[str],
+                     ) -> t.Tuple[int, t.List[dict]]:
+        """(hits, results) of a parts search"""
+        hits = self.rng('search', query.lower()).randint(0, 5000)
+        prefix = re.sub(r'[^A-Z0-9]', '', query.upper())[:10] or 'PART'
+        results = [
+            {
+                '__class__': 'SearchResult',
+                'snippet': '%s part %s' % (query, i),
+                'item': self.part('%s-%04d' % (prefix, i), includes),
+            }
+            for i in range(start, min(start + limit, hits))]
+        return hits, results
+
+    def search(self,
+               resource: str,
+               query: str,
+               start: int,
+               limit: int,
+               ) -> t.Tuple[int, t.List[dict]]:
+        """(hits, results) of a brands, sellers or categories search"""
+        query = query.strip().lower()
+        matches = [
+            item for item in self._by_uid[resource].values()
+            if query in ('', '*') or query in item['name'].lower()]
+        results = [
+            {'__class__': 'SearchResult', 'item': item}
+            for item in matches[start:start + limit]]
+        return len(matches), results
+
+    def get(self,
+            resource: str,
+            uid: str,
+            includes: t.Collection[str] = (),
+            ) -> t.Optional[dict]:
+        """The brand, seller, category or part with `uid`, if any"""
+        if not _UID.match(uid):
+            return None
+        if resource == 'parts':
+            return self.part_by_uid(uid, includes)
+        return self._by_uid[resource].get(uid)
+
+
+class Latency(object):
+    """Random delay of responses
+
+    Distributions, all with mean `mean` seconds:
+        constant: always `mean`
+        uniform: between 0 and twice `mean`
+        exponential: memoryless, as arrivals of independent events
+        lognormal: long-tailed, as real API latencies; `sigma` sets the
+            spread
+    """
+
+    DISTRIBUTIONS = ('constant', 'uniform', 'exponential', 'lognormal')
+
+    def __init__(self,
+                 mean: float = 0.0,
+                 distribution: str = 'constant',
+                 sigma: float = 0.5,
+                 seed: t.Optional[int] = None,
+                 ) -> None:
+        if distribution not in self.DISTRIBUTIONS:
+            raise ValueError('Expected one of %s. Saw: %s' % (
+                self.DISTRIBUTIONS, distribution))
+        if mean < 0:
+            raise ValueError('Expected `mean` >= 0. Saw: %s' % mean)
+        self.mean = mean
+        self.distribution = distribution
+        self.sigma = sigma
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def sample(self) -> float:
+        """Seconds to delay a response by"""
+        if not self.mean or self.distribution == 'constant':
+            return self.mean
+        with self._lock:
+            if self.distribution == 'uniform':
+                return self._random.uniform(0, 2 * self.mean)
+            if self.distribution == 'exponential':
+                return self._random.expovariate(1 / self.mean)
+            # a lognormal variable of mean exp(mu + sigma^2 / 2)
+            return self.mean * self._random.lognormvariate(
+                -self.sigma ** 2 / 2, self.sigma)
+
+    __call__ = sample
+
+    def __repr__(self):
+        return '<Latency %s mean=%s>' % (self.distribution, self.mean)
+
+
+def _int_param(params: t.Dict[str, t.List[str]],
+               name: str,
+               default: int,
+               ) -> int:
+    values = params.get(name)
+    return int(values[0]) if values else default
+
+
+class FakeAPI(object):
+    """Answers API requests from a `Catalog`, without any HTTP"""
+
+    def __init__(self, catalog: Catalog) -> None:
+        self.catalog = catalog
+
+    def handle(self,
+               path: str,
+               params: t.Dict[str, t.List[str]],
+               ) -> t.Tuple[int, t.Any]:
+        """
+        (status, JSON body) of a GET request for `path` with query string
+        `params`, as parsed by `urllib.parse.parse_qs`
+        """
+        if path.startswith(API_PREFIX + '/'):
+            path = path[len(API_PREFIX):]
+        resource, _, action = path.strip('/').partition('/')
+        if resource not in ('parts', 'brands', 'sellers', 'categories') or (
+                not action or '/' in action):
+            return 404, {'message': 'Not found: %s' % path}
+        includes = params.get('include[]', [])
+        try:
+            if action == 'match' and resource == 'parts':
+                return self._match(params, includes)
+            if action == 'search':
+                return self._search(resource, params, includes)
+            if action == 'get_multi':
+                return 200, {
+                    uid: item for uid, item in (
+                        (uid, self.catalog.get(resource, uid, includes))
+                        for uid in params.get('uid[]', []))
+                    if item is not None}
+        except (ValueError, TypeError, AttributeError) as exc:
+            return 400, {'message': 'Bad request: %s' % exc}
+        item = self.catalog.get(resource, action, includes)
+        if item is None:
+            return 404, {'message': 'Not found: %s' % path}
+        return 200, item
+
+    def _match(self,
+               params: t.Dict[str, t.List[str]],
+               includes: t.List[str],
+               ) -> t.Tuple[int, t.Any]:
+        queries = json.loads(params.get('queries', ['[]'])[0])
+        if len(queries) > 20:
+            return 400, {'message': 'Too many queries: %s' % len(queries)}
+        return 200, {
+            '__class__': 'PartsMatchResponse',
+            'msec': 1,
+            'request': {
+                '__class__': 'PartsMatchRequest',
+                'exact_only': params.get('exact_only') == ['true'],
+                'queries': queries,
+            },
+            'results': [
+                self.catalog.match_result(query, includes)
+                for query in queries],
+        }
+
+    def _search(self,
+                resource: str,
+                params: t.Dict[str, t.List[str]],
+                includes: t.List[str],
+                ) -> t.Tuple[int, t.Any]:
+        query = params.get('q', [''])[0]
+        start = _int_param(params, 'start', 0)
+        limit = _int_param(params, 'limit', 10)
+        if not 0 <= limit <= MAX_SEARCH_LIMIT:
+            return 400, {'message': 'limit must be between 0 and %s' % (
+                MAX_SEARCH_LIMIT)}
+        if start < 0 or start + limit > MAX_SEARCH_HITS:
+            return 400, {'message': 'start + limit must be at most %s' % (
+                MAX_SEARCH_HITS)}
+        if resource == 'parts':
+            hits, results = self.catalog.search_parts(
+                query, start, limit, includes)
+        else:
+            hits, results = self.catalog.search(resource, query, start, limit)
+        return 200, {
+            '__class__': 'SearchResponse',
+            'hits': hits,
+            'msec': 1,
+            'request': {
+                '__class__': 'SearchRequest',
+                'q': query,
+                'start': start,
+                'limit': limit,
+            },
+            'results': results,
+        }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: 'FakeOctopartServer'
+    protocol_version = 'HTTP/1.1'
+    # headers and body are written separately; without TCP_NODELAY, delayed
+    # ACKs stall every response on a kept-alive connection
+    disable_nagle_algorithm = True
+    server_version = 'FakeOctopart/1.0'
+
+    def do_GET(self):
+        server = self.server
+        latency = server.latency
+        delay = latency() if callable(latency) else latency
+        if delay > 0:
+            time.sleep(delay)
+
+        if len(self.path) > server.max_uri_length:
+            self._send(414, {'message': 'Request-URI Too Large'})
+            return
+        if server.throttle is not None:
+            retry_after = server.throttle.take()
+            if retry_after is not None:
+                self._send(
+                    429, {'message': 'Too Many Requests'},
+                    {'Retry-After': '%.3f' % retry_after})
+                return
+        url = urlsplit(self.path)
+        status, body = server.api.handle(
+            url.path, parse_qs(url.query, keep_blank_values=True))
+        self._send(status, body)
+
+    def _send(self,
+              status: int,
+              data: t.Any,
+              headers: t.Optional[t.Dict[str, str]] = None,
+              ) -> None:
+        server = self.server
+        server.count(status)
+        body = json.dumps(data).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        if server.compress and 'gzip' in self.headers.get(
+                'Accept-Encoding', ''):
+            body = gzip.compress(body, compresslevel=server.compress)
+            self.send_header('Content-Encoding', 'gzip')
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug('%s - %s', self.address_string(), format % args)
+
+
+class FakeOctopartServer(ThreadingMixIn, HTTPServer):
+    """Threaded HTTP server of a `FakeAPI`
+
+    Use it as a context manager, which serves requests on a background
+    thread:
+
+    >>> from octopart.client import OctopartClient
+    >>> with FakeOctopartServer(port=0) as server:
+    ...     client = OctopartClient(api_key='any', base_url=server.base_url)
+    ...     client.match([{'mpn': 'LM358*'}])['results'][0]['__class__']
+    'PartsMatchResult'
+
+    Counters:
+        responses: {HTTP status: number of responses} dict
+    """
+
+    daemon_threads = True
+
+    def __init__(self,
+                 host: str = '127.0.0.1',
+                 port: int = 8000,
+                 seed: int = 0,
+                 latency: t.Union[float, t.Callable[[], float]] = 0.0,
+                 rate: t.Optional[float] = None,
+                 burst: t.Optional[int] = None,
+                 max_uri_length: int = DEFAULT_MAX_URI_LENGTH,
+                 compress: int = 0,
+                 ) -> None:
+        """
+        Kwargs:
+            host (str), port (int): address to listen on. Port 0 picks a
+                free port.
+            seed (int): seed of the synthetic data
+            latency (float): seconds to delay each response by, or a
+                function returning them, e.g. a `Latency`
+            rate (float), burst (int): limits of the `ratelimit.Throttle`
+                beyond which requests get a 429. None to never throttle.
+            max_uri_length (int): longest request target answered, beyond
+                which requests get a 414
+            compress (int): gzip level of responses to clients that accept
+                gzip, 0 to never compress
+        """
+        super().__init__((host, port), _Handler)
+        self.api = FakeAPI(Catalog(seed))
+        self.latency = latency
+        self.throttle = Throttle(rate, burst) if rate is not None else None
+        self.max_uri_length = max_uri_length
+        self.compress = compress
+        self.responses: t.Dict[int, int] = collections.Counter()
+        self._counter_lock = threading.Lock()
+        self._thread: t.Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return 'http://%s:%s' % (host, port)  # type: ignore
+
+    def count(self, status: int) -> None:
+        with self._counter_lock:
+            self.responses[status] += 1
+
+    def start(self) -> str:
+        """Serve requests on a background thread, return the base URL"""
+        # poll often, so that `stop` returns quickly
+        self._thread = threading.Thread(
+            target=self.serve_forever, kwargs={'poll_interval': 0.05},
+            daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self) -> 'FakeOctopartServer':
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def __repr__(self):
+        return '<FakeOctopartServer %s>' % self.base_url
+
+
+def main(argv: t.Optional[t.List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog='python -m octopart.fakeserver',
+        description='Serve a local stand-in for the Octopart API.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--seed', type=int, default=0,
+                        help='seed of the synthetic data')
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help='mean response latency, in seconds')
+    parser.add_argument('--latency-distribution', default='constant',
+                        choices=Latency.DISTRIBUTIONS)
+    parser.add_argument('--latency-sigma', type=float, default=0.5,
+                        help='spread of the lognormal distribution')
+    parser.add_argument('--rate', type=float,
+                        help='requests per second served before answering '
+                             '429')
+    parser.add_argument('--burst', type=int,
+                        help='requests served at once before answering 429')
+    parser.add_argument('--max-uri-length', type=int,
+                        default=DEFAULT_MAX_URI_LENGTH,
+                        help='longest URI served before answering 414')
+    parser.add_argument('--compress', type=int, default=0,
+                        help='gzip level of responses, 0 to never compress')
+    parser.add_argument('--verbose', action='store_true',
+                        help='log every request')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO,
+        format='%(asctime)s - %(message)s')
+    server = FakeOctopartServer(
+        host=args.host,
+        port=args.port,
+        seed=args.seed,
+        latency=Latency(
+            args.latency, args.latency_distribution, args.latency_sigma),
+        rate=args.rate,
+        burst=args.burst,
+        max_uri_length=args.max_uri_length,
+        compress=args.compress)
+    logger.info('Serving a fake Octopart API at %s', server.base_url)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        logger.info('Responses by status: %s', dict(server.responses))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,241 @@
+"""
+Hedged requests: cut tail latency by racing a slow request against a copy.
+
+If a request has not completed after the recent p95 latency of its endpoint,
+a `Hedger` sends the same request again and uses whichever response arrives
+first. Only requests in the slow tail are duplicated, and a budget caps the
+extra load they add.
+"""
+
+import collections
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor
+from concurrent.futures import wait
+import logging
+import math
+import threading
+import time
+import typing as t
+
+from octopart.retries import RetryBudget
+
+logger = logging.getLogger(__name__)
+
+# Hedge only matching requests by default, since their chunks of up to 20
+# queries are slow and their latency varies the most.
+DEFAULT_HEDGED_ENDPOINTS = ('parts.match',)
+
+
+class LatencyTracker(object):
+    """Thread-safe percentiles over the most recent `size` latencies"""
+
+    def __init__(self, size: int = 200) -> None:
+        self._latencies: t.Deque[float] = collections.deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._latencies)
+
+    def add(self, latency: float) -> None:
+        with self._lock:
+            self._latencies.append(latency)
+
+    def percentile(self, percentile: float) -> t.Optional[float]:
+        """
+        Latency below which `percentile` (0-1) of the recorded ones fall, or
+        None if none were recorded.
+
+        >>> tracker = LatencyTracker()
+        >>> for latency in range(1, 101):
+        ...     tracker.add(latency / 100)
+        >>> tracker.percentile(0.95)
+        0.95
+        """
+        with self._lock:
+            latencies = sorted(self._latencies)
+        if not latencies:
+            return None
+        # nearest-rank method
+        rank = math.ceil(percentile * len(latencies))
+        return latencies[min(max(rank, 1), len(latencies)) - 1]
+
+
+class Hedger(object):
+    """Sends a second copy of requests that are slower than usual
+
+    Each request is sent in a worker thread. If it has not completed after
+    the `percentile` latency of the last `window` successful requests (but at
+    least `min_delay`), counted from when a worker started sending it, a copy
+    is sent and the first successful response wins; the other one is
+    discarded once it arrives. Requests still queued for a worker are never
+    hedged. Hedging starts once `min_samples` latencies have been recorded.
+
+    Copies are prepared and sent on threads of their own, outside the pool,
+    so that a copy waiting for a rate limit token or a concurrency slot
+    never holds up the requests queued behind it.
+
+    Hedges are limited to `max_extra_load` per request, plus a reserve of
+    `burst`, so that they cannot double the load on an API that is slow
+    across the board. A request fails only once all of its copies failed,
+    with the first copy's error.
+
+    Counters:
+        requests: number of requests made through the hedger
+        hedged: number of requests a copy was sent for
+        hedge_wins: number of requests the copy answered first
+    """
+
+    def __init__(self,
+                 percentile: float = 0.95,
+                 max_extra_load: float = 0.1,
+                 burst: int = 10,
+                 min_delay: float = 0.01,
+                 window: int = 200,
+                 min_samples: int = 20,
+                 endpoints: t.Iterable[str] = DEFAULT_HEDGED_ENDPOINTS,
+                 max_workers: int = 20,
+                 ) -> None:
+        """
+        Kwargs:
+            percentile (float): latency percentile after which to hedge, 0-1
+            max_extra_load (float): hedges allowed per request
+            burst (int): hedges allowed on top of `max_extra_load`
+            min_delay (float): seconds to wait before hedging, at least
+            window (int): number of recent latencies to track
+            min_samples (int): latencies to record before hedging
+            endpoints: names of the endpoints to hedge (see
+                `utils.endpoint_from_path`)
+            max_workers (int): threads sending requests. Should be at least
+                the number of threads sharing the hedger, since requests
+                beyond it wait for a free thread.
+        """
+        self.percentile = percentile
+        self.min_delay = min_delay
+        self.min_samples = min_samples
+        self.endpoints = frozenset(endpoints)
+        self.max_workers = max_workers
+        self.latencies = LatencyTracker(window)
+        self.budget = RetryBudget(ratio=max_extra_load, burst=burst)
+
+        self.requests = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+
+        self._executor: t.Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix='octopart-hedge')
+            return self._executor
+
+    def hedges(self, endpoint: str) -> bool:
+        return endpoint in self.endpoints
+
+    def delay(self) -> t.Optional[float]:
+        """Seconds to wait before hedging, None while there is no data"""
+        if len(self.latencies) < self.min_samples:
+            return None
+        latency = self.latencies.percentile(self.percentile)
+        return max(latency or 0.0, self.min_delay)
+
+    def call(self,
+             func: t.Callable[[], t.Any],
+             prepare: t.Optional[t.Callable[[], None]] = None,
+             ) -> t.Any:
+        """
+        Call `func`, and call it once more if the first call is slow.
+
+        Args:
+            func: sends the request and returns its response
+
+        Kwargs:
+            prepare: called before each copy of the request, and allowed to
+                block or raise, e.g. to take a rate limit token. Its time
+                does not count towards the request's latency.
+        """
+        with self._lock:
+            self.requests += 1
+        self.budget.record_request()
+
+        if prepare is not None:
+            prepare()
+        started = threading.Event()
+        primary = self.executor.submit(self._timed, func, started)
+        delay = self.delay()
+        if delay is None:
+            return primary.result()
+        # the delay counts from when the request is sent, not while it waits
+        # for a worker; a request that never started sets `started` once done
+        primary.add_done_callback(lambda _: started.set())
+        started.wait()
+        done, _ = wait([primary], timeout=delay)
+        if done or not self.budget.try_retry():
+            return primary.result()
+
+        with self._lock:
+            self.hedged += 1
+        logger.debug('Hedging request still running after %.3fs', delay)
+        hedge: Future = Future()
+        threading.Thread(
+            target=self._send_hedge,
+            args=(hedge, prepare, func),
+            name='octopart-hedge-copy',
+            daemon=True).start()
+        return self._first_success(primary, hedge)
+
+    def close(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    def __repr__(self):
+        return '<Hedger requests=%s hedged=%s hedge_wins=%s>' % (
+            self.requests, self.hedged, self.hedge_wins)
+
+    def _timed(self,
+               func: t.Callable[[], t.Any],
+               started: t.Optional[threading.Event] = None,
+               ) -> t.Any:
+        if started is not None:
+            started.set()
+        start = time.monotonic()
+        result = func()
+        self.latencies.add(time.monotonic() - start)
+        return result
+
+    def _send_hedge(self,
+                    future: Future,
+                    prepare: t.Optional[t.Callable[[], None]],
+                    func: t.Callable[[], t.Any],
+                    ) -> None:
+        """Prepare and send a copy, on a thread outside the pool"""
+        future.set_running_or_notify_cancel()
+        try:
+            if prepare is not None:
+                prepare()
+            result = self._timed(func)
+        except BaseException as exc:
+            future.set_exception(exc)
+        else:
+            future.set_result(result)
+
+    def _first_success(self, primary: Future, hedge: Future) -> t.Any:
+        done, pending = wait([primary, hedge], return_when=FIRST_COMPLETED)
+        succeeded = [
+            future for future in (primary, hedge)
+            if future in done and future.exception() is None]
+        if not succeeded:
+            # the first to complete failed, so the other one decides
+            succeeded = [
+                future for future in pending if future.exception() is None]
+        if not succeeded:
+            return primary.result()
+        if succeeded[0] is hedge:
+            with self._lock:
+                self.hedge_wins += 1
+        return succeeded[0].result()
@@ -3,6 +3,7 @@ Types that wrap responses from the Octopart API
 and make various attributes easier to access.
 """
 
+import itertools
 import typing as t
 
 from schematics.exceptions import ConversionError, DataError, ValidationError
@@ -10,6 +11,51 @@ from schematics.models import Model
 from schematics.types import BooleanType, IntType, StringType
 from schematics.types.compound import DictType, ListType
 
+from octopart.tables import OfferTable
+
+
+def memo_slots(*names: str) -> t.Tuple[str, ...]:
+    """
+    Slots that a class with `__slots__` must declare for its memoized
+    properties `names`
+
+    >>> memo_slots('offers', 'specs')
+    ('_memo_offers', '_memo_specs')
+    """
+    return tuple(memoized_property.slot_name(name) for name in names)
+
+
+class memoized_property(object):
+    """
+    Property that is computed on first access and then stored on the
+    instance, like `functools.cached_property` (Python 3.8+).
+
+    The value is stored in the attribute `_memo_<name>`, which works with
+    `__slots__` as long as the class declares that slot (see `memo_slots`).
+    Cached values are shared between accesses, so callers must not mutate
+    them.
+    """
+
+    def __init__(self, func):
+        self.func = func
+        self.__doc__ = func.__doc__
+        self.name = func.__name__
+        self.slot = self.slot_name(func.__name__)
+
+    @staticmethod
+    def slot_name(name: str) -> str:
+        return '_memo_' + name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        try:
+            return getattr(instance, self.slot)
+        except AttributeError:
+            value = self.func(instance)
+            setattr(instance, self.slot, value)
+            return value
+
 
 class BaseModel(Model):
     @classmethod
@@ -105,6 +151,8 @@ class PartsSearchQuery(BaseModel):
 
 
 class PartsMatchResponse():
+    __slots__ = ('_response',) + memo_slots('results')
+
     def __init__(self, response):
         self._response = response
 
@@ -112,7 +160,7 @@ class PartsMatchResponse():
     def request(self):
         return self._response['request']
 
-    @property
+    @memoized_property
     def results(self):
         return [
             PartsMatchResult(result) for result in self._response['results']
@@ -123,6 +171,8 @@ class PartsMatchResponse():
 
 
 class PartsMatchResult():
+    __slots__ = ('_result',) + memo_slots('parts')
+
     def __init__(self, result):
         self._result = result
 
@@ -130,10 +180,17 @@ class PartsMatchResult():
     def mpn(self):
         return self._result['reference']
 
-    @property
+    @memoized_property
     def parts(self):
         return [Part(part) for part in self._result['items']]
 
+    def to_offer_table(self) -> OfferTable:
+        """Offers of all parts as an `OfferTable`, see `to_offer_table`"""
+        return OfferTable.from_parts(self._part_dicts())
+
+    def _part_dicts(self) -> t.Iterator[dict]:
+        return iter(self._result['items'])
+
     def __repr__(self):
         return '<PartsMatchResult: hits=%s query=%s>' % (
             self._result['hits'],
@@ -148,16 +205,25 @@ class PartsMatchResult():
 
 
 class PartsSearchResult():
+    __slots__ = ('_result',) + memo_slots('parts')
+
     def __init__(self, result):
         self._result = result
 
-    @property
+    @memoized_property
     def parts(self):
         return [
             Part(result['item'])
             for result in self._result.get('results', [])
         ]
 
+    def to_offer_table(self) -> OfferTable:
+        """Offers of all parts as an `OfferTable`, see `to_offer_table`"""
+        return OfferTable.from_parts(self._part_dicts())
+
+    def _part_dicts(self) -> t.Iterator[dict]:
+        return (result['item'] for result in self._result.get('results', []))
+
     def __repr__(self):
         return '<PartsSearchResult: hits=%s>' % self._result['hits']
 
@@ -169,7 +235,22 @@ class PartsSearchResult():
                 print('\t\t%s' % offer)
 
 
+def to_offer_table(
+        results: t.Iterable[t.Union['PartsMatchResult', 'PartsSearchResult']],
+        ) -> OfferTable:
+    """
+    Flatten the offers of every part of `results`, e.g. the list returned by
+    `octopart.match()`, into one `tables.OfferTable`, without creating
+    `Part` or `PartOffer` objects. Requires numpy.
+    """
+    return OfferTable.from_parts(itertools.chain.from_iterable(
+        result._part_dicts() for result in results))
+
+
 class Part():
+    __slots__ = ('_part',) + memo_slots(
+        'offers', 'specs', 'imagesets', 'descriptions', 'datasheets')
+
     def __init__(self, part):
         self._part = part
 
@@ -181,7 +262,7 @@ class Part():
     def mpn(self):
         return self._part['mpn']
 
-    @property
+    @memoized_property
     def offers(self):
         return [PartOffer(offer) for offer in self._part['offers']]
 
@@ -189,7 +270,7 @@ class Part():
     def category_uids(self):
         return self._part['category_uids']
 
-    @property
+    @memoized_property
     def specs(self) -> t.Dict[str, 'Spec']:
         _specs = self._part.get('specs', {})
         return {
@@ -197,7 +278,7 @@ class Part():
             for name, spec in _specs.items()
         }
 
-    @property
+    @memoized_property
     def imagesets(self):
         _imagesets = self._part.get('imagesets')
         # TODO: make better accessors for different image URLs.
@@ -205,14 +286,14 @@ class Part():
             return [Imageset(imageset) for imageset in _imagesets]
         return None
 
-    @property
+    @memoized_property
     def descriptions(self):
         _descriptions = self._part.get('descriptions')
         if _descriptions:
             return [desc['value'] for desc in _descriptions]
         return None
 
-    @property
+    @memoized_property
     def datasheets(self):
         _datasheets = self._part.get('datasheets')
         if _datasheets:
@@ -228,6 +309,8 @@ class Part():
 
 
 class Spec():
+    __slots__ = ('_name', '_spec')
+
     def __init__(self, name, spec):
         self._name = name
         self._spec = spec
@@ -278,10 +361,12 @@ class Imageset():
         for size in [SWATCH, SMALL, MEDIUM, LARGE]
     ]
 
+    __slots__ = ('_imageset',) + memo_slots('image_urls')
+
     def __init__(self, imageset):
         self._imageset = imageset
 
-    @property
+    @memoized_property
     def image_urls(self):
         return {
             key: image_data['url']
@@ -297,6 +382,8 @@ class Imageset():
 
 
 class PartOffer():
+    __slots__ = ('_offer',) + memo_slots('prices')
+
     def __init__(self, offer):
         self._offer = offer
 
@@ -304,7 +391,7 @@ class PartOffer():
     def sku(self):
         return self._offer['sku']
 
-    @property
+    @memoized_property
     def prices(self):
         return {
             currency: {
@@ -346,6 +433,8 @@ class PartOffer():
 
 
 class Brand():
+    __slots__ = ('_brand',)
+
     def __init__(self, brand):
         self._brand = brand
 
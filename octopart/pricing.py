@@ -0,0 +1,162 @@
+"""
+Batched quantity-break price lookups.
+
+Pricing a line at quantity Q means finding, for every offer, the largest
+price break not above Q. A `PriceEngine` keeps the breaks of all offers in
+one sorted NumPy array and answers that for many offers and quantities in a
+single binary search (`numpy.searchsorted`), instead of a Python scan per
+offer and quantity. Requires the optional `numpy` dependency
+(`pip install octopart[tables]`).
+"""
+
+import typing as t
+
+from octopart.tables import OfferTable
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore
+
+# Columns that sort price breaks by part, offer and currency
+_OFFER_KEY = ('part_uid', 'offer', 'currency')
+
+# Columns kept per offer in `PriceQuotes`
+_OFFER_COLUMNS = (
+    'part_uid', 'offer', 'seller', 'sku', 'currency', 'in_stock_quantity',
+    'moq')
+
+
+class PriceQuotes(object):
+    """Prices of offers at a set of quantities
+
+    Attributes:
+        part_uid, offer, seller, sku, in_stock_quantity, moq: one entry per
+            offer, see `OfferTable`
+        quantities: the quantities priced
+        unit_price, extended_cost: (offers, quantities) arrays. NaN where
+            the offer cannot be bought at that quantity: below its MOQ or
+            its lowest price break.
+    """
+
+    def __init__(self,
+                 offers: t.Dict[str, 'np.ndarray'],
+                 quantities: 'np.ndarray',
+                 unit_price: 'np.ndarray',
+                 ) -> None:
+        self.part_uid = offers['part_uid']
+        self.offer = offers['offer']
+        self.seller = offers['seller']
+        self.sku = offers['sku']
+        self.in_stock_quantity = offers['in_stock_quantity']
+        self.moq = offers['moq']
+        self.quantities = quantities
+        self.unit_price = unit_price
+        self.extended_cost = unit_price * quantities
+
+    def __len__(self):
+        return len(self.part_uid)
+
+    def __repr__(self):
+        return '<PriceQuotes offers=%s quantities=%s>' % (
+            len(self), len(self.quantities))
+
+    def min_by_part(self) -> t.Dict[str, 'np.ndarray']:
+        """
+        {part uid: lowest unit price at each quantity} dict, NaN where no
+        offer of the part can be bought at that quantity.
+        """
+        if not len(self):
+            return {}
+        # offers are sorted by part
+        starts = np.flatnonzero(np.concatenate((
+            [True], self.part_uid[1:] != self.part_uid[:-1])))
+        minimums = np.fmin.reduceat(self.unit_price, starts, axis=0)
+        return dict(zip(self.part_uid[starts].tolist(), minimums))
+
+
+class PriceEngine(object):
+    """Unit prices and extended costs of many offers at many quantities
+
+    Built from an `OfferTable`. Offers without stock are left out. Each
+    (offer, currency) keeps its breaks sorted by quantity, all of them in one
+    array keyed by `offer index * key_stride + break quantity`, so that the
+    applicable break of every (offer, quantity) pair is found by one
+    vectorized binary search.
+
+    >>> table = OfferTable.from_parts([{'uid': 'a', 'offers': [{
+    ...     'seller': {'name': 'Digi-Key'}, 'sku': 'A-ND',
+    ...     'in_stock_quantity': 500, 'moq': 1,
+    ...     'prices': {'USD': [[1, '0.50'], [100, '0.30']]}}]}])
+    >>> quotes = PriceEngine(table).quote([1, 99, 100], currency='USD')
+    >>> quotes.unit_price.tolist()
+    [[0.5, 0.5, 0.3]]
+    >>> quotes.extended_cost.tolist()
+    [[0.5, 49.5, 30.0]]
+    """
+
+    def __init__(self, table: OfferTable) -> None:
+        table = table.in_stock()
+        columns = table.columns
+        order = np.lexsort(
+            (columns['quantity'],) + tuple(
+                columns[name] for name in reversed(_OFFER_KEY)))
+        sorted_columns = {
+            name: column[order] for name, column in columns.items()}
+
+        # group the breaks of each (offer, currency)
+        starts = np.zeros(len(order), dtype=bool)
+        starts[:1] = True
+        for name in ('offer', 'currency'):
+            key = sorted_columns[name]
+            starts[1:] |= key[1:] != key[:-1]
+        offer_index = np.cumsum(starts) - 1
+        self._starts = np.flatnonzero(starts)
+        self.offers = {
+            name: sorted_columns[name][self._starts]
+            for name in _OFFER_COLUMNS}
+
+        quantities = sorted_columns['quantity']
+        self.key_stride = int(quantities.max()) + 1 if len(order) else 1
+        self._keys = offer_index * self.key_stride + quantities
+        self._prices = sorted_columns['unit_price']
+
+    @classmethod
+    def from_parts(cls, parts: t.Iterable[dict]) -> 'PriceEngine':
+        """Build an engine from raw part dicts, see `OfferTable.from_parts`"""
+        return cls(OfferTable.from_parts(parts))
+
+    def __len__(self):
+        """Number of (offer, currency) pairs"""
+        return len(self._starts)
+
+    def __repr__(self):
+        return '<PriceEngine offers=%s breaks=%s>' % (
+            len(self), len(self._keys))
+
+    def quote(self,
+              quantities: t.Iterable[int],
+              currency: str = 'USD',
+              ) -> PriceQuotes:
+        """
+        Price every offer in `currency` at each of `quantities`, in one
+        batched lookup.
+        """
+        quantities = np.asarray(list(quantities), dtype=np.int64)
+        offers = np.flatnonzero(self.offers['currency'] == currency)
+        # quantities beyond the largest break use the largest break
+        probe_quantities = np.minimum(quantities, self.key_stride - 1)
+        probes = (offers[:, np.newaxis] * self.key_stride
+                  + probe_quantities[np.newaxis, :])
+        # index of the last break at or below each probe
+        index = np.searchsorted(self._keys, probes, side='right') - 1
+        available = (
+            (index >= self._starts[offers][:, np.newaxis])
+            & (quantities[np.newaxis, :]
+               >= self.offers['moq'][offers][:, np.newaxis]))
+        unit_price = np.where(
+            available, self._prices[np.maximum(index, 0)], np.nan)
+        return PriceQuotes(
+            {name: column[offers] for name, column in self.offers.items()},
+            quantities,
+            unit_price)
@@ -0,0 +1,229 @@
+"""
+Client-side rate limiting of requests to the Octopart API.
+
+Octopart limits the request rate per API key. Pacing requests on our side
+keeps threads from running into HTTP 429 errors and burning their retry
+budget on backoff.
+"""
+
+import os
+import threading
+import time
+import typing as t
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None  # type: ignore
+
+
+class RateLimiter(object):
+    """Interface of the rate limiters accepted by `OctopartClient`
+
+    Counters:
+        acquired: number of requests let through
+        waited: total seconds callers were held back
+    """
+
+    def __init__(self) -> None:
+        self.acquired = 0
+        self.waited = 0.0
+        self._stats_lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """
+        Block until one more request may be sent.
+
+        Returns:
+            seconds spent waiting.
+        """
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+        with self._stats_lock:
+            self.acquired += 1
+            self.waited += delay
+        return delay
+
+    def reserve(self) -> float:
+        """
+        Take a token without waiting for it.
+
+        Returns:
+            seconds until the token becomes available; the caller must not
+            send its request before then.
+        """
+        raise NotImplementedError
+
+    def __repr__(self):
+        return '<%s acquired=%s waited=%.3fs>' % (
+            type(self).__name__, self.acquired, self.waited)
+
+
+def _refill(tokens: float,
+            updated_at: float,
+            now: float,
+            rate: float,
+            burst: float,
+            ) -> t.Tuple[float, float]:
+    """
+    Take one token from a bucket last updated at `updated_at`.
+
+    Tokens may go negative: each caller reserves the next free token, and
+    waits for as long as it takes to refill.
+
+    Returns:
+        (tokens left, seconds to wait) tuple.
+
+    >>> _refill(tokens=0.0, updated_at=0.0, now=0.5, rate=4.0, burst=4.0)
+    (1.0, 0.0)
+    >>> _refill(tokens=0.5, updated_at=0.0, now=0.0, rate=2.0, burst=4.0)
+    (-0.5, 0.25)
+    """
+    tokens = min(burst, tokens + max(now - updated_at, 0) * rate) - 1
+    return tokens, max(-tokens / rate, 0.0)
+
+
+class TokenBucket(RateLimiter):
+    """Thread-safe token bucket
+
+    The bucket holds up to `burst` tokens and refills at `rate` tokens per
+    second. Each request takes one token, so at most `burst` requests go out
+    back to back, after which they are spaced `1 / rate` seconds apart.
+    Callers that have to wait are served in the order they arrived.
+    """
+
+    def __init__(self, rate: float, burst: t.Optional[int] = None) -> None:
+        """
+        Args:
+            rate (float): sustained requests per second
+
+        Kwargs:
+            burst (int): bucket size. Defaults to one second's worth of
+                requests.
+        """
+        if rate <= 0:
+            raise ValueError('Expected `rate` > 0. Saw: %s' % rate)
+        super().__init__()
+        self.rate = rate
+        self.burst = burst or max(int(rate), 1)
+        self._tokens = float(self.burst)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens, delay = _refill(
+                self._tokens, self._updated_at, now, self.rate, self.burst)
+            self._updated_at = now
+        return delay
+
+
+class FileTokenBucket(RateLimiter):
+    """Token bucket shared by all processes on a host through a state file
+
+    The bucket state lives in `path` and is updated under an exclusive
+    `flock`, so every process (and thread) that uses the same file draws from
+    one quota. Wall-clock time is used, since monotonic clocks are not
+    comparable across processes. Requires a POSIX system.
+    """
+
+    def __init__(self,
+                 path: str,
+                 rate: float,
+                 burst: t.Optional[int] = None,
+                 ) -> None:
+        """
+        Args:
+            path (str): state file, created if it does not exist
+            rate, burst: see `TokenBucket`. All processes sharing a file
+                should use the same values.
+        """
+        if fcntl is None:  # pragma: no cover
+            raise ImportError('FileTokenBucket requires fcntl (POSIX only).')
+        if rate <= 0:
+            raise ValueError('Expected `rate` > 0. Saw: %s' % rate)
+        super().__init__()
+        self.path = path
+        self.rate = rate
+        self.burst = burst or max(int(rate), 1)
+
+    def reserve(self) -> float:
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            now = time.time()
+            try:
+                tokens_str, updated_at_str = os.read(fd, 64).split()
+                tokens, updated_at = float(tokens_str), float(updated_at_str)
+            except ValueError:
+                # new or corrupt file: start with a full bucket
+                tokens, updated_at = float(self.burst), now
+            tokens, delay = _refill(
+                tokens, updated_at, now, self.rate, self.burst)
+            state = ('%r %r' % (tokens, now)).encode()
+            os.lseek(fd, 0, os.SEEK_SET)
+            os.write(fd, state)
+            os.ftruncate(fd, len(state))
+        finally:
+            # closing the file also releases the lock
+            os.close(fd)
+        return delay
+
+
+class Throttle(object):
+    """Thread-safe token bucket that rejects requests instead of delaying them
+
+    This is how a rate-limited server behaves, and is what the stand-ins for
+    the API (`transport.ReplayAdapter`, `fakeserver`) use to answer with 429.
+    Unlike `TokenBucket`, rejected requests do not take a token.
+
+    Counters:
+        admitted: number of requests let through
+        rejected: number of requests turned away
+    """
+
+    def __init__(self, rate: float, burst: t.Optional[int] = None) -> None:
+        """
+        Args:
+            rate (float): sustained requests per second
+
+        Kwargs:
+            burst (int): bucket size. Defaults to one second's worth of
+                requests.
+        """
+        if rate <= 0:
+            raise ValueError('Expected `rate` > 0. Saw: %s' % rate)
+        self.rate = rate
+        self.burst = burst or max(int(rate), 1)
+        self.admitted = 0
+        self.rejected = 0
+        self._tokens = float(self.burst)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def take(self) -> t.Optional[float]:
+        """
+        Take a token if one is available.
+
+        Returns:
+            None if the request is admitted, otherwise seconds until a token
+            becomes available, e.g. for a `Retry-After` header.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst,
+                self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+            if self._tokens < 1:
+                self.rejected += 1
+                return (1 - self._tokens) / self.rate
+            self._tokens -= 1
+            self.admitted += 1
+            return None
+
+    def __repr__(self):
+        return '<Throttle admitted=%s rejected=%s>' % (
+            self.admitted, self.rejected)
@@ -0,0 +1,235 @@
+"""
+Retry policies for requests to the Octopart API.
+
+A `RetryPolicy` decides whether a failed request is worth another attempt,
+and how long to wait before it: errors that cannot succeed on retry (such as
+400 or 404) fail right away, waits honor the server's `Retry-After` header
+and are spread with full jitter, and an optional `RetryBudget` caps the extra
+load that retries may add while the API is struggling.
+"""
+
+import asyncio
+import email.utils
+import logging
+import random
+import threading
+import time
+import typing as t
+
+from octopart.decorators import status_code_from_exception
+
+logger = logging.getLogger(__name__)
+
+# HTTP statuses worth retrying: timeouts, rate limiting, and server errors
+# that are usually transient.
+DEFAULT_RETRY_STATUSES = frozenset([408, 429, 500, 502, 503, 504])
+
+_ExceptionTypes = t.Union[
+    t.Type[BaseException], t.Tuple[t.Type[BaseException], ...]]
+
+
+def retry_after_from_exception(exc: BaseException) -> t.Optional[float]:
+    """
+    Seconds to wait according to the `Retry-After` header of the response
+    attached to a `requests` or `aiohttp` exception, or None if there is no
+    such header. The header holds either seconds or an HTTP date.
+    """
+    response = getattr(exc, 'response', None)
+    headers = getattr(response, 'headers', None) or getattr(
+        exc, 'headers', None)
+    if not headers:
+        return None
+    value = headers.get('Retry-After')
+    if value is None:
+        return None
+    return parse_retry_after(value)
+
+
+def parse_retry_after(value: str) -> t.Optional[float]:
+    """
+    >>> parse_retry_after('120')
+    120.0
+    >>> parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT')
+    0.0
+    >>> parse_retry_after('soon') is None
+    True
+    """
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    return max(retry_at.timestamp() - time.time(), 0.0)
+
+
+class RetryBudget(object):
+    """Limits retries to a share of all requests
+
+    Every request deposits `ratio` retry tokens and every retry takes one
+    token, so that retries add at most `ratio` extra load on top of the
+    requests themselves, plus a reserve of `burst` retries for when traffic
+    is light. Share one budget between all clients of a job to cap the job's
+    retries as a whole.
+
+    Counters:
+        requests: number of requests recorded
+        retries: number of retries allowed
+        rejected: number of retries refused for lack of budget
+    """
+
+    def __init__(self, ratio: float = 0.1, burst: int = 10) -> None:
+        """
+        Kwargs:
+            ratio (float): retries allowed per request
+            burst (int): retries allowed without any requests, which is also
+                the most tokens the budget saves up
+        """
+        self.ratio = ratio
+        self.burst = burst
+        self.requests = 0
+        self.retries = 0
+        self.rejected = 0
+        self._balance = float(burst)
+        self._lock = threading.Lock()
+
+    def record_request(self) -> None:
+        with self._lock:
+            self.requests += 1
+            self._balance = min(self._balance + self.ratio, self.burst)
+
+    def try_retry(self) -> bool:
+        """Take a token for one retry, return whether there was one"""
+        with self._lock:
+            # tolerate rounding errors from adding up fractional ratios
+            if self._balance >= 1 - 1e-9:
+                self._balance -= 1
+                self.retries += 1
+                return True
+            self.rejected += 1
+            return False
+
+    def __repr__(self):
+        return '<RetryBudget requests=%s retries=%s rejected=%s>' % (
+            self.requests, self.retries, self.rejected)
+
+
+class RetryPolicy(object):
+    """Decides which failed requests to retry, and when
+
+    Errors without an HTTP status, such as connection errors and timeouts,
+    are retried, as are the statuses in `retry_statuses`. The wait before
+    attempt n + 1 is drawn uniformly from [0, min(backoff_max,
+    backoff_base * 2^n)] ("full jitter"), so that requests which failed
+    together do not retry in lockstep, but never shorter than the response's
+    `Retry-After`. A request is given up once `max_attempts` attempts were
+    made, once the next attempt would start more than `max_elapsed` seconds
+    after the first, or when `budget` has no retries left.
+
+    A policy holds no per-request state and may be shared by many clients.
+    """
+
+    def __init__(self,
+                 max_attempts: int = 8,
+                 max_elapsed: float = 20.0,
+                 backoff_base: float = 0.1,
+                 backoff_max: float = 10.0,
+                 retry_statuses: t.Iterable[int] = DEFAULT_RETRY_STATUSES,
+                 respect_retry_after: bool = True,
+                 budget: t.Optional[RetryBudget] = None,
+                 ) -> None:
+        """
+        Kwargs:
+            max_attempts (int): attempts per request, including the first
+            max_elapsed (float): seconds after the first attempt beyond which
+                no further attempt is started
+            backoff_base (float): seconds; see above
+            backoff_max (float): longest backoff in seconds, before
+                `Retry-After` is taken into account
+            retry_statuses: HTTP statuses to retry
+            respect_retry_after (bool): whether to wait at least as long as
+                a response's `Retry-After` header asks for
+            budget (RetryBudget): caps retries across all requests
+        """
+        self.max_attempts = max_attempts
+        self.max_elapsed = max_elapsed
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_statuses = frozenset(retry_statuses)
+        self.respect_retry_after = respect_retry_after
+        self.budget = budget
+
+    def is_retryable(self, exc: BaseException) -> bool:
+        status = status_code_from_exception(exc)
+        return status is None or status in self.retry_statuses
+
+    def backoff(self, attempt: int) -> float:
+        """Jittered seconds to wait after failed attempt number `attempt`"""
+        return random.uniform(
+            0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def delay(self,
+              exc: BaseException,
+              attempt: int,
+              elapsed: float,
+              ) -> t.Optional[float]:
+        """
+        Seconds to wait before retrying a request whose attempt number
+        `attempt` failed with `exc`, `elapsed` seconds after the first
+        attempt started; None to give up.
+        """
+        if attempt >= self.max_attempts or not self.is_retryable(exc):
+            return None
+        delay = self.backoff(attempt)
+        if self.respect_retry_after:
+            retry_after = retry_after_from_exception(exc)
+            if retry_after is not None:
+                delay = max(delay, retry_after)
+        if elapsed + delay > self.max_elapsed:
+            return None
+        if self.budget is not None and not self.budget.try_retry():
+            logger.warning('Retry budget exhausted, not retrying: %s', exc)
+            return None
+        return delay
+
+    def call(self,
+             func: t.Callable[[], t.Any],
+             retry_on: _ExceptionTypes,
+             ) -> t.Any:
+        """Call `func`, retrying on `retry_on` exceptions as per the policy"""
+        if self.budget is not None:
+            self.budget.record_request()
+        start = time.monotonic()
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                return func()
+            except retry_on as exc:
+                delay = self.delay(exc, attempt, time.monotonic() - start)
+                if delay is None:
+                    raise
+                logger.debug('Retrying in %.3fs after: %s', delay, exc)
+            time.sleep(delay)
+
+    async def call_async(self,
+                         func: t.Callable[[], t.Awaitable[t.Any]],
+                         retry_on: _ExceptionTypes,
+                         ) -> t.Any:
+        """Coroutine counterpart of `call`"""
+        if self.budget is not None:
+            self.budget.record_request()
+        start = time.monotonic()
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                return await func()
+            except retry_on as exc:
+                delay = self.delay(exc, attempt, time.monotonic() - start)
+                if delay is None:
+                    raise
+                logger.debug('Retrying in %.3fs after: %s', delay, exc)
+            await asyncio.sleep(delay)
@@ -0,0 +1,61 @@
+"""
+Coalescing of identical concurrent calls ("single-flight").
+"""
+
+from concurrent.futures import Future
+import threading
+import typing as t
+
+
+class SingleFlight(object):
+    """Run concurrent calls that share a key only once
+
+    The first caller of `do` for a given key runs the function; callers that
+    arrive with the same key while it is still running wait for it, and get
+    the same result or exception. Once the call has finished, the next caller
+    runs the function again.
+
+    Counters:
+        executed: number of calls that actually ran the function
+        shared: number of calls that were served by another call in flight
+    """
+
+    def __init__(self) -> None:
+        self.executed = 0
+        self.shared = 0
+        self._in_flight: t.Dict[t.Hashable, Future] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: t.Hashable, func: t.Callable[[], t.Any]) -> t.Any:
+        with self._lock:
+            in_flight = self._in_flight.get(key)
+            if in_flight is None:
+                future = self._in_flight[key] = Future()
+                self.executed += 1
+            else:
+                self.shared += 1
+
+        if in_flight is not None:
+            return in_flight.result()
+
+        try:
+            result = func()
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+
+    @property
+    def saved_ratio(self) -> float:
+        """Share of all calls that did not have to run the function"""
+        total = self.executed + self.shared
+        return self.shared / total if total else 0.0
+
+    def __repr__(self):
+        return '<SingleFlight executed=%s shared=%s>' % (
+            self.executed, self.shared)
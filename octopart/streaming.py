@@ -0,0 +1,175 @@
+"""
+Incremental parsing of the 'results' array of large responses.
+
+Match and search responses that include specs or datasheets run to several
+MB. Decoding them in one go holds the whole body, and the whole decoded
+tree, in memory until the last result has been processed. An
+`ArrayItemScanner` instead finds where each element of the top-level
+'results' array starts and ends as the body arrives, so that each one can be
+decoded and handed on as soon as it is complete. Only the element being
+received is buffered: peak memory is bounded by the largest single result,
+not by the response.
+
+The scanner only tracks nesting, strings and commas; each element is then
+decoded by the client's `codec.JSONCodec`, which also reports malformed
+JSON.
+"""
+
+import json
+import re
+import typing as t
+
+# Bytes read from the socket at a time by streaming requests
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# A whole JSON string (group 1 is its closing quote, None if the string
+# continues past the end of the buffer), or a structural character. Strings
+# are matched as runs between escapes, which cannot backtrack exponentially
+# when a string is cut off by the end of the buffer.
+_TOKEN = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*(")?|[\[\]{},]', re.DOTALL)
+
+# Everything up to the next bracket, skipping whole strings. Inside an
+# element only brackets matter, so this skips over most of it in one step.
+_NESTED = re.compile(
+    rb'(?:[^"\[\]{}]+|"[^"\\]*(?:\\.[^"\\]*)*")*', re.DOTALL)
+
+_QUOTE = ord('"')
+_COMMA = ord(',')
+_OPENING = frozenset(b'[{')
+_OPEN_ARRAY = ord('[')
+
+
+class ArrayItemScanner(object):
+    """Splits the array at top-level `key` of a JSON object into elements
+
+    Feed it the body in chunks of any size; `feed` returns the raw bytes of
+    the elements completed by each chunk, ready for `json.loads`. `done`
+    turns true once the array is closed.
+
+    >>> scanner = ArrayItemScanner('results')
+    >>> scanner.feed(b'{"hits": 2, "results": [{"a": "]"}, ')
+    [b'{"a": "]"}']
+    >>> scanner.feed(b'[1, 2]]}')
+    [b' [1, 2]']
+    >>> scanner.done
+    True
+    """
+
+    def __init__(self, key: str = 'results') -> None:
+        self.key = key.encode()
+        # whether the array was found, and whether it was closed
+        self.found = False
+        self.done = False
+        self._buffer = bytearray()
+        # offset of the next byte to scan
+        self._pos = 0
+        self._depth = 0
+        # last string seen directly in the top-level object
+        self._last_string: t.Optional[bytes] = None
+        # offset where the element being received starts
+        self._item_start = 0
+
+    def feed(self, data: bytes) -> t.List[bytes]:
+        """Scan the next chunk of the body, return the completed elements"""
+        if self.done:
+            return []
+        buffer = self._buffer
+        buffer += data
+        items: t.List[bytes] = []
+        while not self.done:
+            match = self._next_token()
+            if match is None:
+                break
+            self._pos = match.end()
+            self._handle_token(match, items)
+        if self.done:
+            buffer.clear()
+            return items
+
+        # drop what has been scanned, except the element being received
+        keep_from = self._item_start if self.found else self._pos
+        del buffer[:keep_from]
+        self._pos -= keep_from
+        if self.found:
+            self._item_start -= keep_from
+        return items
+
+    def _next_token(self) -> t.Optional['re.Match[bytes]']:
+        """
+        Next string or structural character, or None if more of the body is
+        needed first. Moves `_pos` past what need not be scanned again.
+        """
+        buffer = self._buffer
+        pos = self._pos
+        if self._depth > 2:
+            # always matches, possibly nothing
+            pos = _NESTED.match(buffer, pos).end()  # type: ignore
+            self._pos = pos
+            if pos == len(buffer) or buffer[pos] == _QUOTE:
+                # the rest of the string has yet to arrive
+                return None
+        match = _TOKEN.search(buffer, pos)
+        if match is None:
+            self._pos = len(buffer)
+        elif match.group()[0] == _QUOTE and match.group(1) is None:
+            # scan the string again once the rest has arrived
+            self._pos = match.start()
+            return None
+        return match
+
+    def _handle_token(self, match: 're.Match[bytes]',
+                      items: t.List[bytes]) -> None:
+        char = match.group()[0]
+        depth = self._depth
+        if char == _QUOTE:
+            if depth == 1:
+                self._last_string = match.group()[1:-1]
+        elif char in _OPENING:
+            # the value of `key` is the first value after that key
+            if (char == _OPEN_ARRAY and depth == 1 and not self.found
+                    and self._last_string == self.key):
+                self.found = True
+                self._item_start = match.end()
+            self._depth += 1
+        elif char == _COMMA:
+            if self.found and depth == 2:
+                self._add_item(items, match.start())
+                self._item_start = match.end()
+        else:
+            self._depth -= 1
+            if self.found and depth == 2:
+                self._add_item(items, match.start())
+                self.done = True
+
+    def _add_item(self, items: t.List[bytes], end: int) -> None:
+        item = bytes(self._buffer[self._item_start:end])
+        # an empty array has no elements
+        if item.strip():
+            items.append(item)
+
+
+def iter_array_items(chunks: t.Iterable[bytes],
+                     key: str = 'results',
+                     loads: t.Callable[[bytes], t.Any] = json.loads,
+                     ) -> t.Iterator[t.Any]:
+    """
+    Yield the decoded elements of the array at top-level `key` of the JSON
+    object whose body is read from `chunks`, each as soon as it has been
+    received. The rest of the body is still read, and discarded, so that the
+    connection it came from can be reused.
+
+    >>> list(iter_array_items([b'{"results": [1, ', b'{"a": 2}]}']))
+    [1, {'a': 2}]
+
+    Raises:
+        ValueError: if the body ends before the array does, or has no such
+            array
+    """
+    scanner = ArrayItemScanner(key)
+    for chunk in chunks:
+        for item in scanner.feed(chunk):
+            yield loads(item)
+    if not scanner.found:
+        raise ValueError('Expected a %r array in the response' % key)
+    if not scanner.done:
+        raise ValueError('Response ended inside the %r array' % key)
@@ -0,0 +1,215 @@
+"""
+Columnar tables of offers, for costing many parts at once.
+
+An `OfferTable` holds one row per price break of every offer, in NumPy
+arrays, so that filters and per-part aggregates run as array operations
+instead of Python loops over `PartOffer` objects. Requires the optional
+`numpy` dependency (`pip install octopart[tables]`).
+"""
+
+import typing as t
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore
+
+# Columns of an `OfferTable`, in order
+OFFER_COLUMNS = (
+    'part_uid',
+    'offer',
+    'seller',
+    'sku',
+    'currency',
+    'quantity',
+    'unit_price',
+    'in_stock_quantity',
+    'moq',
+)
+
+# Stands in for quantities the API returned as null
+MISSING_QUANTITY = -1
+
+
+def _quantity(value: t.Optional[int]) -> int:
+    return MISSING_QUANTITY if value is None else value
+
+
+class OfferTable(object):
+    """Offers flattened into NumPy columns, one row per price break
+
+    Columns (see `OFFER_COLUMNS`):
+        part_uid, seller, sku, currency: strings
+        offer (int): ordinal of the offer among all offers of the parts the
+            table was built from. Unlike seller and sku, it tells apart
+            offers of the same sku, e.g. in different packagings.
+        quantity (int): break quantity the unit price applies from
+        unit_price (float)
+        in_stock_quantity, moq (int): `MISSING_QUANTITY` when unknown
+
+    Offers without any price break have no rows. Filters return new tables
+    and leave this one as is:
+
+    >>> table = OfferTable.from_parts([{'uid': 'a', 'offers': [{
+    ...     'seller': {'name': 'Digi-Key'}, 'sku': 'A-ND',
+    ...     'in_stock_quantity': 10, 'moq': 1,
+    ...     'prices': {'USD': [[1, '0.50'], [10, '0.40']]}}]}])
+    >>> len(table.in_stock().currency('USD').at_quantity(10))
+    1
+    """
+
+    def __init__(self, columns: t.Dict[str, 'np.ndarray']) -> None:
+        if np is None:
+            raise ImportError(
+                "OfferTable requires numpy. "
+                "Install it with 'pip install octopart[tables]'.")
+        missing = set(OFFER_COLUMNS) - set(columns)
+        if missing:
+            raise ValueError('Missing columns: %s' % sorted(missing))
+        self.columns = {name: columns[name] for name in OFFER_COLUMNS}
+
+    @classmethod
+    def from_parts(cls, parts: t.Iterable[dict]) -> 'OfferTable':
+        """
+        Build a table from raw part dicts, as found in API responses, in a
+        single pass over their offers.
+        """
+        # values of each offer, stored once and spread over its breaks
+        # below
+        uids: t.List[str] = []
+        sellers: t.List[str] = []
+        skus: t.List[str] = []
+        stocks: t.List[int] = []
+        moqs: t.List[int] = []
+        # values of each price break
+        offer_indices: t.List[int] = []
+        currencies: t.List[str] = []
+        quantities: t.List[int] = []
+        prices: t.List[str] = []
+        for part in parts:
+            uid = part.get('uid', '')
+            for offer in part.get('offers') or ():
+                offer_index = len(uids)
+                uids.append(uid)
+                sellers.append((offer.get('seller') or {}).get('name', ''))
+                skus.append(offer.get('sku') or '')
+                stocks.append(_quantity(offer.get('in_stock_quantity')))
+                moqs.append(_quantity(offer.get('moq')))
+                for currency, breaks in (offer.get('prices') or {}).items():
+                    if not breaks:
+                        continue
+                    break_quantities, break_prices = zip(*breaks)
+                    quantities.extend(break_quantities)
+                    prices.extend(break_prices)
+                    offer_indices.extend([offer_index] * len(breaks))
+                    currencies.extend([currency] * len(breaks))
+
+        if np is None:
+            raise ImportError(
+                "OfferTable requires numpy. "
+                "Install it with 'pip install octopart[tables]'.")
+        offer = np.array(offer_indices, dtype=np.int64)
+        return cls({
+            'part_uid': np.array(uids, dtype=str)[offer],
+            'offer': offer,
+            'seller': np.array(sellers, dtype=str)[offer],
+            'sku': np.array(skus, dtype=str)[offer],
+            'currency': np.array(currencies, dtype=str),
+            'quantity': np.array(quantities, dtype=np.int64),
+            # prices come as decimal strings
+            'unit_price': np.array(prices, dtype=np.float64),
+            'in_stock_quantity': np.array(stocks, dtype=np.int64)[offer],
+            'moq': np.array(moqs, dtype=np.int64)[offer],
+        })
+
+    @classmethod
+    def from_rows(cls, rows: t.Dict[str, list]) -> 'OfferTable':
+        """Build a table from {column: list of values} dict"""
+        if np is None:
+            raise ImportError(
+                "OfferTable requires numpy. "
+                "Install it with 'pip install octopart[tables]'.")
+        strings = ('part_uid', 'seller', 'sku', 'currency')
+        columns = {
+            name: np.array(rows[name], dtype=str) for name in strings}
+        columns['offer'] = np.array(rows['offer'], dtype=np.int64)
+        columns['quantity'] = np.array(rows['quantity'], dtype=np.int64)
+        # prices come as decimal strings
+        columns['unit_price'] = np.array(
+            rows['unit_price'], dtype=np.float64)
+        columns['in_stock_quantity'] = np.array(
+            rows['in_stock_quantity'], dtype=np.int64)
+        columns['moq'] = np.array(rows['moq'], dtype=np.int64)
+        return cls(columns)
+
+    def __len__(self):
+        return len(self.columns['part_uid'])
+
+    def __getitem__(self, column: str) -> 'np.ndarray':
+        return self.columns[column]
+
+    def __repr__(self):
+        return '<OfferTable rows=%s parts=%s>' % (
+            len(self), len(np.unique(self.columns['part_uid'])))
+
+    def filter(self, mask: 'np.ndarray') -> 'OfferTable':
+        """Rows where the boolean array `mask` is true"""
+        return OfferTable({
+            name: column[mask] for name, column in self.columns.items()})
+
+    def in_stock(self, quantity: int = 1) -> 'OfferTable':
+        """Rows of offers with at least `quantity` in stock"""
+        return self.filter(self.columns['in_stock_quantity'] >= quantity)
+
+    def sellers(self, names: t.Iterable[str]) -> 'OfferTable':
+        """Rows of offers by any of the sellers `names`"""
+        return self.filter(np.isin(self.columns['seller'], list(names)))
+
+    def currency(self, currency: str) -> 'OfferTable':
+        """Rows priced in `currency`, e.g. 'USD'"""
+        return self.filter(self.columns['currency'] == currency)
+
+    def at_quantity(self, quantity: int) -> 'OfferTable':
+        """
+        The price break that applies when buying `quantity` of each offer:
+        per offer and currency, the row with the largest break quantity not
+        above `quantity`. Offers whose MOQ is above `quantity` are dropped.
+        """
+        columns = self.columns
+        eligible = self.filter(
+            (columns['quantity'] <= quantity) & (columns['moq'] <= quantity))
+        columns = eligible.columns
+        if not len(eligible):
+            return eligible
+        # sort by offer, then by break quantity; the last row of each offer
+        # is the applicable break
+        order = np.lexsort((
+            columns['quantity'], columns['currency'], columns['offer']))
+        last = np.zeros(len(order), dtype=bool)
+        last[-1] = True
+        for name in ('offer', 'currency'):
+            key = columns[name][order]
+            last[:-1] |= key[1:] != key[:-1]
+        return eligible.filter(order[last])
+
+    def min_by_part(self, column: str = 'unit_price') -> t.Dict[str, t.Any]:
+        """{part uid: minimum of `column`} dict"""
+        if not len(self):
+            return {}
+        uids, inverse = np.unique(
+            self.columns['part_uid'], return_inverse=True)
+        values = self.columns[column]
+        minimums = np.full(len(uids), np.inf)
+        np.minimum.at(minimums, inverse, values)
+        return dict(zip(uids.tolist(), minimums.astype(values.dtype).tolist()))
+
+    def cheapest_by_part(self) -> 'OfferTable':
+        """The row with the lowest unit price of each part"""
+        if not len(self):
+            return self
+        order = np.lexsort(
+            (self.columns['unit_price'], self.columns['part_uid']))
+        uids = self.columns['part_uid'][order]
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = uids[1:] != uids[:-1]
+        return self.filter(order[first])
@@ -0,0 +1,101 @@
+"""
+Compressed transfer of responses, and accounting of the bytes it saves.
+
+Octopart responses are verbose JSON with heavily repeated keys, and shrink
+several times when compressed. `OctopartClient` asks for every encoding its
+HTTP stack can decode (`ACCEPT_ENCODING`): gzip and deflate always, brotli
+once `brotli` is installed (`pip install octopart[brotli]`). urllib3 decodes
+responses chunk by chunk as they are read, so a compressed body is never
+held in memory as a whole, also when streamed (see `streaming`).
+
+`TransferStats` counts, per endpoint, the bytes received on the wire and the
+bytes they decoded to.
+"""
+
+import threading
+import typing as t
+
+from urllib3.util import make_headers
+
+# Encodings urllib3 can decode with the libraries installed, e.g.
+# 'gzip,deflate,br'
+ACCEPT_ENCODING = make_headers(accept_encoding=True)['accept-encoding']
+
+
+def wire_bytes_read(response, body_bytes: int) -> int:
+    """
+    Bytes of the body of a `requests.Response` received on the wire so far,
+    which decoded to `body_bytes`.
+    """
+    tell = getattr(response.raw, 'tell', None)
+    # responses that were not read from a socket count as not compressed
+    return tell() if tell is not None else body_bytes
+
+
+class TransferStats(object):
+    """Thread-safe count of the bytes received per endpoint
+
+    Counters, per endpoint name (see `utils.endpoint_from_path`):
+        responses: number of response bodies received
+        wire_bytes: bytes received, as sent by the server: compressed, if
+            the server compressed the response
+        body_bytes: bytes the responses decoded to
+
+    >>> stats = TransferStats()
+    >>> stats.record('parts.match', wire_bytes=1200, body_bytes=9600)
+    >>> stats.saved_bytes(), round(stats.compression_ratio(), 2)
+    (8400, 0.12)
+    """
+
+    def __init__(self) -> None:
+        self._counters: t.Dict[str, t.Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, endpoint: str, wire_bytes: int, body_bytes: int) -> None:
+        with self._lock:
+            counters = self._counters.get(endpoint)
+            if counters is None:
+                counters = self._counters[endpoint] = {
+                    'responses': 0, 'wire_bytes': 0, 'body_bytes': 0}
+            counters['responses'] += 1
+            counters['wire_bytes'] += wire_bytes
+            counters['body_bytes'] += body_bytes
+
+    def snapshot(self) -> t.Dict[str, t.Dict[str, int]]:
+        """{endpoint: counters} dict, e.g. for metrics"""
+        with self._lock:
+            return {
+                endpoint: dict(counters)
+                for endpoint, counters in self._counters.items()}
+
+    def _total(self, name: str, endpoint: t.Optional[str]) -> int:
+        snapshot = self.snapshot()
+        if endpoint is not None:
+            return snapshot.get(endpoint, {}).get(name, 0)
+        return sum(counters[name] for counters in snapshot.values())
+
+    def saved_bytes(self, endpoint: t.Optional[str] = None) -> int:
+        """
+        Bytes compression saved for `endpoint`, or for all endpoints if
+        None
+        """
+        return (self._total('body_bytes', endpoint)
+                - self._total('wire_bytes', endpoint))
+
+    def compression_ratio(self, endpoint: t.Optional[str] = None) -> float:
+        """
+        Wire bytes per decoded byte for `endpoint`, or for all endpoints if
+        None: 1.0 when nothing was compressed.
+        """
+        body_bytes = self._total('body_bytes', endpoint)
+        if not body_bytes:
+            return 1.0
+        return self._total('wire_bytes', endpoint) / body_bytes
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+
+    def __repr__(self):
+        return '<TransferStats wire_bytes=%s body_bytes=%s>' % (
+            self._total('wire_bytes', None), self._total('body_bytes', None))
@@ -0,0 +1,322 @@
+"""
+Recording and replay of API traffic, for offline benchmarks and load tests.
+
+`OctopartClient` sends all requests through one `requests` transport
+adapter, which may be replaced with its `transport` argument:
+
+- `RecordingAdapter` sends requests to the API as usual, and appends each
+  request and its response to a `TrafficArchive`.
+- `ReplayAdapter` answers requests from an archive, without any network
+  access. It can inject latency, server errors and throttling (429 with
+  `Retry-After`), all seeded, so that retries, hedging, rate limiting and
+  the other performance features can be measured offline and repeatably.
+
+Archives are gzip-compressed JSON lines files, one line per response. The
+API key is never written to them: requests are matched by method, path and
+query parameters other than `apikey`, regardless of parameter order.
+"""
+
+import base64
+import collections
+import gzip
+import http.client
+import io
+import json
+import logging
+import os
+import random
+import threading
+import time
+import typing as t
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3 import HTTPResponse
+
+from octopart.ratelimit import Throttle
+
+logger = logging.getLogger(__name__)
+
+# Query parameters left out of archives and request keys
+SECRET_PARAMS = frozenset(['apikey'])
+
+# Response headers that describe the body as it was sent, not as recorded
+_TRANSFER_HEADERS = frozenset(
+    ['content-encoding', 'content-length', 'transfer-encoding'])
+
+
+def strip_secrets(url: str) -> str:
+    """
+    `url` without its secret query parameters
+
+    >>> strip_secrets('https://octopart.com/api/v3/parts/abc?apikey=x&b=1')
+    'https://octopart.com/api/v3/parts/abc?b=1'
+    """
+    parts = urlsplit(url)
+    query = [
+        (name, value)
+        for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if name not in SECRET_PARAMS]
+    return parts._replace(query=urlencode(query)).geturl()
+
+
+def request_key(method: str, url: str) -> str:
+    """
+    Key that identifies a request in an archive: its method, path, and
+    sorted query parameters without secrets.
+
+    >>> request_key('GET', 'https://octopart.com/api/v3/a?z=1&apikey=x&b=2')
+    'GET /api/v3/a?b=2&z=1'
+    """
+    parts = urlsplit(url)
+    query = sorted(
+        (name, value)
+        for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if name not in SECRET_PARAMS)
+    return '%s %s?%s' % (method, parts.path, urlencode(query))
+
+
+class TrafficArchive(object):
+    """Request/response pairs in a gzip-compressed JSON lines file
+
+    Each entry is a dict with the request's `key`, `method` and `url`
+    (without secrets), and the response's `status`, `headers`, `body` (text,
+    or `body_base64` if it is not UTF-8) and `elapsed` seconds. Bodies are
+    stored decoded, whatever encoding they were sent with.
+
+    Appending is thread-safe. The file stays open for appending, with one
+    compression context for all entries, until `close` is called or the
+    archive is used as a context manager. An archive may be appended to over
+    several sessions, each adding a gzip member; readers see one stream.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._writer: t.Optional[t.TextIO] = None
+
+    def append(self, entry: t.Dict[str, t.Any]) -> None:
+        line = json.dumps(entry, sort_keys=True) + '\n'
+        with self._lock:
+            if self._writer is None:
+                self._writer = gzip.open(self.path, 'at', encoding='utf-8')
+            self._writer.write(line)
+
+    def close(self) -> None:
+        """Finish the file; appending again starts a new gzip member."""
+        with self._lock:
+            writer, self._writer = self._writer, None
+        if writer is not None:
+            writer.close()
+
+    def __enter__(self) -> 'TrafficArchive':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __iter__(self) -> t.Iterator[t.Dict[str, t.Any]]:
+        # entries still being written are only readable once finished
+        self.close()
+        if not os.path.exists(self.path):
+            return
+        with gzip.open(self.path, 'rt', encoding='utf-8') as file:
+            for line in file:
+                yield json.loads(line)
+
+    def __repr__(self):
+        return '<TrafficArchive path=%s>' % self.path
+
+
+def entry_from_response(response: requests.Response,
+                        elapsed: t.Optional[float] = None,
+                        ) -> t.Dict[str, t.Any]:
+    """
+    Archive entry for a response, reading its whole body. `elapsed` is the
+    seconds the response took; it defaults to `response.elapsed`, which
+    `requests` only sets once the transport adapter has returned.
+    """
+    if elapsed is None:
+        elapsed = response.elapsed.total_seconds()
+    method = response.request.method or 'GET'
+    url = response.request.url or ''
+    entry: t.Dict[str, t.Any] = {
+        'key': request_key(method, url),
+        'method': method,
+        'url': strip_secrets(url),
+        'status': response.status_code,
+        'headers': {
+            name: value for name, value in response.headers.items()
+            if name.lower() not in _TRANSFER_HEADERS},
+        'elapsed': elapsed,
+    }
+    try:
+        entry['body'] = response.content.decode('utf-8')
+    except UnicodeDecodeError:
+        entry['body_base64'] = base64.b64encode(
+            response.content).decode('ascii')
+    return entry
+
+
+def _entry_body(entry: t.Dict[str, t.Any]) -> bytes:
+    if 'body_base64' in entry:
+        return base64.b64decode(entry['body_base64'])
+    return entry.get('body', '').encode('utf-8')
+
+
+class RecordingAdapter(HTTPAdapter):
+    """Transport that sends requests, and records them to an archive
+
+    Close the archive once done recording, to finish its file. Bodies are
+    read in full before they are returned, so responses requested with
+    `stream=True` are no longer streamed while recording.
+    """
+
+    def __init__(self, archive: TrafficArchive, **kwargs) -> None:
+        """
+        Args:
+            archive (TrafficArchive): where to append responses
+
+        Kwargs:
+            passed on to `HTTPAdapter`, e.g. `pool_maxsize`
+        """
+        super().__init__(**kwargs)
+        self.archive = archive
+        self.recorded = 0
+
+    def send(self, request, **kwargs):
+        # `response.elapsed` is only set by the session, after this returns
+        start = time.perf_counter()
+        response = super().send(request, **kwargs)
+        elapsed = time.perf_counter() - start
+        self.archive.append(entry_from_response(response, elapsed))
+        self.recorded += 1
+        return response
+
+
+class ReplayAdapter(HTTPAdapter):
+    """Transport that answers requests from an archive
+
+    A request recorded several times is answered with each of its recorded
+    responses in turn. Requests that are not in the archive get a 404.
+    Faults are injected in this order, from a random generator seeded with
+    `seed`:
+
+    - with `rate`, requests beyond `burst` requests at once and then `rate`
+      per second get a 429 with a `Retry-After` header;
+    - a share `error_rate` of the other requests gets `error_status`;
+    - every response is delayed by `latency` seconds, plus the recorded
+      time the response took with `recorded_latency`.
+
+    Counters:
+        replayed: requests answered with a recorded response
+        missing: requests not found in the archive
+        errors: injected server errors
+        throttled: requests answered with a 429
+    """
+
+    def __init__(self,
+                 archive: t.Union[TrafficArchive, t.Iterable[dict]],
+                 latency: t.Union[float, t.Callable[[], float]] = 0.0,
+                 recorded_latency: bool = False,
+                 error_rate: float = 0.0,
+                 error_status: int = 503,
+                 rate: t.Optional[float] = None,
+                 burst: t.Optional[int] = None,
+                 seed: t.Optional[int] = None,
+                 ) -> None:
+        """
+        Args:
+            archive: a `TrafficArchive`, or any iterable of its entries
+
+        Kwargs:
+            latency (float): seconds added to each response, or a function
+                returning them, e.g. `lambda: random.expovariate(20)`
+            recorded_latency (bool): also wait for as long as each response
+                took when it was recorded
+            error_rate (float): share of requests answered with
+                `error_status`, between 0 and 1
+            error_status (int): HTTP status of injected errors
+            rate (float), burst (int): limits of the `ratelimit.Throttle`
+                beyond which requests get a 429. None to never throttle.
+            seed (int): seed of the fault injection
+        """
+        if not 0 <= error_rate <= 1:
+            raise ValueError(
+                'Expected 0 <= error_rate <= 1. Saw: %s' % error_rate)
+        super().__init__()
+        self.latency = latency
+        self.recorded_latency = recorded_latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.throttle = Throttle(rate, burst) if rate is not None else None
+
+        self.replayed = 0
+        self.missing = 0
+        self.errors = 0
+        self.throttled = 0
+
+        self._entries: t.Dict[str, t.List[dict]] = collections.defaultdict(
+            list)
+        for entry in archive:
+            self._entries[entry['key']].append(entry)
+        self._replays: t.Dict[str, int] = collections.Counter()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        """Number of distinct requests in the archive"""
+        return len(self._entries)
+
+    def __repr__(self):
+        return '<ReplayAdapter requests=%s replayed=%s>' % (
+            len(self), self.replayed)
+
+    def send(self, request, stream=False, timeout=None, verify=True,
+             cert=None, proxies=None):
+        key = request_key(request.method, request.url)
+        with self._lock:
+            status, headers, body, elapsed = self._pick(key)
+        delay = self.latency() if callable(self.latency) else self.latency
+        if self.recorded_latency:
+            delay += elapsed
+        if delay > 0:
+            time.sleep(delay)
+
+        raw = HTTPResponse(
+            body=io.BytesIO(body),
+            headers=headers,
+            status=status,
+            reason=http.client.responses.get(status, ''),
+            preload_content=False,
+            decode_content=False)
+        response = self.build_response(request, raw)
+        if not stream:
+            # read the body, as `HTTPAdapter` does
+            response.content
+        return response
+
+    def _pick(self, key: str) -> t.Tuple[int, dict, bytes, float]:
+        """(status, headers, body, recorded seconds) to answer `key` with"""
+        if self.throttle is not None:
+            retry_after = self.throttle.take()
+            if retry_after is not None:
+                self.throttled += 1
+                return 429, {'Retry-After': '%.3f' % retry_after}, b'', 0.0
+        if self.error_rate and self._random.random() < self.error_rate:
+            self.errors += 1
+            return self.error_status, {}, b'', 0.0
+
+        entries = self._entries.get(key)
+        if not entries:
+            self.missing += 1
+            logger.warning('No recorded response for %s', key)
+            body = json.dumps({
+                'message': 'No recorded response for %s' % key}).encode()
+            return 404, {'Content-Type': 'application/json'}, body, 0.0
+        entry = entries[self._replays[key] % len(entries)]
+        self._replays[key] += 1
+        self.replayed += 1
+        return (entry['status'], entry['headers'], _entry_body(entry),
+                entry.get('elapsed', 0.0))
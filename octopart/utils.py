@@ -2,8 +2,9 @@ import collections
 import itertools
 import json
 import logging
-from typing import List, Tuple
-from urllib.parse import urlencode
+import re
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Tuple
+from urllib.parse import quote_plus, urlencode
 
 from .exceptions import OctopartTypeError
 
@@ -13,6 +14,27 @@ logger = logging.getLogger(__name__)
 
 URL_MAX_LENGTH = 8000
 
+# Octopart enforces that its 'parts/match' endpoint take no more than 20
+# queries in a single request.
+MAX_QUERIES_PER_REQUEST = 20
+
+# Cap on the UIDs of a single 'get_multi' request, besides the URL length.
+MAX_UIDS_PER_REQUEST = 100
+
+# Octopart's search endpoints return at most 100 results per request, and
+# only the first 1000 hits of a search can be paged through.
+MAX_SEARCH_LIMIT = 100
+MAX_SEARCH_HITS = 1000
+
+# Characters that `urllib.parse.quote_plus` escapes as '%XX'. It keeps
+# letters, digits and '_.-~', and turns spaces into '+'.
+_URL_ESCAPED_CHARS = re.compile(r'[^A-Za-z0-9_.\-~ ]')
+
+# Encoded length of the 'queries' parameter around its queries
+# ('queries=%5B' ... '%5D'), and between two of them ('%2C+').
+QUERIES_PARAM_OVERHEAD = len(urlencode({'queries': '[]'}))
+QUERY_SEPARATOR_LENGTH = len(quote_plus(', '))
+
 
 def chunked(list_: List, chunksize: int=20) -> List[List]:
     """
@@ -34,7 +56,7 @@ def chunked(list_: List, chunksize: int=20) -> List[List]:
     return chunks
 
 
-def chunk_queries(queries: List) -> List[List]:
+def chunk_queries(queries: Iterable[Dict[str, Any]]) -> List[List]:
     """
     Partitions list into chunks, and ensures that each chunk is small enough
     to not trigger an HTTP 414 error (Request URI Too Large).
@@ -45,11 +67,77 @@ def chunk_queries(queries: List) -> List[List]:
     Returns:
         list
     """
-    chunks: List[List] = []
-    # Octopart can only handle 20 queries per request, so split into chunks.
-    for chunk in chunked(queries):
-        chunks.extend(split_chunk(chunk))
-    return chunks
+    return list(iter_chunks(queries))
+
+
+def iter_chunks(queries: Iterable[Dict[str, Any]],
+                max_queries: int = MAX_QUERIES_PER_REQUEST,
+                max_length: int = URL_MAX_LENGTH,
+                ) -> Iterator[List]:
+    """
+    Lazily pack queries into as few chunks as possible, in their original
+    order. A chunk is closed as soon as adding the next query would exceed
+    `max_queries` queries, or an encoded 'queries' parameter of `max_length`.
+    A single query that is longer than `max_length` on its own gets a chunk of
+    its own.
+
+    Each query is encoded exactly once, so planning takes linear time.
+
+    >>> list(iter_chunks(['A', 'B', 'C', 'D', 'E'], max_queries=2))
+    [['A', 'B'], ['C', 'D'], ['E']]
+    >>> [len(c) for c in iter_chunks(
+    ...     [{'mpn': 'A' * 60}, {'mpn': 'B'}, {'mpn': 'C'}], max_length=100)]
+    [1, 2]
+    """
+    return _pack(
+        queries, encoded_query_length, QUERIES_PARAM_OVERHEAD,
+        QUERY_SEPARATOR_LENGTH, max_queries, max_length)
+
+
+def iter_uid_chunks(uids: Iterable[str],
+                    max_uids: int = MAX_UIDS_PER_REQUEST,
+                    max_length: int = URL_MAX_LENGTH,
+                    ) -> Iterator[List[str]]:
+    """
+    Lazily pack UIDs into as few chunks as possible for 'get_multi' requests,
+    which take each UID as a separate 'uid[]' parameter. Same as
+    `iter_chunks`, but bounded by `max_uids` UIDs per chunk.
+
+    >>> [len(chunk) for chunk in iter_uid_chunks(
+    ...     ['%016x' % i for i in range(10)], max_length=100)]
+    [3, 3, 3, 1]
+    """
+    return _pack(uids, encoded_uid_length, 0, 1, max_uids, max_length)
+
+
+def _pack(items: Iterable,
+          item_length: Callable[[Any], int],
+          overhead: int,
+          separator_length: int,
+          max_items: int,
+          max_length: int,
+          ) -> Iterator[List]:
+    """
+    Greedily pack `items` into chunks of at most `max_items` items whose
+    encoded length, `overhead` plus the length of each item plus
+    `separator_length` between two items, is at most `max_length`.
+    """
+    chunk: List = []
+    length = overhead
+    for item in items:
+        length_added = item_length(item)
+        if chunk:
+            length_added += separator_length
+            if (len(chunk) >= max_items
+                    or length + length_added > max_length):
+                yield chunk
+                chunk = []
+                length = overhead
+                length_added -= separator_length
+        chunk.append(item)
+        length += length_added
+    if chunk:
+        yield chunk
 
 
 def split_chunk(chunk: List) -> List[List]:
@@ -63,15 +151,50 @@ def split_chunk(chunk: List) -> List[List]:
     Returns:
         list of chunks
     """
-    encoded = urlencode({'queries': json.dumps(chunk)})
-    if len(encoded) > URL_MAX_LENGTH:
-        # Split chunk in half to avoid HTTP 414 error.
-        mid = len(chunk) // 2
-        left, right = chunk[:mid], chunk[mid:]
-        # Recurse in case either half is still too long.
-        return flatten([split_chunk(left), split_chunk(right)])
-    else:
-        return [chunk]
+    return list(iter_chunks(chunk, max_queries=len(chunk) or 1))
+
+
+def encoded_query_length(query: Dict[str, Any]) -> int:
+    """
+    Length that a single query adds to the URL-encoded 'queries' parameter.
+    Since URL encoding works character by character, the encoded length of a
+    whole chunk is the sum of its queries' lengths plus separators:
+
+    >>> chunk = [{'mpn': 'A B'}, {'sku': 'C#1/ü'}]
+    >>> len(urlencode({'queries': json.dumps(chunk)})) == (
+    ...     QUERIES_PARAM_OVERHEAD + QUERY_SEPARATOR_LENGTH
+    ...     + sum(encoded_query_length(query) for query in chunk))
+    True
+    """
+    # `json.dumps` escapes all non-ASCII characters, and URL encoding turns
+    # every ASCII character outside its safe set into a 3-character '%XX'
+    # escape, so there is no need to actually encode the string.
+    encoded = json.dumps(query)
+    return len(encoded) + 2 * len(_URL_ESCAPED_CHARS.findall(encoded))
+
+
+def encoded_uid_length(uid: str) -> int:
+    """
+    Length of a UID's 'uid[]' parameter in a URL, without separators
+
+    >>> encoded_uid_length('eddc25bd5de8321b')
+    26
+    """
+    return len(urlencode({'uid[]': uid}))
+
+
+def iter_pages(start: int,
+               total: int,
+               page_size: int,
+               ) -> Iterator[Tuple[int, int]]:
+    """
+    (start, limit) of the search pages from `start` up to `total` results
+
+    >>> list(iter_pages(10, 25, page_size=10))
+    [(10, 10), (20, 5)]
+    """
+    for page_start in range(start, total, page_size):
+        yield page_start, min(page_size, total - page_start)
 
 
 def flatten(list_of_lists: List[List]) -> List:
@@ -95,6 +218,24 @@ def unique(list_: List) -> List:
     return list(collections.OrderedDict.fromkeys(list_))
 
 
+def endpoint_from_path(path: str) -> str:
+    """Name the Octopart API endpoint that a request path belongs to
+
+    >>> endpoint_from_path('/parts/match')
+    'parts.match'
+    >>> endpoint_from_path('/brands/search')
+    'brands.search'
+    >>> endpoint_from_path('/parts/eddc25bd5de8321b')
+    'parts.get'
+    >>> endpoint_from_path('/categories/get_multi')
+    'categories.get_multi'
+    """
+    resource, _, action = path.strip('/').partition('/')
+    if action in ('match', 'search', 'get_multi'):
+        return f'{resource}.{action}'
+    return f'{resource}.get'
+
+
 def sortby_param_str_from_list(sortby: List[Tuple[str, str]]=None) -> str:
     """Turns a list of tuples into a string for sending as GET parameter
 
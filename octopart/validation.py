@@ -0,0 +1,146 @@
+"""
+Fast validation of query dicts against the schematics query models.
+
+Validating through schematics builds a `Model` instance per query, and
+`BaseModel.is_valid_list` and `errors_list` do so twice for invalid queries.
+A `QueryValidator` compiles a model's fields once into plain converter
+functions, then checks each query in a single pass over its keys, without
+instantiating the model. Values that are already of the field's native type
+take a fast path; anything else goes through the field's own `to_native`, so
+that conversions and error messages are exactly those of schematics.
+"""
+
+import typing as t
+from collections.abc import Mapping
+
+from schematics.exceptions import BaseError, ConversionError
+from schematics.models import Model
+from schematics.types import IntType, StringType
+from schematics.types.compound import DictType
+
+from octopart import models
+
+# Message of schematics for keys that are not fields of the model
+ROGUE_FIELD = 'Rogue field'
+
+_Converter = t.Callable[[t.Any], t.Optional[t.Any]]
+
+
+def _native_type(field) -> t.Optional[type]:
+    """
+    Type whose values `field` accepts as they are, if any. Fields with
+    constraints always go through schematics.
+    """
+    # `validators` starts with the type's built-in ones, which only enforce
+    # the constraints checked here
+    if field.choices or len(field.validators) > len(field._validators):
+        return None
+    if type(field) is StringType and not (
+            field.regex or field.min_length or field.max_length):
+        return str
+    if type(field) is IntType and (
+            field.min_value is None and field.max_value is None):
+        return int
+    return None
+
+
+def _compile_field(field) -> _Converter:
+    """
+    Return a function that returns None if a value converts to `field`,
+    otherwise the error schematics would report for it.
+    """
+    if type(field) is DictType:
+        return _compile_dict_field(field)
+    native_type = _native_type(field)
+
+    def _convert(value):
+        if type(value) is native_type:
+            return None
+        try:
+            native = field.to_native(value)
+            if native_type is None:
+                field.validate(native)
+        except BaseError as exc:
+            return exc
+        return None
+    return _convert
+
+
+def _compile_dict_field(field: DictType) -> _Converter:
+    convert_value = _compile_field(field.field)
+
+    def _convert_dict(value):
+        if not isinstance(value, Mapping):
+            return ConversionError('Only mappings may be used in a DictType')
+        errors = {}
+        for key, item in value.items():
+            if item is None:
+                continue
+            error = convert_value(item)
+            if error is not None:
+                errors[key] = error
+        return errors or None
+    return _convert_dict
+
+
+class QueryValidator(object):
+    """Validates dicts against the fields of a schematics model
+
+    >>> validator = QueryValidator(models.PartsMatchQuery)
+    >>> validator.errors({'mpn': 'ATMEGA328P', 'limit': '5'}) is None
+    True
+    >>> validator.errors({'limit': 'x'})
+    {'limit': ConversionError([ErrorMessage("Value 'x' is not int.", None)])}
+    """
+
+    def __init__(self, model: t.Type[Model]) -> None:
+        fields = model._schema.fields
+        required = [name for name, field in fields.items() if field.required]
+        if required:
+            raise ValueError(
+                'Required fields are not supported. Saw: %s' % required)
+        self.model = model
+        self._converters = {
+            name: _compile_field(field) for name, field in fields.items()}
+
+    def errors(self, dict_: t.Mapping[str, t.Any]) -> t.Optional[dict]:
+        """
+        Same as `BaseModel.errors`: {field: error} dict, with errors as
+        schematics reports them, or None if `dict_` is valid. Rogue fields
+        come first, sorted, where schematics lists them in set order.
+        """
+        converters = self._converters
+        rogue = [key for key in dict_ if key not in converters]
+        errors: t.Dict[str, t.Any] = {
+            key: ROGUE_FIELD for key in sorted(rogue, key=str)}
+        for name, convert in converters.items():
+            value = dict_.get(name)
+            if value is None:
+                continue
+            error = convert(value)
+            if error is not None:
+                errors[name] = error
+        return errors or None
+
+    def errors_list(self, list_: t.Iterable[t.Mapping[str, t.Any]],
+                    ) -> t.Optional[dict]:
+        """
+        Errors of the first invalid dict in `list_`, or None if all are
+        valid. This is what `BaseModel.errors_list` reports, since schematics
+        stops at the first dict that fails to convert.
+        """
+        for dict_ in list_:
+            errors = self.errors(dict_)
+            if errors:
+                return errors
+        return None
+
+    def is_valid(self, dict_: t.Mapping[str, t.Any]) -> bool:
+        return not self.errors(dict_)
+
+    def __repr__(self):
+        return '<QueryValidator model=%s>' % self.model.__name__
+
+
+match_query_validator = QueryValidator(models.PartsMatchQuery)
+search_query_validator = QueryValidator(models.PartsSearchQuery)
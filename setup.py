@@ -25,5 +25,11 @@ setuptools.setup(
         'retrying>=1.3.3',
         'schematics>=2.0.1',
     ],
+    extras_require={
+        'async': ['aiohttp>=3.0'],
+        'brotli': ['brotli'],
+        'fast': ['orjson'],
+        'tables': ['numpy>=1.13'],
+    },
     tests_require=['pytest>=3.1.0'],
 )
@@ -1,11 +1,21 @@
+import json
 import os
 import re
+import signal
+import threading
+import time
 from unittest import TestCase
+from unittest.mock import patch
+from urllib.parse import parse_qs, urlsplit
 
+import pytest
 import responses
 
-from octopart import api, models
+from octopart import api, models, utils
 from octopart.client import OctopartClient
+from octopart.context import OctopartContext
+from octopart.exceptions import OctopartError
+from octopart.fakeserver import FakeOctopartServer
 
 from . import fixtures
 from .utils import octopart_mock_response
@@ -243,6 +253,25 @@ class PartsTests(TestCase):
                 assert 'Digi-Key' in sellers
                 assert 'Mouser' in sellers
 
+    def test_derived_views_are_memoized(self):
+        result = models.PartsMatchResponse(
+            fixtures.parts_match_response).results[0]
+        assert result.parts is result.parts
+        part = result.parts[0]
+        assert part.offers is part.offers
+        assert part.specs is part.specs
+        offer = part.offers[0]
+        assert offer.prices is offer.prices
+        assert isinstance(models.Part.offers, models.memoized_property)
+
+    def test_wrappers_have_no_instance_dict(self):
+        result = models.PartsMatchResponse(
+            fixtures.parts_match_response).results[0]
+        part = result.parts[0]
+        spec = models.Spec('rohs_status', {'value': 'Compliant'})
+        for wrapper in [result, part, part.offers[0], spec]:
+            assert not hasattr(wrapper, '__dict__')
+
     def test_match_include_directives(self):
         with octopart_mock_response() as rsps:
             api.match(
@@ -394,3 +423,351 @@ class SellerTests(TestCase):
 
             called_url = request_url_from_request_mock(rsps)
             assert '2c3be9310496fffc' in called_url
+
+
+class ContextTests(TestCase):
+    def setUp(self):
+        self.old_octopart_key = os.getenv('OCTOPART_API_KEY', "")
+        os.environ['OCTOPART_API_KEY'] = 'TEST_KEY'
+        api.set_default_context(None)
+
+    def tearDown(self):
+        os.environ['OCTOPART_API_KEY'] = self.old_octopart_key
+        api.get_default_context().close()
+        api.set_default_context(None)
+
+    def test_default_context_reused(self):
+        with octopart_mock_response():
+            api.match(['MPN1'])
+            context = api.get_default_context()
+            client, executor = context.client, context.executor
+            api.match(['MPN2'])
+            api.get_brand('98785972bc7c4fbf')
+
+        assert api.get_default_context() is context
+        assert context.client is client
+        assert context.executor is executor
+
+    def test_injected_context(self):
+        client = OctopartClient(api_key='CONTEXT_KEY')
+        with OctopartContext(client=client, max_workers=2) as context:
+            with octopart_mock_response() as rsps:
+                api.get_seller('2c3be9310496fffc', context=context)
+                called_url = request_url_from_request_mock(rsps)
+        assert 'apikey=CONTEXT_KEY' in called_url
+        assert context.client is client
+
+    @pytest.mark.skipif(not hasattr(os, 'fork'), reason='needs os.fork')
+    def test_default_context_usable_after_fork(self):
+        mpns = ['MPN%s' % i for i in range(45)]
+        with FakeOctopartServer(port=0) as server:
+            api.set_default_context(OctopartContext(
+                max_workers=4, api_key='any', base_url=server.base_url))
+            # start the pool and connections in the parent
+            assert len(api.match(mpns)) == 45
+
+            pid = os.fork()
+            if pid == 0:  # pragma: no cover
+                code = 1
+                try:
+                    signal.alarm(10)
+                    code = 0 if len(api.match(mpns)) == 45 else 1
+                finally:
+                    os._exit(code)
+            _, status = os.waitpid(pid, 0)
+            assert os.WIFEXITED(status) and os.WEXITSTATUS(status) == 0
+            # the parent's context is untouched
+            assert len(api.match(mpns)) == 45
+
+    def test_context_creates_client_lazily(self):
+        context = OctopartContext(max_workers=4, api_key='LAZY_KEY')
+        assert context._client is None
+        assert context.client.api_key == 'LAZY_KEY'
+        adapter = context.client.session.get_adapter(context.client.base_url)
+        assert adapter._pool_maxsize == 4
+        assert context.executor._max_workers == 4
+        context.close()
+
+
+class IterMatchTests(TestCase):
+    def setUp(self):
+        self.client = OctopartClient(api_key='TEST_TOKEN')
+        self.context = OctopartContext(client=self.client, max_workers=4)
+        self.release = threading.Event()
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def tearDown(self):
+        self.release.set()
+        self.context.close()
+
+    def _match(self, queries, **kwargs):
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        if queries[0]['reference'] == 'MPN0':
+            self.release.wait(2)
+        else:
+            time.sleep(0.001)
+        with self.lock:
+            self.in_flight -= 1
+        return {'results': [
+            {'reference': query['reference'], 'hits': 0, 'items': []}
+            for query in queries
+        ]}
+
+    def test_ordered(self):
+        self.release.set()
+        mpns = ['MPN%s' % i for i in range(50)]
+        with patch.object(self.client, 'match', side_effect=self._match):
+            results = list(api.iter_match(
+                mpns, ordered=True, context=self.context))
+        assert [mpn for mpn, _ in results] == mpns
+        assert all(isinstance(result, models.PartsMatchResult)
+                   for _, result in results)
+
+    def test_tagged_with_original_mpn(self):
+        self.release.set()
+        with patch.object(self.client, 'match', side_effect=self._match):
+            results = list(api.iter_match(
+                ['MPN1', 'MPN2'], partial_match=True, context=self.context))
+        assert [(mpn, result.mpn) for mpn, result in results] == [
+            ('MPN1', 'MPN1*'), ('MPN2', 'MPN2*')]
+
+    def test_unordered_yields_completed_chunks_first(self):
+        mpns = ['MPN%s' % i for i in range(40)]
+        with patch.object(self.client, 'match', side_effect=self._match):
+            results = api.iter_match(mpns, context=self.context)
+            # the first chunk is still blocked
+            first_mpn, _ = next(results)
+            self.release.set()
+            rest = [mpn for mpn, _ in results]
+        assert first_mpn == 'MPN20'
+        assert sorted([first_mpn] + rest) == sorted(mpns)
+
+    def test_in_flight_bounded(self):
+        self.release.set()
+        mpns = ['MPN%s' % i for i in range(200)]
+        with patch.object(
+                self.client, 'match', side_effect=self._match) as mock_match:
+            results = api.iter_match(
+                mpns, max_in_flight=2, context=self.context)
+            next(results)
+            assert mock_match.call_count <= 3
+            assert len(list(results)) == 199
+        assert self.max_in_flight <= 2
+
+
+class GetMultiTests(TestCase):
+    def setUp(self):
+        self.client = OctopartClient(api_key='TEST_TOKEN')
+        self.context = OctopartContext(client=self.client, max_workers=4)
+        self.requested_uids = []
+
+    def tearDown(self):
+        self.context.close()
+
+    def _mock_get_multi(self, rsps, body):
+        def _callback(request):
+            query = parse_qs(urlsplit(request.url).query)
+            uids = query['uid[]']
+            self.requested_uids.append(uids)
+            return 200, {}, json.dumps({
+                uid: dict(body, uid=uid) for uid in uids
+            })
+
+        rsps.add_callback(
+            responses.GET,
+            re.compile(r'https://octopart\.com/api/v3/\w+/get_multi'),
+            callback=_callback,
+            content_type='application/json')
+
+    def test_get_parts(self):
+        uids = ['%016x' % i for i in range(250)]
+        with responses.RequestsMock() as rsps:
+            self._mock_get_multi(rsps, fixtures.parts_part_response)
+            parts = api.get_parts(
+                uids + uids[:10], includes=['specs'], context=self.context)
+            assert all(
+                '/parts/get_multi' in call.request.url
+                and 'include%5B%5D=specs' in call.request.url
+                for call in rsps.calls)
+
+        assert sorted(parts) == uids
+        assert isinstance(parts[uids[0]], models.Part)
+        # deduplicated, and batched within the URL length
+        requested = [uid for batch in self.requested_uids for uid in batch]
+        assert sorted(requested) == uids
+        assert len(self.requested_uids) == 3
+
+    def test_get_parts_bad_uid(self):
+        with pytest.raises(OctopartError):
+            api.get_parts(['5c6a91606d4187ad', 'nope'], context=self.context)
+
+    def test_get_categories(self):
+        with responses.RequestsMock() as rsps:
+            self._mock_get_multi(rsps, {'name': 'Resistors'})
+            categories = api.get_categories(
+                ['5c6a91606d4187ad', '7542b8484461ae85'],
+                context=self.context)
+        assert categories['5c6a91606d4187ad'].name == 'Resistors'
+        assert categories['7542b8484461ae85'].uid == '7542b8484461ae85'
+
+    def test_get_brands_and_sellers(self):
+        with responses.RequestsMock() as rsps:
+            self._mock_get_multi(rsps, {'name': 'Newark'})
+            brands = api.get_brands(['98785972bc7c4fbf'], context=self.context)
+            sellers = api.get_sellers(
+                ['2c3be9310496fffc'], context=self.context)
+        assert brands['98785972bc7c4fbf'].name == 'Newark'
+        assert sellers['2c3be9310496fffc'].name == 'Newark'
+        assert self.requested_uids == [
+            ['98785972bc7c4fbf'], ['2c3be9310496fffc']]
+
+    def test_client_batches_sequentially(self):
+        uids = ['%016x' % i for i in range(150)]
+        with responses.RequestsMock() as rsps:
+            self._mock_get_multi(rsps, {'name': 'Newark'})
+            sellers = self.client.get_sellers(uids)
+        assert len(sellers) == 150
+        assert [len(batch) for batch in self.requested_uids] == [100, 50]
+
+
+class IterSearchTests(TestCase):
+    hits = 250
+
+    def setUp(self):
+        self.client = OctopartClient(api_key='TEST_TOKEN')
+        self.context = OctopartContext(client=self.client, max_workers=4)
+        self.pages = []
+
+    def tearDown(self):
+        self.context.close()
+
+    def _mock_search(self, rsps, path='parts/search'):
+        def _callback(request):
+            query = parse_qs(urlsplit(request.url).query)
+            start, limit = int(query['start'][0]), int(query['limit'][0])
+            self.pages.append((start, limit))
+            results = [
+                {'item': {'uid': '%016x' % i, 'mpn': 'MPN%s' % i,
+                          'name': 'Seller %s' % i}}
+                for i in range(start, min(start + limit, self.hits))
+            ]
+            return 200, {}, json.dumps({'hits': self.hits, 'results': results})
+
+        rsps.add_callback(
+            responses.GET, 'https://octopart.com/api/v3/%s' % path,
+            callback=_callback, content_type='application/json')
+
+    def test_iter_search_pages_through_all_hits(self):
+        with responses.RequestsMock() as rsps:
+            self._mock_search(rsps)
+            parts = list(api.iter_search(
+                'resistor', page_size=100, context=self.context))
+        assert [part.mpn for part in parts] == [
+            'MPN%s' % i for i in range(250)]
+        assert all(isinstance(part, models.Part) for part in parts)
+        assert sorted(self.pages) == [(0, 100), (100, 100), (200, 50)]
+
+    def test_iter_search_max_results(self):
+        with responses.RequestsMock() as rsps:
+            self._mock_search(rsps)
+            parts = list(api.iter_search(
+                'resistor', page_size=40, max_results=90,
+                context=self.context))
+        assert len(parts) == 90
+        assert sorted(self.pages) == [(0, 40), (40, 40), (80, 10)]
+
+    def test_iter_search_hit_cap(self):
+        self.hits = 5000
+        with responses.RequestsMock() as rsps:
+            self._mock_search(rsps)
+            parts = list(api.iter_search('resistor', context=self.context))
+        assert len(parts) == utils.MAX_SEARCH_HITS
+        assert max(start for start, _ in self.pages) < utils.MAX_SEARCH_HITS
+
+    def test_iter_search_prefetch_is_bounded(self):
+        with responses.RequestsMock(
+                assert_all_requests_are_fired=False) as rsps:
+            self._mock_search(rsps)
+            parts = api.iter_search(
+                'resistor', page_size=10, prefetch=2, context=self.context)
+            next(parts)
+            # wait for the prefetched pages to come back
+            while len(self.pages) < 3:
+                time.sleep(0.01)
+            time.sleep(0.05)
+            parts.close()
+        assert sorted(self.pages) == [(0, 10), (10, 10), (20, 10)]
+
+    def test_iter_search_without_prefetch(self):
+        with responses.RequestsMock() as rsps:
+            self._mock_search(rsps)
+            parts = list(api.iter_search(
+                'resistor', page_size=100, prefetch=0, context=self.context))
+        assert len(parts) == 250
+        # requested one after the other
+        assert self.pages == [(0, 100), (100, 100), (200, 50)]
+
+    def test_iter_search_bad_prefetch(self):
+        with pytest.raises(ValueError):
+            next(api.iter_search(
+                'resistor', prefetch=-1, context=self.context))
+
+    def test_iter_search_bad_page_size(self):
+        with pytest.raises(ValueError):
+            next(api.iter_search(
+                'resistor', page_size=500, context=self.context))
+
+    def test_iter_search_seller(self):
+        self.hits = 3
+        with responses.RequestsMock() as rsps:
+            self._mock_search(rsps, 'sellers/search')
+            sellers = list(api.iter_search_seller(
+                'digi', page_size=2, context=self.context))
+        assert [seller.name for seller in sellers] == [
+            'Seller 0', 'Seller 1', 'Seller 2']
+        assert all(isinstance(seller, models.Seller) for seller in sellers)
+
+
+class StreamTests(TestCase):
+    """Tests for stream_match() and stream_search()"""
+    def setUp(self):
+        self.client = OctopartClient(api_key='TEST_TOKEN')
+        self.context = OctopartContext(client=self.client, max_workers=2)
+
+    def tearDown(self):
+        self.context.close()
+
+    def test_stream_match(self):
+        def _callback(request):
+            query = parse_qs(urlsplit(request.url).query)
+            results = [
+                {'reference': q['reference'],
+                 'items': [{'mpn': q['mpn_or_sku'], 'offers': []}]}
+                for q in json.loads(query['queries'][0])]
+            return 200, {}, json.dumps({
+                'request': {'queries': []}, 'results': results, 'msec': 1})
+
+        mpns = ['MPN%s' % i for i in range(25)]
+        with responses.RequestsMock() as rsps:
+            rsps.add_callback(
+                responses.GET, 'https://octopart.com/api/v3/parts/match',
+                callback=_callback, content_type='application/json')
+            results = list(api.stream_match(mpns, context=self.context))
+            assert len(rsps.calls) == 2
+        assert [mpn for mpn, _ in results] == mpns
+        assert [result.parts[0].mpn for _, result in results] == mpns
+        assert all(
+            isinstance(result, models.PartsMatchResult)
+            for _, result in results)
+
+    def test_stream_search(self):
+        with octopart_mock_response(fixtures.parts_search_response):
+            parts = list(api.stream_search('resistor', context=self.context))
+        assert [part.uid for part in parts] == [
+            result['item']['uid']
+            for result in fixtures.parts_search_response['results']]
+        assert all(isinstance(part, models.Part) for part in parts)
@@ -0,0 +1,157 @@
+import asyncio
+from unittest import TestCase
+from unittest.mock import patch
+
+import pytest
+
+from octopart import api, models
+from octopart.exceptions import OctopartError
+
+from . import fixtures
+
+aiohttp = pytest.importorskip('aiohttp')
+from aiohttp import web  # noqa: E402
+from aiohttp.test_utils import TestServer  # noqa: E402
+
+from octopart.async_client import AsyncOctopartClient  # noqa: E402
+
+
+class AsyncClientTestCase(TestCase):
+    """Runs an aiohttp app standing in for the Octopart API"""
+    status = 200
+    body = {"results": []}
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.requests = []
+
+        async def handler(request):
+            self.requests.append(request.rel_url)
+            if self.status != 200:
+                return web.Response(status=self.status)
+            return web.json_response(self.body)
+
+        app = web.Application()
+        app.router.add_get('/{tail:.*}', handler)
+        self.server = TestServer(app)
+        self.run_async(self.server.start_server())
+        self.client = AsyncOctopartClient(
+            api_key='TEST_TOKEN', base_url=str(self.server.make_url('')))
+
+    def tearDown(self):
+        self.run_async(self.client.close())
+        self.run_async(self.server.close())
+        self.loop.close()
+
+    def run_async(self, coro):
+        return self.loop.run_until_complete(coro)
+
+
+class AsyncClientTests(AsyncClientTestCase):
+    def test_match(self):
+        response = self.run_async(self.client.match(
+            [{'mpn': 'MPN1'}], exact_only=True, includes=['imagesets']))
+        assert response == {"results": []}
+
+        [url] = self.requests
+        assert url.path == '/parts/match'
+        assert url.query['exact_only'] == 'true'
+        assert url.query.getall('include[]') == ['imagesets']
+        assert url.query['apikey'] == 'TEST_TOKEN'
+
+    def test_malformed_match_query(self):
+        with pytest.raises(OctopartError):
+            self.run_async(self.client.match([{'q': ["not", "a", "string"]}]))
+        assert not self.requests
+
+    def test_get_brand(self):
+        self.run_async(self.client.get_brand('98785972bc7c4fbf'))
+        [url] = self.requests
+        assert url.path == '/brands/98785972bc7c4fbf'
+
+    def test_get_sellers(self):
+        self.body = {'2c3be9310496fffc': {'name': 'Newark'}}
+        sellers = self.run_async(self.client.get_sellers(
+            ['2c3be9310496fffc', '2c3be9310496fffc']))
+        assert sellers == self.body
+        [url] = self.requests
+        assert url.path == '/sellers/get_multi'
+        assert url.query.getall('uid[]') == ['2c3be9310496fffc']
+
+    def test_connection_pool_shared(self):
+        async def _requests():
+            await asyncio.gather(*[
+                self.client.get_seller('2c3be9310496fffc')
+                for _ in range(5)
+            ])
+            return self.client.session
+
+        session = self.run_async(_requests())
+        assert session is self.client.session
+        assert len(self.requests) == 5
+
+    def test_close_drops_loop_bound_state(self):
+        self.run_async(self.client.get_seller('2c3be9310496fffc'))
+        assert self.client._semaphore is not None
+        self.run_async(self.client.close())
+        # a new event loop gets its own session and semaphore
+        assert self.client._session is None
+        assert self.client._semaphore is None
+
+
+class AsyncClientErrorTests(AsyncClientTestCase):
+    status = 503
+
+    @patch('octopart.retries.random')
+    @patch('octopart.retries.time')
+    @patch('octopart.retries.asyncio')
+    def test_error_wrapped_after_retries(
+            self, mock_asyncio, mock_time, mock_random):
+        delays = []
+
+        async def _sleep(delay):
+            delays.append(delay)
+        mock_asyncio.sleep = _sleep
+        mock_random.uniform.side_effect = lambda low, high: high
+        # first attempt fails right away, the second one after 30 seconds
+        mock_time.monotonic.side_effect = [0, 0, 30]
+
+        with pytest.raises(OctopartError) as exc_info:
+            self.run_async(self.client.get_brand('98785972bc7c4fbf'))
+
+        assert str(exc_info.value) == 'ClientResponseError 503'
+        assert len(self.requests) == 2
+        assert delays == [0.2]
+
+
+class AsyncClientNotFoundTests(AsyncClientTestCase):
+    status = 404
+
+    def test_client_error_not_retried(self):
+        with pytest.raises(OctopartError) as exc_info:
+            self.run_async(self.client.get_brand('98785972bc7c4fbf'))
+
+        assert str(exc_info.value) == 'ClientResponseError 404'
+        assert len(self.requests) == 1
+
+
+class AsyncApiTests(AsyncClientTestCase):
+    body = fixtures.parts_match_response
+
+    def test_match_async(self):
+        results = self.run_async(api.match_async(
+            ['MPN%s' % i for i in range(30)], client=self.client))
+        # 30 MPNs are sent in two chunks, each answered with one result
+        assert len(self.requests) == 2
+        assert len(results) == 2
+        assert isinstance(results[0], models.PartsMatchResult)
+        assert results[0].parts[0].mpn == 'RUM001L02T2CL'
+
+    def test_search_async(self):
+        self.body = fixtures.parts_search_response
+        result = self.run_async(
+            api.search_async('resistor', client=self.client))
+        assert isinstance(result, models.PartsSearchResult)
+        assert len(result.parts) == 8
+        [url] = self.requests
+        assert url.query['q'] == 'resistor'
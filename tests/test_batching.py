@@ -0,0 +1,105 @@
+from concurrent.futures import ThreadPoolExecutor
+import json
+import re
+from unittest import TestCase
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+import responses
+
+from octopart.batching import MatchBatcher
+from octopart.client import OctopartClient
+from octopart.exceptions import OctopartError
+
+
+def _echo_match(request):
+    """Answer a /parts/match request with one result per query"""
+    [queries] = parse_qs(urlsplit(request.url).query)['queries']
+    results = [
+        {'hits': 1, 'items': [{'mpn': query['mpn']}],
+         'reference': query['reference']}
+        for query in json.loads(queries)
+    ]
+    return 200, {}, json.dumps({'results': results})
+
+
+class MatchBatcherTests(TestCase):
+    def setUp(self):
+        self.client = OctopartClient(api_key='TEST_TOKEN')
+        self.rsps = responses.RequestsMock()
+        self.rsps.start()
+        self.rsps.add_callback(
+            responses.GET,
+            re.compile(r'https://octopart\.com/api/v3/parts/match.*'),
+            callback=_echo_match,
+            content_type='application/json')
+
+    def tearDown(self):
+        self.rsps.stop(allow_assert=False)
+        self.rsps.reset()
+
+    def test_concurrent_callers_share_requests(self):
+        with MatchBatcher(self.client, linger=0.2) as batcher:
+            with ThreadPoolExecutor(max_workers=10) as pool:
+                results = list(pool.map(
+                    lambda i: batcher.match(
+                        {'mpn': 'MPN%s' % i, 'reference': 'ref%s' % i}),
+                    range(10)))
+
+        assert [r['items'][0]['mpn'] for r in results] == [
+            'MPN%s' % i for i in range(10)]
+        assert [r['reference'] for r in results] == [
+            'ref%s' % i for i in range(10)]
+        assert batcher.queries == 10
+        assert batcher.batches < 10
+        assert len(self.rsps.calls) == batcher.batches
+
+    def test_duplicate_references_routed_to_their_callers(self):
+        with MatchBatcher(self.client, linger=0.2) as batcher:
+            futures = [
+                batcher.submit({'mpn': mpn, 'reference': 'same'})
+                for mpn in ['A', 'B', 'C']]
+            results = [future.result(2) for future in futures]
+        assert [r['items'][0]['mpn'] for r in results] == ['A', 'B', 'C']
+        assert all(r['reference'] == 'same' for r in results)
+
+    def test_batch_size_limit(self):
+        with MatchBatcher(self.client, linger=0.2, max_batch_size=5) as b:
+            futures = [b.submit({'mpn': 'MPN%s' % i}) for i in range(12)]
+            [future.result(2) for future in futures]
+        assert b.batches == 3
+
+    def test_url_length_limit(self):
+        # three of these queries exceed the URL length limit together
+        mpn = 'X' * 3000
+        with MatchBatcher(self.client, linger=0.2) as batcher:
+            futures = [batcher.submit({'mpn': mpn}) for _ in range(3)]
+            [future.result(2) for future in futures]
+        assert batcher.batches == 2
+        for call in self.rsps.calls:
+            assert len(urlsplit(call.request.url).query) < 8100
+
+    def test_cancelled_query_left_out_of_batch(self):
+        with MatchBatcher(self.client, linger=0.2) as batcher:
+            futures = [batcher.submit({'mpn': mpn}) for mpn in 'ABC']
+            assert futures[0].cancel()
+            results = [future.result(2) for future in futures[1:]]
+        assert [r['items'][0]['mpn'] for r in results] == ['B', 'C']
+        assert batcher.queries == 2
+
+    def test_malformed_query_rejected_immediately(self):
+        with MatchBatcher(self.client) as batcher:
+            with pytest.raises(OctopartError):
+                batcher.submit({'q': ['not', 'a', 'string']})
+        assert batcher.batches == 0
+
+    def test_request_error_propagated(self):
+        self.rsps.reset()
+        self.rsps.add(
+            responses.GET,
+            re.compile(r'https://octopart\.com/api/v3/parts/match.*'),
+            body=OctopartError('HTTPError 500'))
+        with MatchBatcher(self.client) as batcher:
+            future = batcher.submit({'mpn': 'MPN1'})
+            with pytest.raises(OctopartError):
+                future.result(2)
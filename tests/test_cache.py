@@ -0,0 +1,203 @@
+from concurrent.futures import ThreadPoolExecutor
+import multiprocessing
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+from octopart.cache import MemoryCache, SQLiteCache, cache_key
+from octopart.client import OctopartClient
+
+from .utils import octopart_mock_response
+
+
+def _share_cache(path, worker, workers, barrier, results):
+    # runs in a separate process: every worker opens the fresh file at once
+    barrier.wait()
+    cache = SQLiteCache(path, vacuum_interval=None)
+    try:
+        for i in range(20):
+            cache.set('brands.get', '%s-%s' % (worker, i), {'uid': i})
+        barrier.wait()
+        seen = sum(
+            cache.get('brands.get', '%s-%s' % (other, i)) == {'uid': i}
+            for other in range(workers) for i in range(20))
+        results.put((worker, seen))
+    finally:
+        cache.close()
+
+
+class CacheKeyTests(TestCase):
+    def test_params_normalized(self):
+        key = cache_key(
+            '/parts/abc', {'include[]': ['a', 'b'], 'show[]': ['c']})
+        assert key == cache_key(
+            '/parts/abc', {'show[]': ['c'], 'include[]': ['b', 'a']})
+
+    def test_paths_distinguished(self):
+        assert cache_key('/brands/abc', {}) != cache_key('/sellers/abc', {})
+
+
+class MemoryCacheTests(TestCase):
+    def test_get_set(self):
+        cache = MemoryCache()
+        assert cache.get('brands.get', 'key') is None
+        cache.set('brands.get', 'key', {'name': 'Newark'})
+        assert cache.get('brands.get', 'key') == {'name': 'Newark'}
+
+        assert cache.stats.for_endpoint('brands.get') == {
+            'hits': 1, 'misses': 1, 'evictions': 0}
+        assert cache.stats.hit_rate == 0.5
+
+    def test_endpoint_without_ttl_not_stored(self):
+        cache = MemoryCache()
+        cache.set('parts.match', 'key', {'results': []})
+        assert len(cache) == 0
+
+    @patch('octopart.cache.time')
+    def test_per_endpoint_ttl(self, mock_time):
+        cache = MemoryCache(ttls={'brands.get': 100, 'parts.get': 10})
+        mock_time.monotonic.return_value = 0
+        cache.set('brands.get', 'brand', {'uid': 'brand'})
+        cache.set('parts.get', 'part', {'uid': 'part'})
+
+        mock_time.monotonic.return_value = 50
+        assert cache.get('parts.get', 'part') is None
+        assert cache.get('brands.get', 'brand') == {'uid': 'brand'}
+
+        mock_time.monotonic.return_value = 100
+        assert cache.get('brands.get', 'brand') is None
+        assert len(cache) == 0
+
+    def test_lru_eviction_by_size(self):
+        value = {'uid': 'x' * 80}  # encodes to 91 bytes
+        cache = MemoryCache(max_bytes=200)
+        cache.set('brands.get', 'a', value)
+        cache.set('brands.get', 'b', value)
+        # touch 'a', so that 'b' is the least recently used entry
+        cache.get('brands.get', 'a')
+        cache.set('brands.get', 'c', value)
+
+        assert cache.get('brands.get', 'b') is None
+        assert cache.get('brands.get', 'a') == value
+        assert cache.get('brands.get', 'c') == value
+        assert cache.current_bytes == 182
+        assert cache.stats.evictions == 1
+
+
+class SQLiteCacheTests(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'cache.sqlite')
+        self.cache = SQLiteCache(self.path, vacuum_interval=None)
+
+    def tearDown(self):
+        self.cache.close()
+        shutil.rmtree(self.tmpdir)
+
+    def test_nothing_opened_until_used(self):
+        assert not os.path.exists(self.path)
+        assert self.cache.get('brands.get', 'key') is None
+        assert os.path.exists(self.path)
+
+    def test_persists_across_instances(self):
+        self.cache.set('brands.get', 'key', {'name': 'Newark'})
+        self.cache.close()
+
+        reopened = SQLiteCache(self.path, vacuum_interval=None)
+        try:
+            assert reopened.get('brands.get', 'key') == {'name': 'Newark'}
+            assert reopened.stats.hits == 1
+        finally:
+            reopened.close()
+
+    @patch('octopart.cache.time')
+    def test_expiry_and_vacuum(self, mock_time):
+        mock_time.time.return_value = 1000
+        self.cache.set('parts.get', 'part', {'uid': 'part'})
+        self.cache.set('brands.get', 'brand', {'uid': 'brand'})
+
+        mock_time.time.return_value = 1000 + 5 * 60
+        assert self.cache.get('parts.get', 'part') is None
+        assert self.cache.get('brands.get', 'brand') == {'uid': 'brand'}
+        assert self.cache.vacuum() == 1
+
+    def test_concurrent_threads(self):
+        def _roundtrip(i):
+            key = 'key%s' % i
+            self.cache.set('brands.get', key, {'uid': i})
+            return self.cache.get('brands.get', key)
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(_roundtrip, range(50)))
+        assert results == [{'uid': i} for i in range(50)]
+
+    def test_concurrent_processes(self):
+        workers = 6
+        barrier = multiprocessing.Barrier(workers, timeout=10)
+        results = multiprocessing.Queue()
+        processes = [
+            multiprocessing.Process(
+                target=_share_cache,
+                args=(self.path, worker, workers, barrier, results))
+            for worker in range(workers)]
+        for process in processes:
+            process.start()
+        seen = dict(results.get(timeout=30) for _ in processes)
+        for process in processes:
+            process.join(10)
+            assert process.exitcode == 0
+        assert seen == {worker: workers * 20 for worker in range(workers)}
+
+    def test_background_vacuum(self):
+        cache = SQLiteCache(self.path, vacuum_interval=0.01)
+        with patch.object(cache, 'vacuum') as mock_vacuum:
+            cache.get('brands.get', 'key')
+            cache._vacuum_thread.join(0.1)
+            assert mock_vacuum.called
+        cache.close()
+
+    def test_background_vacuum_restarted_after_close(self):
+        cache = SQLiteCache(self.path, vacuum_interval=0.01)
+        cache.get('brands.get', 'key')
+        stopped = cache._vacuum_thread
+        cache.close()
+        stopped.join(1)
+        assert not stopped.is_alive()
+
+        with patch.object(cache, 'vacuum') as mock_vacuum:
+            cache.get('brands.get', 'key')
+            assert cache._vacuum_thread is not stopped
+            cache._vacuum_thread.join(0.1)
+            assert mock_vacuum.called
+        cache.close()
+
+
+class ClientCacheTests(TestCase):
+    def setUp(self):
+        self.cache = MemoryCache()
+        self.client = OctopartClient(api_key='TEST_TOKEN', cache=self.cache)
+
+    def test_repeated_lookups_served_from_cache(self):
+        body = {'uid': '98785972bc7c4fbf', 'name': 'Newark'}
+        with octopart_mock_response(body) as rsps:
+            for _ in range(3):
+                brand = self.client.get_brand('98785972bc7c4fbf')
+                assert brand == body
+            assert len(rsps.calls) == 1
+        assert self.cache.stats.for_endpoint('brands.get') == {
+            'hits': 2, 'misses': 1, 'evictions': 0}
+
+    def test_part_directives_are_part_of_key(self):
+        with octopart_mock_response() as rsps:
+            self.client.part('3cc3f5cb54c9e304')
+            self.client.part('3cc3f5cb54c9e304', includes=['specs'])
+            self.client.part('3cc3f5cb54c9e304', includes=['specs'])
+            assert len(rsps.calls) == 2
+
+    def test_match_not_cached_by_default(self):
+        with octopart_mock_response() as rsps:
+            self.client.match([{'q': 'MPN1'}])
+            self.client.match([{'q': 'MPN1'}])
+            assert len(rsps.calls) == 2
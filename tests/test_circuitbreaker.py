@@ -0,0 +1,129 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+import pytest
+import requests
+import responses
+
+from octopart.cache import MemoryCache
+from octopart.circuitbreaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+from octopart.client import OctopartClient
+from octopart.exceptions import CircuitOpenError
+from octopart.retries import RetryPolicy
+
+BRAND_URL = 'https://octopart.com/api/v3/brands/98785972bc7c4fbf'
+
+
+def http_error(status):
+    response = requests.Response()
+    response.status_code = status
+    return requests.HTTPError(response=response)
+
+
+class CircuitBreakerTests(TestCase):
+    def setUp(self):
+        patcher = patch('octopart.circuitbreaker.time')
+        self.mock_time = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.now = 0.0
+        self.mock_time.monotonic.side_effect = lambda: self.now
+        self.breaker = CircuitBreaker(
+            window=10, min_calls=4, failure_rate_threshold=0.5,
+            slow_call_duration=2, slow_call_rate_threshold=0.75,
+            open_timeout=30)
+
+    def _record(self, outcomes):
+        for outcome in outcomes:
+            self.breaker.before_call()
+            if outcome == 'ok':
+                self.breaker.record(0.1)
+            elif outcome == 'slow':
+                self.breaker.record(5.0)
+            else:
+                self.breaker.record(0.1, http_error(outcome))
+
+    def test_opens_on_failure_rate(self):
+        self._record(['ok', 503, 'ok'])
+        assert self.breaker.state == CLOSED
+        self._record([503])
+        assert self.breaker.state == OPEN
+        with pytest.raises(CircuitOpenError):
+            self.breaker.before_call()
+        assert self.breaker.rejected == 1
+        assert self.breaker.opened == 1
+
+    def test_opens_on_latency(self):
+        self._record(['slow', 'slow', 'ok', 'slow'])
+        assert self.breaker.state == OPEN
+
+    def test_client_errors_not_counted(self):
+        self._record([404, 404, 404, 404])
+        assert self.breaker.state == CLOSED
+
+    def test_old_calls_leave_window(self):
+        self._record([503, 503, 503])
+        self.now = 11
+        self._record(['ok'])
+        assert self.breaker.state == CLOSED
+        assert self.breaker.snapshot()['calls'] == 1
+
+    def test_half_open_trial_success_closes(self):
+        self._record([503] * 4)
+        self.now = 30
+        assert self.breaker.state == HALF_OPEN
+        self.breaker.before_call()
+        # only one trial at a time
+        with pytest.raises(CircuitOpenError):
+            self.breaker.before_call()
+        self.breaker.record(0.1)
+        assert self.breaker.state == CLOSED
+
+    def test_half_open_trial_failure_reopens(self):
+        self._record([503] * 4)
+        self.now = 30
+        self._record([500])
+        assert self.breaker.state == OPEN
+        self.now = 59
+        assert self.breaker.state == OPEN
+
+    def test_snapshot(self):
+        self._record(['ok', 503, 'slow'])
+        assert self.breaker.snapshot() == {
+            'state': CLOSED,
+            'calls': 3,
+            'failure_rate': 1 / 3,
+            'slow_call_rate': 1 / 3,
+            'rejected': 0,
+            'opened': 0,
+        }
+
+
+class ClientCircuitBreakerTests(TestCase):
+    def setUp(self):
+        self.breaker = CircuitBreaker(min_calls=2, open_timeout=60)
+        self.cache = MemoryCache()
+        self.client = OctopartClient(
+            api_key='TEST_TOKEN',
+            cache=self.cache,
+            circuit_breaker=self.breaker,
+            retry_policy=RetryPolicy(max_attempts=1))
+
+    def test_fails_fast_when_open(self):
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, BRAND_URL, status=503)
+            for _ in range(2):
+                with pytest.raises(Exception):
+                    self.client.get_brand('98785972bc7c4fbf')
+            assert self.breaker.state == OPEN
+
+            with pytest.raises(CircuitOpenError):
+                self.client.get_brand('98785972bc7c4fbf')
+            assert len(rsps.calls) == 2
+
+    def test_cache_served_when_open(self):
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, BRAND_URL, json={'uid': 'brand'})
+            self.client.get_brand('98785972bc7c4fbf')
+
+        self.breaker._open(0)
+        assert self.client.get_brand('98785972bc7c4fbf') == {'uid': 'brand'}
@@ -31,6 +31,39 @@ class ClientTests(TestCase):
         with pytest.raises(OctopartError):
             client.search(["query1", "query2"])
 
+    def test_connection_pool_configuration(self):
+        client = OctopartClient(
+            api_key='TEST_TOKEN', pool_connections=2, pool_maxsize=16,
+            pool_block=True)
+        adapter = client.session.get_adapter(client.base_url)
+        assert adapter._pool_connections == 2
+        assert adapter._pool_maxsize == 16
+        assert adapter._pool_block is True
+
+    def test_session_reused_across_requests(self):
+        with octopart_mock_response() as response:
+            self.client.match([{'q': 'MPN1'}])
+            self.client.get_brand('98785972bc7c4fbf')
+            assert len(response.calls) == 2
+        # both requests were sent through the client's own session
+        with patch('requests.get') as mock_get:
+            with octopart_mock_response():
+                self.client.get_brand('98785972bc7c4fbf')
+            assert not mock_get.called
+
+    def test_keepalive_timeout_drops_idle_connections(self):
+        client = OctopartClient(api_key='TEST_TOKEN', keepalive_timeout=0)
+        adapter = client.session.get_adapter(client.base_url)
+        with patch.object(adapter, 'close') as mock_close:
+            with octopart_mock_response():
+                client.get_brand('98785972bc7c4fbf')
+            assert mock_close.called
+
+        with patch.object(adapter, 'close') as mock_close:
+            with octopart_mock_response():
+                self.client.get_brand('98785972bc7c4fbf')
+            assert not mock_close.called
+
     def test_bad_api_token(self):
         client = OctopartClient(api_key='BAD_TOKEN')
         with pytest.raises(OctopartError):
@@ -0,0 +1,72 @@
+import json
+from unittest import TestCase
+from unittest.mock import patch
+
+import pytest
+
+from octopart import codec
+from octopart.client import OctopartClient
+
+from . import fixtures
+from .utils import octopart_mock_response, request_url_from_request_mock
+
+
+class CodecTests(TestCase):
+    def available_codecs(self):
+        for name in codec.CODECS:
+            try:
+                yield codec.get_codec(name)
+            except ImportError:
+                continue
+
+    def test_roundtrip(self):
+        body = json.dumps(fixtures.parts_match_response).encode()
+        for json_codec in self.available_codecs():
+            assert json_codec.loads(body) == fixtures.parts_match_response
+            assert json_codec.loads(body.decode()) == (
+                fixtures.parts_match_response)
+
+    def test_dumps_matches_stdlib(self):
+        queries = [{'mpn': 'A/B ü', 'limit': 3}, {'q': '中文'}]
+        for json_codec in self.available_codecs():
+            assert json_codec.dumps(queries) == json.dumps(queries)
+
+    def test_decode_errors_are_value_errors(self):
+        for json_codec in self.available_codecs():
+            with pytest.raises(ValueError):
+                json_codec.loads(b'{"truncated": ')
+
+    def test_fallback_to_stdlib(self):
+        with patch.object(codec, 'orjson', None), \
+                patch.object(codec, 'ujson', None):
+            assert type(codec.get_codec()) is codec.JSONCodec
+            with pytest.raises(ImportError):
+                codec.get_codec('orjson')
+
+    def test_unknown_codec(self):
+        with pytest.raises(ValueError):
+            codec.get_codec('yaml')
+
+    def test_prefers_orjson(self):
+        pytest.importorskip('orjson')
+        assert isinstance(codec.default_codec(), codec.OrjsonCodec)
+
+
+class ClientCodecTests(TestCase):
+    def test_client_uses_codec(self):
+        json_codec = codec.JSONCodec()
+        client = OctopartClient(api_key='TEST_TOKEN', codec=json_codec)
+        patch_loads = patch.object(
+            json_codec, 'loads', wraps=json_codec.loads)
+        patch_dumps = patch.object(
+            json_codec, 'dumps', wraps=json_codec.dumps)
+        with patch_loads as loads, patch_dumps as dumps:
+            with octopart_mock_response() as rsps:
+                response = client.match([{'mpn': 'MPN1'}])
+                called_url = request_url_from_request_mock(rsps)
+        dumps.assert_called_once_with([{'mpn': 'MPN1'}])
+        # decoded from the raw bytes
+        [(body,), _] = loads.call_args
+        assert isinstance(body, bytes)
+        assert response == json.loads(body)
+        assert '%22mpn%22%3A+%22MPN1%22' in called_url
@@ -0,0 +1,127 @@
+import threading
+import time
+from unittest import TestCase
+from unittest.mock import patch
+
+import requests
+import responses
+
+from octopart.concurrency import AdaptiveLimiter
+from octopart.context import OctopartContext
+
+BRAND_URL = 'https://octopart.com/api/v3/brands/98785972bc7c4fbf'
+
+
+def http_error(status):
+    response = requests.Response()
+    response.status_code = status
+    return requests.HTTPError(response=response)
+
+
+class AdaptiveLimiterTests(TestCase):
+    def setUp(self):
+        patcher = patch('octopart.concurrency.time')
+        self.mock_time = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.now = 0.0
+        self.mock_time.monotonic.side_effect = lambda: self.now
+
+    def _round(self, limiter, latency=0.1, exc=None):
+        """Send as many requests as the limit allows, and complete them"""
+        self.now += 0.001
+        sent_at = self.now
+        slots = limiter.limit
+        for _ in range(slots):
+            limiter.acquire()
+        self.now += latency
+        for _ in range(slots):
+            limiter.release(sent_at, exc)
+        return slots
+
+    def test_additive_increase(self):
+        limiter = AdaptiveLimiter(initial_limit=4, max_limit=6)
+        limits = []
+        for _ in range(8):
+            self._round(limiter)
+            limits.append(limiter.limit)
+        # about one more every two rounds, since only the slots released
+        # while the limit is at least half used count
+        assert limits == [4, 4, 5, 5, 6, 6, 6, 6]
+        assert limiter.increases == 2
+
+    def test_no_increase_while_limit_unused(self):
+        limiter = AdaptiveLimiter(initial_limit=10)
+        for _ in range(50):
+            limiter.acquire()
+            self.now += 0.1
+            limiter.release(self.now - 0.1)
+        assert limiter.limit == 10
+
+    def test_multiplicative_decrease_once_per_round(self):
+        limiter = AdaptiveLimiter(initial_limit=8)
+        self._round(limiter, exc=http_error(429))
+        assert limiter.limit == 6
+        self._round(limiter, exc=http_error(503))
+        assert limiter.limit == 4
+        assert limiter.decreases == 2
+
+    def test_client_errors_ignored(self):
+        limiter = AdaptiveLimiter(initial_limit=8)
+        self._round(limiter, exc=http_error(404))
+        assert limiter.limit == 8
+
+    def test_latency_increase_decreases(self):
+        limiter = AdaptiveLimiter(initial_limit=8, latency_tolerance=2)
+        self._round(limiter, latency=0.1)
+        self._round(limiter, latency=0.5)
+        assert limiter.limit == 6
+        assert limiter.snapshot() == {
+            'limit': 6,
+            'in_flight': 0,
+            'min_latency': 0.1,
+            'increases': 0,
+            'decreases': 1,
+        }
+
+    def test_bounds(self):
+        limiter = AdaptiveLimiter(initial_limit=2, min_limit=2)
+        self._round(limiter, exc=http_error(500))
+        assert limiter.limit == 2
+        with self.assertRaises(ValueError):
+            AdaptiveLimiter(initial_limit=100, max_limit=50)
+
+
+class AdaptiveLimiterThreadTests(TestCase):
+    def test_acquire_blocks_at_limit(self):
+        limiter = AdaptiveLimiter(initial_limit=1)
+        limiter.acquire()
+        acquired = threading.Event()
+
+        def _acquire():
+            limiter.acquire()
+            acquired.set()
+
+        thread = threading.Thread(target=_acquire)
+        thread.start()
+        assert not acquired.wait(0.05)
+        limiter.release(time.monotonic())
+        assert acquired.wait(1)
+        thread.join()
+
+
+class ClientConcurrencyTests(TestCase):
+    def test_requests_pass_limiter(self):
+        limiter = AdaptiveLimiter(initial_limit=2, max_limit=20)
+        context = OctopartContext(
+            api_key='TEST_TOKEN', concurrency_limiter=limiter)
+        assert context.max_workers == 20
+
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, BRAND_URL, status=429)
+            rsps.add(responses.GET, BRAND_URL, json={'uid': 'brand'})
+            with patch('octopart.retries.time') as mock_time:
+                mock_time.monotonic.return_value = 0
+                context.client.get_brand('98785972bc7c4fbf')
+        assert limiter.decreases == 1
+        assert limiter.in_flight == 0
+        context.close()
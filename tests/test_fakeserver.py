@@ -0,0 +1,132 @@
+import gzip
+import statistics
+from unittest import TestCase
+import urllib.request
+
+import pytest
+
+from octopart import api
+from octopart.client import OctopartClient
+from octopart.context import OctopartContext
+from octopart.exceptions import OctopartError
+from octopart.fakeserver import Catalog, FakeOctopartServer, Latency, main
+from octopart.retries import RetryPolicy
+
+
+class FakeServerTests(TestCase):
+    """Tests for the local stand-in of the Octopart API"""
+    def setUp(self):
+        self.server = FakeOctopartServer(port=0, seed=7)
+        self.server.start()
+        self.context = OctopartContext(
+            api_key='any', base_url=self.server.base_url)
+
+    def tearDown(self):
+        self.context.close()
+        self.server.stop()
+
+    def test_match(self):
+        mpns = ['MPN-%s' % i for i in range(45)]
+        results = api.match(mpns, context=self.context)
+        assert len(results) == 45
+        for mpn, result in zip(mpns, results):
+            for part in result.parts:
+                assert part.mpn.startswith(mpn)
+                assert part.uid
+        # 45 MPNs are sent in chunks of 20
+        assert self.server.responses == {200: 3}
+
+    def test_same_seed_same_data(self):
+        catalog = Catalog(seed=7)
+        query = {'mpn': 'LM358*', 'limit': 5}
+        assert (catalog.match_result(query, ['specs'])
+                == Catalog(seed=7).match_result(query, ['specs']))
+        assert (catalog.match_result(query, [])
+                != Catalog(seed=8).match_result(query, []))
+
+    def test_partial_match_and_includes(self):
+        [result] = api.match(
+            ['LM358'], partial_match=True, limit=10, include_datasheets=True,
+            context=self.context)
+        # partial matches have at least 5 hits
+        assert 5 <= len(result.parts) <= 10
+        assert all(part.datasheets for part in result.parts)
+
+    def test_iter_search(self):
+        parts = list(api.iter_search(
+            'capacitor', page_size=50, max_results=120,
+            context=self.context))
+        assert len(parts) == 120
+        assert len({part.uid for part in parts}) == 120
+
+    def test_search_limits(self):
+        client = OctopartClient(
+            api_key='any', base_url=self.server.base_url)
+        with pytest.raises(OctopartError):
+            client.search('capacitor', start=950, limit=100)
+
+    def test_part_by_uid(self):
+        [result] = api.match(['LM358'], context=self.context)
+        part = api.part(result.parts[0].uid, context=self.context)
+        assert part.mpn == 'LM358'
+        assert api.get_parts([part.uid], context=self.context)[part.uid].mpn \
+            == 'LM358'
+
+    def test_brands_sellers_and_categories(self):
+        [brand] = api.search_brand('texas', context=self.context)
+        assert brand.name == 'Texas Instruments'
+        assert api.get_brand(brand.uid, context=self.context).name \
+            == 'Texas Instruments'
+
+        sellers = api.search_seller('', limit=100, context=self.context)
+        assert {seller.name for seller in sellers} >= {'Digi-Key', 'Mouser'}
+        assert set(api.get_sellers(
+            [seller.uid for seller in sellers], context=self.context)) \
+            == {seller.uid for seller in sellers}
+
+        [category] = api.search_category('capacitors', context=self.context)
+        assert category.name == 'Capacitors'
+
+        with pytest.raises(OctopartError):
+            api.get_brand('0' * 16, context=self.context)
+
+    def test_uri_too_long(self):
+        with FakeOctopartServer(port=0, max_uri_length=100) as server:
+            client = OctopartClient(
+                api_key='any', base_url=server.base_url)
+            with pytest.raises(OctopartError):
+                client.match([{'mpn': 'X' * 200}])
+            assert server.responses == {414: 1}
+
+    def test_rate_limit(self):
+        with FakeOctopartServer(port=0, rate=1, burst=2) as server:
+            client = OctopartClient(
+                api_key='any', base_url=server.base_url,
+                retry_policy=RetryPolicy(max_attempts=1))
+            client.match([{'mpn': 'A'}])
+            client.match([{'mpn': 'B'}])
+            with pytest.raises(OctopartError):
+                client.match([{'mpn': 'C'}])
+            assert server.responses == {200: 2, 429: 1}
+
+    def test_compressed_responses(self):
+        with FakeOctopartServer(port=0, compress=6) as server:
+            request = urllib.request.Request(
+                server.base_url + '/api/v3/brands/search?q=',
+                headers={'Accept-Encoding': 'gzip'})
+            with urllib.request.urlopen(request) as response:
+                assert response.headers['Content-Encoding'] == 'gzip'
+                assert b'Brand' in gzip.decompress(response.read())
+
+    def test_latency_distributions(self):
+        for distribution in Latency.DISTRIBUTIONS:
+            latency = Latency(0.1, distribution, seed=1)
+            samples = [latency.sample() for _ in range(5000)]
+            assert min(samples) >= 0
+            assert statistics.mean(samples) == pytest.approx(0.1, rel=0.1)
+        with pytest.raises(ValueError):
+            Latency(0.1, 'normal')
+
+    def test_main_rejects_unknown_distribution(self):
+        with pytest.raises(SystemExit):
+            main(['--latency-distribution', 'normal'])
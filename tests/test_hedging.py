@@ -0,0 +1,172 @@
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+from unittest import TestCase
+from unittest.mock import patch
+
+import pytest
+
+from octopart.client import OctopartClient
+from octopart.exceptions import OctopartError
+from octopart.hedging import Hedger
+
+
+class HedgerTests(TestCase):
+    def setUp(self):
+        self.hedger = Hedger(min_delay=0.01, burst=1, max_extra_load=0)
+        for _ in range(self.hedger.min_samples):
+            self.hedger.latencies.add(0.01)
+        self.release = threading.Event()
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def tearDown(self):
+        self.release.set()
+        self.hedger.close()
+
+    def _first_call_slow(self, exc=None):
+        """First call blocks until released, later ones return at once"""
+        def func():
+            with self.lock:
+                self.calls += 1
+                call = self.calls
+            if call == 1:
+                self.release.wait(2)
+                return 'primary'
+            if exc is not None:
+                raise exc
+            return 'hedge'
+        return func
+
+    def test_no_hedge_before_min_samples(self):
+        hedger = Hedger()
+        assert hedger.delay() is None
+        assert hedger.call(lambda: 'ok') == 'ok'
+        assert hedger.hedged == 0
+        hedger.close()
+
+    def test_fast_request_not_hedged(self):
+        assert self.hedger.call(lambda: 'ok') == 'ok'
+        assert self.hedger.hedged == 0
+        assert self.hedger.requests == 1
+
+    def test_slow_request_hedged(self):
+        prepared = []
+        result = self.hedger.call(
+            self._first_call_slow(), prepare=lambda: prepared.append(1))
+        assert result == 'hedge'
+        assert self.calls == 2
+        # every copy waits for its own rate limit token
+        assert len(prepared) == 2
+        assert (self.hedger.hedged, self.hedger.hedge_wins) == (1, 1)
+
+    def test_failed_hedge_falls_back_to_primary(self):
+        func = self._first_call_slow(exc=OctopartError('HTTPError 503'))
+        threading.Timer(0.05, self.release.set).start()
+        assert self.hedger.call(func) == 'primary'
+        assert self.hedger.hedge_wins == 0
+
+    def test_extra_load_capped(self):
+        self.hedger.call(self._first_call_slow())
+        self.release.set()
+
+        self.calls = 0
+        self.release.clear()
+        threading.Timer(0.05, self.release.set).start()
+        # the budget of a single hedge is used up
+        assert self.hedger.call(self._first_call_slow()) == 'primary'
+        assert self.calls == 1
+        assert self.hedger.hedged == 1
+
+    def test_queued_requests_not_hedged(self):
+        hedger = Hedger(min_delay=0.2, max_workers=2, burst=100)
+        for _ in range(hedger.min_samples):
+            hedger.latencies.add(0.2)
+        slots = threading.Semaphore(16)
+        prepared = []
+
+        def prepare():
+            # a concurrency limit above the hedger's workers
+            slots.acquire()
+            prepared.append(1)
+
+        def func():
+            time.sleep(0.03)
+            slots.release()
+            return 'ok'
+
+        # 16 callers queue behind two workers for longer than the delay
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            results = list(pool.map(
+                lambda _: hedger.call(func, prepare=prepare), range(16)))
+        assert results == ['ok'] * 16
+        assert hedger.hedged == 0
+        assert len(prepared) == 16
+        hedger.close()
+
+    def test_hedge_prepared_outside_pool(self):
+        hedger = Hedger(min_delay=0.01, max_workers=1, burst=1)
+        for _ in range(hedger.min_samples):
+            hedger.latencies.add(0.01)
+        release = threading.Event()
+        calls = []
+
+        def func():
+            calls.append(1)
+            if len(calls) == 1:
+                release.wait(2)
+                return 'primary'
+            return 'hedge'
+
+        # the only worker is busy with the primary, the copy still runs
+        assert hedger.call(func) == 'hedge'
+        release.set()
+        hedger.close()
+
+    def test_latency_tracked(self):
+        hedger = Hedger(min_samples=3, min_delay=0)
+        for _ in range(3):
+            hedger.call(lambda: 'ok')
+        assert len(hedger.latencies) == 3
+        assert hedger.delay() < 0.01
+        hedger.close()
+
+
+class ClientHedgingTests(TestCase):
+    def test_only_match_hedged(self):
+        hedger = Hedger()
+        client = OctopartClient(api_key='TEST_TOKEN', hedger=hedger)
+        with patch.object(client, '_get', return_value={'results': []}):
+            client.match([{'mpn': 'MPN1'}])
+            client.get_brand('98785972bc7c4fbf')
+        assert hedger.requests == 1
+        hedger.close()
+
+    def test_each_copy_prepared(self):
+        hedger = Hedger(min_delay=0.01)
+        for _ in range(hedger.min_samples):
+            hedger.latencies.add(0.01)
+        client = OctopartClient(api_key='TEST_TOKEN', hedger=hedger)
+        release = threading.Event()
+        responses = iter([{'results': ['slow']}, {'results': ['fast']}])
+
+        def _get(path, params):
+            response = next(responses)
+            if response == {'results': ['slow']}:
+                release.wait(2)
+            return response
+
+        with patch.object(client, '_get', side_effect=_get), \
+                patch.object(client, '_prepare_attempt') as mock_prepare:
+            assert client.match([{'mpn': 'MPN1'}]) == {'results': ['fast']}
+            release.set()
+        assert mock_prepare.call_count == 2
+        hedger.close()
+
+    def test_all_copies_failed(self):
+        hedger = Hedger()
+        client = OctopartClient(api_key='TEST_TOKEN', hedger=hedger)
+        with patch.object(client, '_get', side_effect=ValueError('bad')):
+            with pytest.raises(OctopartError):
+                client.match([{'mpn': 'MPN1'}])
+        hedger.close()
@@ -0,0 +1,115 @@
+import math
+from unittest import TestCase
+
+import pytest
+
+from octopart import models
+
+from . import fixtures
+
+np = pytest.importorskip('numpy')
+from octopart.pricing import PriceEngine  # noqa: E402
+from octopart.tables import OfferTable  # noqa: E402
+
+
+def _offer(sku, stock, moq, prices):
+    return {
+        'seller': {'name': 'Seller'},
+        'sku': sku,
+        'in_stock_quantity': stock,
+        'moq': moq,
+        'prices': prices,
+    }
+
+
+PARTS = [
+    {'uid': 'a', 'offers': [
+        _offer('A-1', 1000, 1,
+               {'USD': [[100, '0.30'], [1, '0.50'], [10, '0.40']],
+                'EUR': [[1, '0.45']]}),
+        _offer('A-2', 50, 25, {'USD': [[25, '0.20']]}),
+        _offer('A-3', 0, 1, {'USD': [[1, '0.01']]}),
+    ]},
+    {'uid': 'b', 'offers': [
+        _offer('B-1', None, 1, {'USD': [[1, '9.99']]}),
+        _offer('B-2', 10, 1, {'USD': [[5, '2.00']]}),
+    ]},
+]
+
+
+def python_unit_price(offer, currency, quantity):
+    """Reference implementation: scan the breaks of an offer"""
+    if offer['in_stock_quantity'] is None or offer['in_stock_quantity'] <= 0:
+        return None
+    if offer['moq'] is not None and quantity < offer['moq']:
+        return None
+    breaks = [
+        (break_quantity, float(price))
+        for break_quantity, price in offer['prices'].get(currency, [])
+        if break_quantity <= quantity]
+    return max(breaks)[1] if breaks else None
+
+
+class PriceEngineTests(TestCase):
+    def setUp(self):
+        self.engine = PriceEngine.from_parts(PARTS)
+
+    def test_quote(self):
+        quotes = self.engine.quote([1, 10, 30, 100, 5000])
+        # offers without stock are left out
+        assert quotes.sku.tolist() == ['A-1', 'A-2', 'B-2']
+        unit_price = quotes.unit_price.tolist()
+        assert unit_price[0] == [0.5, 0.4, 0.4, 0.3, 0.3]
+        # below MOQ
+        assert all(math.isnan(price) for price in unit_price[1][:2])
+        assert unit_price[1][2:] == [0.2, 0.2, 0.2]
+        # below the lowest break
+        assert math.isnan(unit_price[2][0])
+        assert unit_price[2][1:] == [2.0] * 4
+        assert quotes.extended_cost[0].tolist() == [
+            0.5, 4.0, 12.0, 30.0, 1500.0]
+
+    def test_currency(self):
+        quotes = self.engine.quote([1], currency='EUR')
+        assert quotes.sku.tolist() == ['A-1']
+        assert quotes.unit_price.tolist() == [[0.45]]
+        assert len(self.engine.quote([1], currency='GBP')) == 0
+
+    def test_min_by_part(self):
+        minimums = self.engine.quote([1, 30]).min_by_part()
+        assert minimums['a'].tolist() == [0.5, 0.2]
+        assert math.isnan(minimums['b'][0])
+        assert minimums['b'][1] == 2.0
+
+    def test_empty(self):
+        engine = PriceEngine(OfferTable.from_parts([]))
+        quotes = engine.quote([1, 10])
+        assert len(quotes) == 0
+        assert quotes.min_by_part() == {}
+
+    def test_matches_python_scan(self):
+        results = models.PartsMatchResponse(
+            fixtures.parts_match_multiple_sellers_response).results
+        engine = PriceEngine(models.to_offer_table(results))
+        quantities = [1, 7, 10, 99, 100, 2500, 10 ** 6]
+        quotes = engine.quote(quantities)
+
+        offers = [
+            offer
+            for result in results
+            for part in result._part_dicts()
+            for offer in part['offers']
+        ]
+        assert len(quotes) == len([
+            offer for offer in offers
+            if python_unit_price(offer, 'USD', 10 ** 9) is not None])
+        for i, offer_index in enumerate(quotes.offer.tolist()):
+            offer = offers[offer_index]
+            assert quotes.sku[i] == offer['sku']
+            for j, quantity in enumerate(quantities):
+                expected = python_unit_price(offer, 'USD', quantity)
+                price = quotes.unit_price[i, j]
+                if expected is None:
+                    assert math.isnan(price)
+                else:
+                    assert price == expected
@@ -0,0 +1,98 @@
+from concurrent.futures import ThreadPoolExecutor
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+from octopart.client import OctopartClient
+from octopart.ratelimit import FileTokenBucket, Throttle, TokenBucket
+
+from .utils import octopart_mock_response
+
+
+class TokenBucketTests(TestCase):
+    @patch('octopart.ratelimit.time')
+    def test_burst_then_rate(self, mock_time):
+        mock_time.monotonic.return_value = 0
+        bucket = TokenBucket(rate=2, burst=3)
+        assert [bucket.reserve() for _ in range(5)] == [0, 0, 0, 0.5, 1.0]
+
+        # refilled after waiting, but never beyond the burst size
+        mock_time.monotonic.return_value = 100
+        assert [bucket.reserve() for _ in range(4)] == [0, 0, 0, 0.5]
+
+    @patch('octopart.ratelimit.time')
+    def test_acquire_sleeps(self, mock_time):
+        mock_time.monotonic.return_value = 0
+        bucket = TokenBucket(rate=10, burst=1)
+        bucket.acquire()
+        assert not mock_time.sleep.called
+        assert bucket.acquire() == 0.1
+        mock_time.sleep.assert_called_once_with(0.1)
+        assert bucket.acquired == 2
+        assert bucket.waited == 0.1
+
+    @patch('octopart.ratelimit.time')
+    def test_threads_share_quota(self, mock_time):
+        mock_time.monotonic.return_value = 0
+        bucket = TokenBucket(rate=100, burst=1)
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            delays = list(pool.map(lambda _: bucket.reserve(), range(40)))
+        # every thread got its own slot
+        assert sorted(round(delay, 6) for delay in delays) == [
+            i / 100 for i in range(40)]
+
+    def test_bad_rate(self):
+        with self.assertRaises(ValueError):
+            TokenBucket(rate=0)
+
+
+class FileTokenBucketTests(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'octopart.bucket')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    @patch('octopart.ratelimit.time')
+    def test_instances_share_state(self, mock_time):
+        mock_time.time.return_value = 1000
+        first = FileTokenBucket(self.path, rate=2, burst=2)
+        second = FileTokenBucket(self.path, rate=2, burst=2)
+        assert first.reserve() == 0
+        assert second.reserve() == 0
+        assert first.reserve() == 0.5
+        assert second.reserve() == 1.0
+
+        mock_time.time.return_value = 1010
+        assert second.reserve() == 0
+
+    def test_corrupt_state_resets(self):
+        with open(self.path, 'w') as f:
+            f.write('garbage')
+        bucket = FileTokenBucket(self.path, rate=2, burst=2)
+        assert bucket.reserve() == 0
+
+
+class ThrottleTests(TestCase):
+    @patch('octopart.ratelimit.time')
+    def test_rejected_requests_take_no_token(self, mock_time):
+        mock_time.monotonic.return_value = 0
+        throttle = Throttle(rate=2, burst=2)
+        assert [throttle.take() for _ in range(4)] == [None, None, 0.5, 0.5]
+
+        mock_time.monotonic.return_value = 0.5
+        assert [throttle.take() for _ in range(2)] == [None, 0.5]
+        assert (throttle.admitted, throttle.rejected) == (3, 3)
+
+
+class ClientRateLimitTests(TestCase):
+    def test_every_request_acquires(self):
+        bucket = TokenBucket(rate=1000, burst=10)
+        client = OctopartClient(api_key='TEST_TOKEN', rate_limiter=bucket)
+        with octopart_mock_response():
+            client.get_brand('98785972bc7c4fbf')
+            client.get_seller('2c3be9310496fffc')
+        assert bucket.acquired == 2
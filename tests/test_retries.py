@@ -0,0 +1,152 @@
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+from unittest.mock import patch
+
+import pytest
+import requests
+import responses
+
+from octopart.client import OctopartClient
+from octopart.exceptions import OctopartError
+from octopart.retries import RetryBudget, RetryPolicy
+
+BRAND_URL = 'https://octopart.com/api/v3/brands/98785972bc7c4fbf'
+
+
+def http_error(status, headers=None):
+    response = requests.Response()
+    response.status_code = status
+    response.headers.update(headers or {})
+    return requests.HTTPError(response=response)
+
+
+class RetryPolicyTests(TestCase):
+    def setUp(self):
+        patcher = patch('octopart.retries.random')
+        self.mock_random = patcher.start()
+        self.addCleanup(patcher.stop)
+        # no jitter: always wait the longest backoff
+        self.mock_random.uniform.side_effect = lambda low, high: high
+        self.policy = RetryPolicy()
+
+    def test_status_classification(self):
+        assert self.policy.delay(http_error(503), 1, 0) == 0.2
+        assert self.policy.delay(http_error(429), 1, 0) == 0.2
+        assert self.policy.delay(http_error(400), 1, 0) is None
+        assert self.policy.delay(http_error(404), 1, 0) is None
+        # no response at all, e.g. a connection error
+        assert self.policy.delay(requests.ConnectionError(), 1, 0) == 0.2
+
+    def test_exponential_backoff_capped(self):
+        delays = [
+            self.policy.delay(http_error(500), attempt, 0)
+            for attempt in range(1, 8)]
+        assert delays == [0.2, 0.4, 0.8, 1.6, 3.2, 6.4, 10.0]
+
+    def test_full_jitter(self):
+        self.policy.delay(http_error(500), 3, 0)
+        self.mock_random.uniform.assert_called_with(0, 0.8)
+
+    def test_retry_after_seconds(self):
+        exc = http_error(429, {'Retry-After': '3'})
+        assert self.policy.delay(exc, 1, 0) == 3.0
+
+        policy = RetryPolicy(respect_retry_after=False)
+        assert policy.delay(exc, 1, 0) == 0.2
+
+    def test_gives_up(self):
+        assert self.policy.delay(http_error(500), 8, 0) is None
+        assert self.policy.delay(http_error(500), 1, 19.9) is None
+        # waiting as long as asked would exceed max_elapsed
+        exc = http_error(503, {'Retry-After': '60'})
+        assert self.policy.delay(exc, 1, 0) is None
+
+    @patch('octopart.retries.time')
+    def test_call_retries_then_succeeds(self, mock_time):
+        mock_time.monotonic.return_value = 0
+        outcomes = [http_error(502), http_error(503), 'ok']
+
+        def func():
+            outcome = outcomes.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        assert self.policy.call(func, requests.RequestException) == 'ok'
+        assert [c[0][0] for c in mock_time.sleep.call_args_list] == [0.2, 0.4]
+
+    def test_call_does_not_retry_other_exceptions(self):
+        def func():
+            raise ValueError('not JSON')
+
+        with pytest.raises(ValueError):
+            self.policy.call(func, requests.RequestException)
+
+
+class RetryBudgetTests(TestCase):
+    def test_burst_then_ratio(self):
+        budget = RetryBudget(ratio=0.1, burst=2)
+        assert budget.try_retry()
+        assert budget.try_retry()
+        assert not budget.try_retry()
+
+        for _ in range(10):
+            budget.record_request()
+        assert budget.try_retry()
+        assert not budget.try_retry()
+        assert (budget.retries, budget.rejected) == (3, 2)
+
+    def test_savings_capped_at_burst(self):
+        budget = RetryBudget(ratio=0.5, burst=2)
+        for _ in range(100):
+            budget.record_request()
+        assert sum(budget.try_retry() for _ in range(5)) == 2
+
+    def test_policy_stops_when_budget_exhausted(self):
+        policy = RetryPolicy(budget=RetryBudget(burst=1))
+        assert policy.delay(http_error(503), 1, 0) is not None
+        assert policy.delay(http_error(503), 1, 0) is None
+
+
+class ClientRetryTests(TestCase):
+    def setUp(self):
+        patcher = patch('octopart.retries.time')
+        self.mock_time = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.mock_time.monotonic.return_value = 0
+
+    def test_not_found_not_retried(self):
+        client = OctopartClient(api_key='TEST_TOKEN')
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, BRAND_URL, status=404)
+            with pytest.raises(OctopartError) as exc_info:
+                client.get_brand('98785972bc7c4fbf')
+            assert len(rsps.calls) == 1
+        assert str(exc_info.value) == 'HTTPError 404'
+
+    def test_retry_after_honored(self):
+        client = OctopartClient(api_key='TEST_TOKEN')
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, BRAND_URL, status=429,
+                     headers={'Retry-After': '2'})
+            rsps.add(responses.GET, BRAND_URL, json={'uid': 'brand'})
+            assert client.get_brand('98785972bc7c4fbf') == {'uid': 'brand'}
+            assert len(rsps.calls) == 2
+        [sleep_call] = self.mock_time.sleep.call_args_list
+        assert sleep_call[0][0] >= 2
+
+    def test_shared_budget_caps_retries(self):
+        policy = RetryPolicy(budget=RetryBudget(ratio=0.1, burst=2))
+        client = OctopartClient(api_key='TEST_TOKEN', retry_policy=policy)
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, BRAND_URL, status=503)
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                futures = [
+                    pool.submit(client.get_brand, '98785972bc7c4fbf')
+                    for _ in range(20)]
+            for future in futures:
+                with pytest.raises(OctopartError):
+                    future.result()
+            # 20 requests earn 2 retries, on top of the 2 in reserve
+            assert len(rsps.calls) <= 20 + 4
+        assert policy.budget.requests == 20
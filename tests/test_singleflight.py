@@ -0,0 +1,105 @@
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+from unittest import TestCase
+from unittest.mock import patch
+
+import pytest
+
+from octopart.client import OctopartClient
+from octopart.exceptions import OctopartError
+from octopart.singleflight import SingleFlight
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline
+        time.sleep(0.001)
+
+
+class SingleFlightTests(TestCase):
+    def setUp(self):
+        self.singleflight = SingleFlight()
+        self.release = threading.Event()
+        self.calls = 0
+
+    def _slow(self, result=None, exc=None):
+        def func():
+            self.calls += 1
+            self.release.wait(2)
+            if exc is not None:
+                raise exc
+            return result
+        return func
+
+    def _run_concurrently(self, n, key, func):
+        """Start `n` calls of `key`; return once all of them are waiting"""
+        pool = ThreadPoolExecutor(max_workers=n)
+        futures = [
+            pool.submit(self.singleflight.do, key, func) for _ in range(n)]
+        _wait_for(lambda: (
+            self.singleflight.executed + self.singleflight.shared == n))
+        self.release.set()
+        pool.shutdown()
+        return futures
+
+    def test_identical_calls_share_result(self):
+        futures = self._run_concurrently(5, 'key', self._slow({'a': 1}))
+        assert [f.result() for f in futures] == [{'a': 1}] * 5
+        assert self.calls == 1
+        assert self.singleflight.executed == 1
+        assert self.singleflight.shared == 4
+        assert self.singleflight.saved_ratio == 0.8
+
+    def test_identical_calls_share_exception(self):
+        futures = self._run_concurrently(
+            3, 'key', self._slow(exc=OctopartError('HTTPError 500')))
+        for future in futures:
+            with pytest.raises(OctopartError):
+                future.result()
+        assert self.calls == 1
+
+    def test_sequential_calls_not_shared(self):
+        self.release.set()
+        self.singleflight.do('key', self._slow(1))
+        self.singleflight.do('key', self._slow(1))
+        assert self.calls == 2
+        assert self.singleflight.shared == 0
+
+    def test_distinct_keys_not_shared(self):
+        self.release.set()
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            list(pool.map(
+                lambda key: self.singleflight.do(key, self._slow(key)),
+                ['a', 'b']))
+        assert self.calls == 2
+
+
+class ClientCoalescingTests(TestCase):
+    def test_concurrent_identical_requests_coalesced(self):
+        client = OctopartClient(api_key='TEST_TOKEN', coalesce=True)
+        release = threading.Event()
+        sent = []
+
+        def _send(path, params=None):
+            sent.append(path)
+            release.wait(2)
+            return {'uid': path}
+
+        with patch.object(client, '_send', side_effect=_send):
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                futures = [
+                    pool.submit(client.get_brand, '98785972bc7c4fbf')
+                    for _ in range(4)]
+                _wait_for(lambda: client.singleflight.shared == 3)
+                release.set()
+
+        assert sent == ['/brands/98785972bc7c4fbf']
+        assert all(
+            f.result() == {'uid': '/brands/98785972bc7c4fbf'}
+            for f in futures)
+
+    def test_coalescing_disabled_by_default(self):
+        client = OctopartClient(api_key='TEST_TOKEN')
+        assert client.singleflight is None
@@ -0,0 +1,165 @@
+import json
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+
+from octopart.client import OctopartClient
+from octopart.exceptions import OctopartError
+from octopart.fakeserver import FakeOctopartServer
+from octopart.streaming import ArrayItemScanner, iter_array_items
+
+from . import fixtures
+from .utils import octopart_mock_response
+
+
+def _chunked(body, size):
+    return [body[i:i + size] for i in range(0, len(body), size)]
+
+
+class ArrayItemScannerTests(TestCase):
+    """Tests for splitting the 'results' array of a streamed body"""
+
+    document = {
+        '__class__': 'PartsMatchResponse',
+        # brackets and the key itself, in strings before the array
+        'request': {'queries': [{'q': 'a]b"c{', 'reference': 'results'}]},
+        'results': [
+            {'reference': '\\', 'items': [{'mpn': '"],', 'specs': {}}]},
+            [[['}'], {'a': {'b': 'x\\"y'}}]],
+            3,
+            'results',
+            [],
+            {},
+            None,
+        ],
+        'msec': 3,
+    }
+
+    def test_any_chunk_size(self):
+        body = json.dumps(self.document).encode()
+        for size in range(1, len(body) + 1):
+            items = list(iter_array_items(_chunked(body, size)))
+            assert items == self.document['results'], size
+
+    def test_fixtures(self):
+        for response in (fixtures.parts_match_extra_fields_response,
+                         fixtures.parts_search_response):
+            body = json.dumps(response).encode()
+            items = list(iter_array_items(_chunked(body, 100)))
+            assert items == response['results']
+
+    def test_items_are_returned_once_complete(self):
+        scanner = ArrayItemScanner()
+        assert scanner.feed(b'{"results": [{"uid": "a"}, {"uid"') == [
+            b'{"uid": "a"}']
+        assert scanner.feed(b': "b"}') == []
+        assert scanner.feed(b']}') == [b' {"uid": "b"}']
+        assert scanner.done
+
+    def test_only_the_current_item_is_buffered(self):
+        scanner = ArrayItemScanner()
+        scanner.feed(b'{"request": {"queries": [%s]}, "results": [' % (
+            b'{"q": "x"}, ' * 1000 + b'{}'))
+        assert len(scanner._buffer) == 0
+        scanner.feed(b'{"uid": "a"}, {"uid": "b", "mpn": ')
+        assert bytes(scanner._buffer) == b' {"uid": "b", "mpn": '
+
+    def test_empty_array(self):
+        assert list(iter_array_items([b'{"results": [ ]}'])) == []
+
+    def test_other_key(self):
+        body = b'{"results": [1], "stats": [2, 3]}'
+        assert list(iter_array_items([body], key='stats')) == [2, 3]
+
+    def test_truncated_body(self):
+        with pytest.raises(ValueError):
+            list(iter_array_items([b'{"results": [{"uid": "a"}, {"u']))
+
+    def test_missing_array(self):
+        with pytest.raises(ValueError):
+            list(iter_array_items([b'{"results": {"a": [1]}}']))
+
+
+class ClientStreamTests(TestCase):
+    """Tests for the client's match_stream() and search_stream() methods"""
+    def setUp(self):
+        self.client = OctopartClient(api_key='TEST_TOKEN')
+
+    def test_match_stream(self):
+        response = fixtures.parts_match_extra_fields_response
+        with octopart_mock_response(response) as rsps:
+            results = list(self.client.match_stream([{'q': 'RUM001L02T2CL'}]))
+            url = rsps.calls[0].request.url
+        assert results == response['results']
+        assert 'apikey=TEST_TOKEN' in url
+
+    def test_search_stream(self):
+        response = fixtures.parts_search_response
+        with octopart_mock_response(response):
+            results = list(self.client.search_stream('resistor'))
+        assert results == response['results']
+
+    def test_request_is_validated_right_away_and_sent_lazily(self):
+        with pytest.raises(OctopartError):
+            self.client.search_stream(['query1', 'query2'])
+        with octopart_mock_response() as rsps:
+            results = self.client.match_stream([{'q': 'MPN'}])
+            assert len(rsps.calls) == 0
+            list(results)
+            assert len(rsps.calls) == 1
+
+    def test_dropped_stream_holds_no_connection(self):
+        with FakeOctopartServer(port=0) as server:
+            client = OctopartClient(
+                api_key='TEST_TOKEN', base_url=server.base_url,
+                pool_maxsize=1)
+            client.match([{'mpn': 'MPN'}])
+            pools = client.session.get_adapter(
+                server.base_url).poolmanager.pools
+            [key] = pools.keys()
+            pool = pools[key]
+            assert pool.num_connections == 1
+
+            for _ in range(3):
+                client.match_stream([{'mpn': 'MPN'}])
+            # the pooled connection is still idle in the pool
+            assert [conn for conn in pool.pool.queue if conn] != []
+            assert list(client.match_stream([{'mpn': 'MPN'}]))
+            assert pool.num_connections == 1
+            client.close()
+
+    def test_results_are_yielded_as_they_arrive(self):
+        body = json.dumps(fixtures.parts_search_response).encode()
+        chunks = _chunked(body, 1024)
+        read = []
+
+        def _iter_content(chunk_size):
+            for chunk in chunks:
+                read.append(chunk)
+                yield chunk
+
+        mock_response = MagicMock(ok=True)
+        mock_response.iter_content = _iter_content
+        with patch.object(
+                self.client.session, 'get', return_value=mock_response):
+            results = self.client.search_stream('resistor')
+            next(results)
+            assert len(read) < len(chunks)
+            results.close()
+        assert mock_response.close.called
+
+    def test_read_errors_are_wrapped(self):
+        def _iter_content(chunk_size):
+            yield b'{"results": [{"item": {}}, '
+            raise requests.exceptions.ChunkedEncodingError()
+
+        mock_response = MagicMock(ok=True)
+        mock_response.iter_content = _iter_content
+        with patch.object(
+                self.client.session, 'get', return_value=mock_response):
+            results = self.client.search_stream('resistor')
+            assert next(results) == {'item': {}}
+            with pytest.raises(OctopartError):
+                next(results)
@@ -0,0 +1,106 @@
+from unittest import TestCase
+
+import pytest
+
+from octopart import models
+
+from . import fixtures
+
+np = pytest.importorskip('numpy')
+from octopart.tables import MISSING_QUANTITY, OfferTable  # noqa: E402
+
+
+def _offer(seller, sku, stock, moq, prices):
+    return {
+        'seller': {'name': seller},
+        'sku': sku,
+        'in_stock_quantity': stock,
+        'moq': moq,
+        'prices': prices,
+    }
+
+
+PARTS = [
+    {'uid': 'a', 'offers': [
+        _offer('Digi-Key', 'A-DK', 100, 1,
+               {'USD': [[1, '0.50'], [10, '0.40'], [100, '0.30']],
+                'EUR': [[1, '0.45']]}),
+        _offer('Mouser', 'A-MO', 0, 10, {'USD': [[10, '0.35']]}),
+    ]},
+    {'uid': 'b', 'offers': [
+        _offer('Mouser', 'B-MO', None, None, {'USD': [[1, '2.00']]}),
+        _offer('Arrow', 'B-AR', 5, 1, {}),
+    ]},
+]
+
+
+class OfferTableTests(TestCase):
+    def setUp(self):
+        self.table = OfferTable.from_parts(PARTS)
+
+    def test_one_row_per_price_break(self):
+        table = self.table
+        assert len(table) == 6
+        assert table['part_uid'].tolist() == ['a'] * 5 + ['b']
+        assert table['currency'].tolist() == [
+            'USD', 'USD', 'USD', 'EUR', 'USD', 'USD']
+        assert table['quantity'].dtype == np.int64
+        assert table['unit_price'].tolist() == [
+            0.5, 0.4, 0.3, 0.45, 0.35, 2.0]
+        assert table['in_stock_quantity'][-1] == MISSING_QUANTITY
+        assert table['moq'][-1] == MISSING_QUANTITY
+
+    def test_filters(self):
+        in_stock = self.table.in_stock()
+        assert set(in_stock['sku'].tolist()) == {'A-DK'}
+        assert len(self.table.in_stock(quantity=500)) == 0
+
+        usd = self.table.currency('USD')
+        assert 'EUR' not in usd['currency'].tolist()
+
+        mouser = self.table.sellers({'Mouser'})
+        assert mouser['sku'].tolist() == ['A-MO', 'B-MO']
+        # filtering does not touch the original table
+        assert len(self.table) == 6
+
+    def test_at_quantity(self):
+        table = self.table.currency('USD').at_quantity(50)
+        rows = dict(zip(table['sku'].tolist(), table['unit_price'].tolist()))
+        assert rows == {'A-DK': 0.4, 'A-MO': 0.35, 'B-MO': 2.0}
+
+        # below Mouser's MOQ of 10
+        table = self.table.currency('USD').at_quantity(5)
+        assert sorted(table['sku'].tolist()) == ['A-DK', 'B-MO']
+
+    def test_group_by_part(self):
+        assert self.table.min_by_part() == {'a': 0.3, 'b': 2.0}
+        assert self.table.min_by_part('quantity') == {'a': 1, 'b': 1}
+
+        cheapest = self.table.cheapest_by_part()
+        assert cheapest['part_uid'].tolist() == ['a', 'b']
+        assert cheapest['sku'].tolist() == ['A-DK', 'B-MO']
+
+    def test_empty(self):
+        table = OfferTable.from_parts([])
+        assert len(table) == 0
+        assert table.min_by_part() == {}
+        assert len(table.cheapest_by_part()) == 0
+        assert len(table.at_quantity(10)) == 0
+
+    def test_from_responses(self):
+        results = models.PartsMatchResponse(
+            fixtures.parts_match_multiple_sellers_response).results
+        table = models.to_offer_table(results)
+        expected = sum(
+            len(breaks)
+            for result in results
+            for part in result.parts
+            for offer in part.offers
+            for breaks in offer.prices.values())
+        assert len(table) == expected
+        assert len(results[0].to_offer_table()) <= expected
+
+        search = models.PartsSearchResult(fixtures.parts_search_response)
+        table = search.to_offer_table()
+        assert set(table['part_uid'].tolist()) == {
+            part.uid for part in search.parts if part.offers}
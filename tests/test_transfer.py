@@ -0,0 +1,115 @@
+import gzip
+import json
+import re
+import threading
+import zlib
+from unittest import TestCase
+
+import responses
+
+from octopart.client import OctopartClient
+from octopart.transfer import ACCEPT_ENCODING, TransferStats
+
+from . import fixtures
+
+
+def _mock_compressed(rsps, body, encoding='gzip'):
+    if encoding == 'gzip':
+        compressed = gzip.compress(body)
+    else:
+        compressed = zlib.compress(body)
+    rsps.add(
+        responses.GET,
+        re.compile(r'https://octopart\.com/api/v3/.*'),
+        body=compressed,
+        headers={'Content-Encoding': encoding},
+        content_type='application/json')
+    return compressed
+
+
+class TransferStatsTests(TestCase):
+    """Tests for counting transferred bytes"""
+
+    def test_counters_per_endpoint(self):
+        stats = TransferStats()
+        stats.record('parts.match', wire_bytes=100, body_bytes=400)
+        stats.record('parts.match', wire_bytes=50, body_bytes=200)
+        stats.record('brands.get', wire_bytes=10, body_bytes=10)
+        assert stats.snapshot() == {
+            'parts.match': {
+                'responses': 2, 'wire_bytes': 150, 'body_bytes': 600},
+            'brands.get': {
+                'responses': 1, 'wire_bytes': 10, 'body_bytes': 10},
+        }
+        assert stats.saved_bytes('parts.match') == 450
+        assert stats.saved_bytes() == 450
+        assert stats.compression_ratio('parts.match') == 0.25
+        assert stats.compression_ratio('brands.get') == 1.0
+        assert stats.compression_ratio('parts.search') == 1.0
+
+        stats.reset()
+        assert stats.snapshot() == {}
+
+    def test_thread_safety(self):
+        stats = TransferStats()
+
+        def _record():
+            for _ in range(1000):
+                stats.record('parts.match', 1, 2)
+
+        threads = [threading.Thread(target=_record) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert stats.snapshot()['parts.match'] == {
+            'responses': 8000, 'wire_bytes': 8000, 'body_bytes': 16000}
+
+
+class ClientTransferTests(TestCase):
+    """Tests for compressed responses of `OctopartClient`"""
+    def setUp(self):
+        self.client = OctopartClient(api_key='TEST_TOKEN')
+        self.body = json.dumps(fixtures.parts_search_response).encode()
+
+    def test_accept_encoding_is_negotiated(self):
+        assert 'gzip' in ACCEPT_ENCODING and 'deflate' in ACCEPT_ENCODING
+        with responses.RequestsMock() as rsps:
+            _mock_compressed(rsps, self.body)
+            self.client.search('resistor')
+            request = rsps.calls[0].request
+        assert request.headers['Accept-Encoding'] == ACCEPT_ENCODING
+
+    def test_compressed_response(self):
+        for encoding in ('gzip', 'deflate'):
+            stats = self.client.transfer_stats = TransferStats()
+            with responses.RequestsMock() as rsps:
+                compressed = _mock_compressed(rsps, self.body, encoding)
+                response = self.client.search('resistor')
+            assert response == fixtures.parts_search_response
+            assert stats.snapshot() == {'parts.search': {
+                'responses': 1,
+                'wire_bytes': len(compressed),
+                'body_bytes': len(self.body)}}
+            assert stats.saved_bytes() == len(self.body) - len(compressed)
+
+    def test_compressed_stream(self):
+        with responses.RequestsMock() as rsps:
+            compressed = _mock_compressed(rsps, self.body)
+            results = list(self.client.search_stream('resistor'))
+        assert results == fixtures.parts_search_response['results']
+        assert self.client.transfer_stats.snapshot() == {'parts.search': {
+            'responses': 1,
+            'wire_bytes': len(compressed),
+            'body_bytes': len(self.body)}}
+
+    def test_shared_stats(self):
+        stats = TransferStats()
+        clients = [
+            OctopartClient(api_key='TEST_TOKEN', transfer_stats=stats)
+            for _ in range(2)]
+        with responses.RequestsMock() as rsps:
+            _mock_compressed(rsps, self.body)
+            for client in clients:
+                client.search('resistor')
+        assert stats.snapshot()['parts.search']['responses'] == 2
@@ -0,0 +1,144 @@
+import gzip
+import json
+import os
+import shutil
+import tempfile
+import time
+from unittest import TestCase
+from unittest.mock import patch
+
+import pytest
+
+from octopart.client import OctopartClient
+from octopart.exceptions import OctopartError
+from octopart.fakeserver import FakeOctopartServer
+from octopart.retries import RetryPolicy
+from octopart.transport import (
+    RecordingAdapter, ReplayAdapter, TrafficArchive, request_key)
+
+from . import fixtures
+from .utils import octopart_mock_response
+
+
+class TransportTests(TestCase):
+    """Tests for recording API traffic and replaying it"""
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.archive = TrafficArchive(
+            os.path.join(self.tmpdir, 'traffic.jsonl.gz'))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def _record(self, response=fixtures.parts_match_response):
+        adapter = RecordingAdapter(self.archive)
+        client = OctopartClient(api_key='SECRET_KEY', transport=adapter)
+        with self.archive, octopart_mock_response(response):
+            client.match([{'q': 'RUM001L02T2CL'}], includes=['specs'])
+        assert adapter.recorded == 1
+
+    def _client(self, **kwargs):
+        return OctopartClient(
+            api_key='OTHER_KEY',
+            transport=ReplayAdapter(self.archive, **kwargs),
+            retry_policy=RetryPolicy(max_attempts=1))
+
+    def test_archive_opened_once_per_session(self):
+        with patch('octopart.transport.gzip.open', wraps=gzip.open) as opened:
+            with self.archive:
+                for i in range(20):
+                    self.archive.append({'key': 'GET /%s?' % i, 'status': 200})
+            assert opened.call_count == 1
+        assert len(list(self.archive)) == 20
+
+    def test_request_key_ignores_parameter_order(self):
+        assert request_key('GET', '/a?b=1&c=2&apikey=x') == request_key(
+            'GET', '/a?apikey=y&c=2&b=1')
+        assert request_key('GET', '/a?b=1') != request_key('GET', '/a?b=2')
+
+    def test_archive_is_compressed_and_has_no_api_key(self):
+        self._record()
+        with open(self.archive.path, 'rb') as file:
+            data = gzip.decompress(file.read()).decode()
+        assert 'SECRET_KEY' not in data
+        [entry] = [json.loads(line) for line in data.splitlines()]
+        assert entry['status'] == 200
+        assert json.loads(entry['body']) == fixtures.parts_match_response
+
+    def test_replay(self):
+        self._record()
+        client = self._client()
+        # no HTTP mock is active: any request to the network would fail
+        response = client.match([{'q': 'RUM001L02T2CL'}], includes=['specs'])
+        assert response == fixtures.parts_match_response
+        results = list(client.match_stream(
+            [{'q': 'RUM001L02T2CL'}], includes=['specs']))
+        assert results == fixtures.parts_match_response['results']
+        assert client.session.get_adapter(client.base_url).replayed == 2
+
+    def test_missing_request(self):
+        self._record()
+        client = self._client()
+        with pytest.raises(OctopartError, match='404'):
+            client.match([{'q': 'OTHER'}])
+        assert client.session.get_adapter(client.base_url).missing == 1
+
+    def test_injected_errors(self):
+        self._record()
+        client = self._client(error_rate=1.0, error_status=502)
+        with pytest.raises(OctopartError, match='502'):
+            client.match([{'q': 'RUM001L02T2CL'}], includes=['specs'])
+
+    def test_injected_errors_are_seeded(self):
+        entries = list(self.archive)
+
+        def _errors():
+            adapter = ReplayAdapter(entries, error_rate=0.5, seed=7)
+            for _ in range(50):
+                adapter._pick('GET /missing?')
+            return adapter.errors
+
+        assert 0 < _errors() == _errors() < 50
+
+    def test_throttling(self):
+        self._record()
+        client = self._client(rate=1, burst=2)
+        for _ in range(2):
+            client.match([{'q': 'RUM001L02T2CL'}], includes=['specs'])
+        with pytest.raises(OctopartError, match='429'):
+            client.match([{'q': 'RUM001L02T2CL'}], includes=['specs'])
+        adapter = client.session.get_adapter(client.base_url)
+        assert adapter.throttled == 1
+
+    def test_throttled_requests_are_retried_after_delay(self):
+        self._record()
+        client = OctopartClient(
+            api_key='OTHER_KEY',
+            transport=ReplayAdapter(self.archive, rate=20, burst=1),
+            retry_policy=RetryPolicy(max_attempts=3, backoff_base=0))
+        for _ in range(3):
+            client.match([{'q': 'RUM001L02T2CL'}], includes=['specs'])
+        assert client.session.get_adapter(client.base_url).throttled >= 1
+
+    def test_recorded_latency(self):
+        with FakeOctopartServer(port=0, latency=0.2) as server:
+            client = OctopartClient(
+                api_key='SECRET_KEY', base_url=server.base_url,
+                transport=RecordingAdapter(self.archive))
+            client.match([{'q': 'RUM001L02T2CL'}])
+        [entry] = list(self.archive)
+        assert entry['elapsed'] >= 0.2
+
+        client = OctopartClient(
+            api_key='OTHER_KEY', base_url=server.base_url,
+            transport=ReplayAdapter(self.archive, recorded_latency=True))
+        start = time.monotonic()
+        client.match([{'q': 'RUM001L02T2CL'}])
+        assert time.monotonic() - start >= 0.2
+
+    def test_latency(self):
+        self._record()
+        client = self._client(latency=0.05)
+        start = time.monotonic()
+        client.match([{'q': 'RUM001L02T2CL'}], includes=['specs'])
+        assert time.monotonic() - start >= 0.05
@@ -29,6 +29,38 @@ class ClientTests(unittest.TestCase):
             [1] * 19
         ])
 
+    def test_chunk_queries_url_length(self):
+        """
+        Tests that chunks of long queries stay below the URL length limit.
+        """
+        queries = [{'mpn': 'X' * 1000, 'reference': str(i)} for i in range(20)]
+        chunked = utils.chunk_queries(queries)
+        assert [q for chunk in chunked for q in chunk] == queries
+        for chunk in chunked:
+            assert len(utils.urlencode({'queries': utils.json.dumps(chunk)})) \
+                <= utils.URL_MAX_LENGTH
+        assert [len(chunk) for chunk in chunked] == [7, 7, 6]
+
+    def test_chunk_queries_packs_after_long_query(self):
+        """
+        Tests that one long query does not split the queries after it into
+        many small chunks.
+        """
+        queries = [{'mpn': 'X' * 7950}] + [
+            {'mpn': 'MPN%s' % i} for i in range(39)]
+        chunked = utils.chunk_queries(queries)
+        assert [len(chunk) for chunk in chunked] == [1, 20, 19]
+
+    def test_oversized_query_gets_own_chunk(self):
+        queries = [{'mpn': 'A'}, {'mpn': 'X' * 9000}, {'mpn': 'B'}]
+        chunked = utils.chunk_queries(queries)
+        assert chunked == [[queries[0]], [queries[1]], [queries[2]]]
+
+    def test_encoded_query_length(self):
+        for query in [{'mpn': 'a b/c~d_e.f-g'}, {'q': 'µ±\\"'}, 42]:
+            assert utils.encoded_query_length(query) == len(
+                utils.quote_plus(utils.json.dumps(query)))
+
 
 class SortbyParamTests(unittest.TestCase):
     def test_empty_sortby(self):
@@ -0,0 +1,90 @@
+from unittest import TestCase
+
+import pytest
+
+from octopart import models
+from octopart.client import OctopartClient
+from octopart.exceptions import OctopartError
+from octopart.validation import (
+    QueryValidator, match_query_validator, search_query_validator)
+
+MATCH_QUERIES = [
+    {'mpn': 'ATMEGA328P-PU'},
+    {'q': 'a', 'limit': '5', 'start': 0},
+    {'q': 5, 'limit': 5.0},
+    {'mpn': b'bytes', 'limit': True},
+    {'q': None, 'limit': None},
+    {'q': ['a']},
+    {'q': True},
+    {'mpn': b'\xff'},
+    {'limit': 'x'},
+    {'limit': 5.5},
+    {'limit': '1e3'},
+    {'unknown': 1},
+    # several rogue fields come in set order from schematics, so only one
+    {'unknown': 1, 'limit': 'x', 'q': [1]},
+]
+
+SEARCH_QUERIES = [
+    {'q': 'a', 'start': 0, 'limit': 10, 'sortby': None},
+    {'q': 'a', 'start': 'x'},
+    {'q': 'a', 'filter_fields': {'a': 'b', 'c': 5}},
+    {'q': 'a', 'filter_fields': {'a': [1], 'd': 5.5}},
+    {'q': 'a', 'filter_fields': 'x'},
+    {'q': 'a', 'filter_queries': [('a', 'b')]},
+    {'q': 'a', 'rogue': 1},
+]
+
+
+def schematics_errors_list(list_):
+    """What `OctopartClient.match` reported before the fast path"""
+    if models.PartsMatchQuery.is_valid_list(list_):
+        return None
+    return models.PartsMatchQuery.errors_list(list_)
+
+
+class QueryValidatorTests(TestCase):
+    def test_same_errors_as_schematics_for_match_queries(self):
+        for query in MATCH_QUERIES:
+            assert (str(match_query_validator.errors_list([query]))
+                    == str(schematics_errors_list([query]))), query
+
+    def test_same_errors_as_schematics_for_search_queries(self):
+        for query in SEARCH_QUERIES:
+            assert (str(search_query_validator.errors(query))
+                    == str(models.PartsSearchQuery.errors(query))), query
+            assert (search_query_validator.is_valid(query)
+                    == models.PartsSearchQuery.is_valid(query))
+
+    def test_errors_list_reports_first_invalid_query(self):
+        queries = [{'mpn': 'ok'}, {'limit': 'x'}, {'q': ['a']}]
+        assert (str(match_query_validator.errors_list(queries))
+                == str(schematics_errors_list(queries)))
+
+    def test_required_fields_not_supported(self):
+        class Required(models.BaseModel):
+            q = models.StringType(required=True)
+
+        with pytest.raises(ValueError):
+            QueryValidator(Required)
+
+    def test_client_error_message(self):
+        client = OctopartClient(api_key='TEST_TOKEN')
+        with pytest.raises(OctopartError) as excinfo:
+            client.match([{'mpn': 'ok'}, {'limit': 'x'}])
+        assert str(excinfo.value) == (
+            'Queries are malformed: %s'
+            % schematics_errors_list([{'limit': 'x'}]))
+
+    def test_custom_validators_run(self):
+        def no_spaces(value):
+            if ' ' in value:
+                raise models.ValidationError('No spaces allowed.')
+
+        class Query(models.BaseModel):
+            mpn = models.StringType(validators=[no_spaces])
+
+        validator = QueryValidator(Query)
+        assert validator.errors({'mpn': 'A1'}) is None
+        assert (str(validator.errors({'mpn': 'A 1'}))
+                == str(Query.errors({'mpn': 'A 1'})))